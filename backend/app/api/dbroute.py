@@ -1,13 +1,105 @@
-from fastapi import FastAPI, Depends
-from sqlalchemy.orm import Session
-from .database import SessionLocal  
-
-app = FastAPI()
-
-# Dependency to get DB session
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
\ No newline at end of file
+# backend/app/api/dbroute.py
+import json
+from typing import Optional
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
+from app.database import (
+    DB_ASYNC,
+    DB_STREAM_CHUNK,
+    get_db,
+    get_async_db,
+    keyset_page,
+    keyset_page_async,
+    stream_rows,
+    stream_rows_async,
+)
+
+router = APIRouter()
+
+ALL_USERS_SQL = "SELECT * FROM users ORDER BY id"
+USERS_SUMMARY = (
+    "Fetch users from RDS database: all of them as a JSON list, or one "
+    "keyset page {items, next_after} when `after` or `limit` is given"
+)
+
+
+# ── Chunked JSON encoders: one HTTP chunk per cursor batch, not per row ──
+def _batches(rows, chunk: int = DB_STREAM_CHUNK):
+    buf = []
+    for row in rows:
+        buf.append(json.dumps(row, default=str))
+        if len(buf) >= chunk:
+            yield buf
+            buf = []
+    if buf:
+        yield buf
+
+
+async def _batches_async(rows, chunk: int = DB_STREAM_CHUNK):
+    buf = []
+    async for row in rows:
+        buf.append(json.dumps(row, default=str))
+        if len(buf) >= chunk:
+            yield buf
+            buf = []
+    if buf:
+        yield buf
+
+
+def json_array(rows, chunk: int = DB_STREAM_CHUNK):
+    """Encode `rows` as one JSON list without holding them all in memory."""
+    sep = "["
+    for batch in _batches(rows, chunk):
+        yield sep + ",".join(batch)
+        sep = ","
+    yield "[]" if sep == "[" else "]"
+
+
+async def json_array_async(rows, chunk: int = DB_STREAM_CHUNK):
+    sep = "["
+    async for batch in _batches_async(rows, chunk):
+        yield sep + ",".join(batch)
+        sep = ","
+    yield "[]" if sep == "[" else "]"
+
+
+def ndjson(rows, chunk: int = DB_STREAM_CHUNK):
+    for batch in _batches(rows, chunk):
+        yield "\n".join(batch) + "\n"
+
+
+if DB_ASYNC:
+    @router.get("/users", summary=USERS_SUMMARY)
+    async def read_users(
+        after: Optional[int] = Query(None, description="Return users with id > after"),
+        limit: Optional[int] = Query(None, ge=1, le=1000),
+        db=Depends(get_async_db),
+    ):
+        if after is None and limit is None:
+            return StreamingResponse(
+                json_array_async(stream_rows_async(db, ALL_USERS_SQL)),
+                media_type="application/json",
+            )
+        return await keyset_page_async(db, "users", "id", after or 0, limit or 100)
+else:
+    @router.get("/users", summary=USERS_SUMMARY)
+    def read_users(
+        after: Optional[int] = Query(None, description="Return users with id > after"),
+        limit: Optional[int] = Query(None, ge=1, le=1000),
+        db=Depends(get_db),
+    ):
+        if after is None and limit is None:
+            # same list as before pagination existed, streamed from a cursor
+            return StreamingResponse(
+                json_array(stream_rows(db, ALL_USERS_SQL)), media_type="application/json"
+            )
+        return keyset_page(db, "users", "id", after or 0, limit or 100)
+
+
+@router.get("/users/stream", summary="Stream all users as NDJSON")
+def stream_users(db=Depends(get_db)):
+    """
+    Streams every row of `users` as newline-delimited JSON through a
+    server-side cursor, so memory stays flat regardless of table size.
+    """
+    return StreamingResponse(ndjson(stream_rows(db, ALL_USERS_SQL)), media_type="application/x-ndjson")
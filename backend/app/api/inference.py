@@ -1,28 +1,38 @@
 # backend/app/api/inference.py
 import os
+import re
 import datetime
-from fastapi import APIRouter, HTTPException
-from fastapi.responses import StreamingResponse, JSONResponse, FileResponse
-from app.services.inference_service import InferenceService
-from sqlalchemy.orm import Session
-from fastapi import Depends
-from app.database import get_db
+import numpy as np
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import StreamingResponse, JSONResponse, FileResponse, Response
 
 router = APIRouter()
 
-service = InferenceService(
-    yolo_model_path="models/yolov8n.pt",
-    autoencoder_path="models/autoencoder.h5",
-    anomaly_threshold=0.06564145945012571,
-    camera_index=99,
-)
+# INFERENCE_RING=<name> → read frames/logs from a separate inference worker
+# (app/services/inference_worker.py) instead of running models in-process
+INFERENCE_RING = os.getenv("INFERENCE_RING")
+
+if INFERENCE_RING:
+    from app.services.shm_ring import RingFrameSource
+    service = RingFrameSource(INFERENCE_RING)
+else:
+    from app.services.inference_service import InferenceService
+    service = InferenceService(
+        yolo_model_path="models/yolov8n.pt",
+        autoencoder_path="models/autoencoder.h5",
+        anomaly_threshold=0.06564145945012571,
+        camera_index=99,
+    )
 # expose service on router for clean shutdown
 router.service = service
 def mjpeg_streamer():
     boundary = b"--frame\r\nContent-Type: image/jpeg\r\n\r\n"
+    if INFERENCE_RING:
+        frames = service.iter_frames()
+    else:
+        frames = iter(service.get_annotated_frame, None)
     try:
-        while True:
-            frame_bytes = service.get_annotated_frame()
+        for frame_bytes in frames:
             yield boundary + frame_bytes + b"\r\n"
     except Exception:
         return
@@ -34,6 +44,37 @@ def video_feed():
         media_type="multipart/x-mixed-replace; boundary=frame",
     )
 
+@router.get("/governor", summary="Active pipeline quality level")
+def governor_status():
+    """
+    Returns the SLO governor's active quality level, the smoothed
+    per-frame processing time, the frame budget it is held to, and the
+    resulting processed frames per second / SLO compliance.
+    """
+    return JSONResponse(content=service.governor.status())
+
+@router.post("/models/reload", summary="Hot-reload autoencoder, stats and threshold")
+def reload_models(threshold: float = None):
+    """
+    Loads models/autoencoder.h5 + ae_norm_stats.npz (and the threshold from
+    the query, models/ae_threshold.json, or the current value) in the
+    background, validates them and swaps them in between frames.
+    Poll /models/status for the outcome.
+    """
+    reloader = getattr(service, "reloader", None)
+    if reloader is None:
+        raise HTTPException(status_code=409, detail="Models are loaded by the inference worker")
+    if not reloader.reload_async(threshold):
+        raise HTTPException(status_code=409, detail="A reload is already in progress")
+    return JSONResponse(status_code=202, content=reloader.state)
+
+@router.get("/models/status", summary="Active autoencoder version and last reload result")
+def models_status():
+    reloader = getattr(service, "reloader", None)
+    if reloader is None:
+        raise HTTPException(status_code=409, detail="Models are loaded by the inference worker")
+    return JSONResponse(content=reloader.state)
+
 @router.get("/logs", summary="Fetch & clear anomaly logs")
 def get_logs():
     try:
@@ -67,6 +108,17 @@ def list_activity():
     valid_files.sort(reverse=True)
     return JSONResponse(content=valid_files)
 
+@router.get("/activity/dedup", summary="Screenshots saved vs. skipped as duplicates")
+def activity_dedup():
+    """
+    Per camera: how many anomaly screenshots were saved and how many were
+    suppressed because they looked like a recent one (dHash distance).
+    """
+    deduper = getattr(service, "deduper", None)
+    if deduper is not None:
+        return JSONResponse(content=deduper.stats())
+    return JSONResponse(content=service.latest_meta().get("dedup", {}))
+
 @router.get("/activity/{filename}", summary="Fetch one anomaly snapshot")
 def serve_activity_image(filename: str):
     activity_dir = "data/anomaly_screenshots"
@@ -103,6 +155,50 @@ def analytics_summary():
 
     return JSONResponse(content=summary)
 
+def _heatmap(camera_id: str = None):
+    """Live accumulator in-process, else the worker's latest snapshot."""
+    from app.services.heatmap import HeatmapAccumulator
+    heatmap = getattr(service, "heatmap", None)
+    if heatmap is not None and camera_id in (None, service.camera_id):
+        return heatmap
+    camera_id = camera_id or "cam0"
+    if not re.fullmatch(r"[A-Za-z0-9_-]+", camera_id):
+        raise HTTPException(status_code=400, detail="Invalid camera_id")
+    path = os.path.join("data", "heatmaps", f"{camera_id}.npz")
+    if not os.path.exists(path):
+        raise HTTPException(status_code=404, detail="No heatmap recorded yet")
+    return HeatmapAccumulator.load(path)
+
+@router.get("/analytics/heatmap", summary="Anomalous frames per hour of day")
+def analytics_heatmap(camera_id: str = None):
+    """
+    Returns 24 entries {hour, count, intensity} (intensity = count / max).
+    """
+    return JSONResponse(content=_heatmap(camera_id).hourly_summary())
+
+@router.get("/analytics/heatmap/grid", summary="Spatial anomaly heatmap")
+def analytics_heatmap_grid(
+    camera_id: str = None,
+    hour: int = Query(None, ge=0, le=23),
+    decayed: bool = False,
+    format: str = Query("json", pattern="^(json|png)$"),
+):
+    """
+    Down-sampled grid of how often anomalous frames had a box over each
+    cell: all-time, for one `hour` of the day, or time-decayed (`decayed`).
+    `format=png` renders it as a colour-mapped image at frame resolution.
+    """
+    acc = _heatmap(camera_id)
+    grid = acc.grid(hour=hour, decayed=decayed)
+    if format == "png":
+        png = acc.to_png(grid, acc.frame_width, acc.frame_height)
+        return Response(content=png, media_type="image/png")
+    return JSONResponse(content={
+        "cell": acc.cell,
+        "frame_size": [acc.frame_width, acc.frame_height],
+        "grid": np.round(grid, 3).tolist(),
+    })
+
 @router.get("/analytics/errors", summary="List recent reconstruction errors")
 def analytics_errors():
     """
@@ -112,8 +208,4 @@ def analytics_errors():
     # service.pop_logs clears them, but we only need the recon_error list here:
     logs = service.pop_logs()
     errors = [entry.get("recon_error", 0.0) for entry in logs]
-    return JSONResponse(content=errors)
-
-@router.get("/users", summary="Fetch all users from RDS database")
-def read_users(db: Session = Depends(get_db)):
-    return db.execute("SELECT * FROM users").fetchall()
\ No newline at end of file
+    return JSONResponse(content=errors)
\ No newline at end of file
@@ -0,0 +1,115 @@
+# backend/app/api/jobs.py
+import os
+from fastapi import APIRouter, HTTPException, UploadFile, File, Form
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse, FileResponse
+
+from app.services.video_jobs import JobManager, JobQueueFull
+
+router = APIRouter()
+
+# server-side paths accepted by POST /jobs must live under one of these
+VIDEO_JOB_INPUT_DIRS = [
+    os.path.realpath(d) for d in os.getenv("VIDEO_JOB_INPUT_DIRS", "data/videos").split(os.pathsep) if d
+]
+VIDEO_EXTENSIONS = (".mp4", ".avi", ".mov", ".mkv", ".webm")
+UPLOAD_CHUNK = 1024 * 1024
+
+jobs = JobManager()
+router.jobs = jobs
+
+
+def _job_or_404(fn, *args):
+    try:
+        return fn(*args)
+    except KeyError:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+
+def _server_path(path: str) -> str:
+    real = os.path.realpath(path)
+    if not any(real.startswith(root + os.sep) for root in VIDEO_JOB_INPUT_DIRS):
+        raise HTTPException(status_code=400, detail="Path is outside the allowed video directories")
+    if not os.path.isfile(real):
+        raise HTTPException(status_code=404, detail="Video not found")
+    return real
+
+
+@router.post("/jobs", summary="Queue a video file for offline anomaly analysis")
+async def create_job(
+    file: UploadFile = File(None),
+    path: str = Form(None),
+    stride: int = Form(1, ge=1, le=30),
+    batch_size: int = Form(32, ge=1, le=128),
+    max_screenshots: int = Form(20, ge=0, le=200),
+):
+    """
+    Send either a video `file` (multipart upload) or a server-side `path`
+    under VIDEO_JOB_INPUT_DIRS. The job is scored in the background with
+    the live models; poll GET /jobs/{id} and fetch GET /jobs/{id}/result.
+    Returns 429 when VIDEO_JOB_WORKERS + VIDEO_JOB_QUEUE jobs are already
+    queued or running.
+    All disk and pool work runs in the threadpool, so a large upload never
+    blocks the event loop (and with it the live streams).
+    """
+    if (file is None) == (path is None):
+        raise HTTPException(status_code=400, detail="Send exactly one of 'file' or 'path'")
+    if file is not None:
+        ext = os.path.splitext(file.filename or "")[1].lower()
+        if ext not in VIDEO_EXTENSIONS:
+            raise HTTPException(status_code=400, detail=f"Unsupported video type '{ext}'")
+        source = file.filename
+    else:
+        video_path = await run_in_threadpool(_server_path, path)
+        source = path
+
+    params = {"stride": stride, "batch_size": batch_size, "max_screenshots": max_screenshots}
+    try:
+        job_id = await run_in_threadpool(jobs.create, source, params)
+    except JobQueueFull as e:
+        raise HTTPException(status_code=429, detail=str(e))
+
+    if file is not None:
+        video_path = os.path.join(jobs.job_dir(job_id), "input" + ext)
+        try:
+            out = await run_in_threadpool(open, video_path, "wb")
+            try:
+                while chunk := await file.read(UPLOAD_CHUNK):
+                    await run_in_threadpool(out.write, chunk)
+            finally:
+                await run_in_threadpool(out.close)
+        except Exception:
+            await run_in_threadpool(jobs.discard, job_id)
+            raise
+
+    await run_in_threadpool(jobs.start, job_id, video_path)
+    return JSONResponse(status_code=202, content=await run_in_threadpool(jobs.status, job_id))
+
+
+@router.get("/jobs", summary="List video analysis jobs, newest first")
+def list_jobs():
+    return JSONResponse(content=jobs.list())
+
+
+@router.get("/jobs/{job_id}", summary="Status and progress of one job")
+def job_status(job_id: str):
+    return JSONResponse(content=_job_or_404(jobs.status, job_id))
+
+
+@router.get("/jobs/{job_id}/result", summary="Per-frame errors and anomaly events")
+def job_result(job_id: str):
+    result = _job_or_404(jobs.result, job_id)
+    if result is None:
+        state = jobs.status(job_id)["state"]
+        raise HTTPException(status_code=409, detail=f"Job is {state}; no result")
+    return JSONResponse(content=result)
+
+
+@router.get("/jobs/{job_id}/screenshots/{name}", summary="Annotated peak frame of one event")
+def job_screenshot(job_id: str, name: str):
+    return FileResponse(_job_or_404(jobs.screenshot, job_id, name), media_type="image/jpeg")
+
+
+@router.delete("/jobs/{job_id}", summary="Cancel a queued or running job")
+def cancel_job(job_id: str):
+    return JSONResponse(content=_job_or_404(jobs.cancel, job_id))
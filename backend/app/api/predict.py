@@ -1,13 +1,21 @@
 # backend/app/api/predict.py
 from fastapi import APIRouter
 from fastapi.responses import StreamingResponse
-from backend.app.services.inference_service import MotionYoloProcessor  
 
 router = APIRouter()
-processor = MotionYoloProcessor(model_path="models/yolov8n.pt", source=0)
+_processor = None
+
+def get_processor():
+    """Build the motion+YOLO processor (and open the camera) on first use."""
+    global _processor
+    if _processor is None:
+        from app.services.yolo_services import MotionYoloProcessor
+        _processor = MotionYoloProcessor(model_path="models/yolov8n.pt", source=0)
+    return _processor
 
 def frame_streamer():
     """Generator that yields motion+YOLO-annotated frames as MJPEG."""
+    processor = get_processor()
     while True:
         frame_bytes = processor.get_annotated_frame()  # JPEG bytes
         # Build a multipart boundary frame
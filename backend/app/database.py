@@ -1,27 +1,189 @@
 # backend/app/database.py
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
 import os
 from dotenv import load_dotenv
 
 load_dotenv()
 
 DATABASE_URL = os.getenv("DATABASE_URL")
-engine = create_engine(DATABASE_URL)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Local development only: DB_DEV_SQLITE=1 with no DATABASE_URL uses a SQLite file
+if not DATABASE_URL and os.getenv("DB_DEV_SQLITE", "0") == "1":
+    DATABASE_URL = "sqlite:///data/saferoom.db"
+
+# ── Pool configuration ───────────────────────────────────────────────────
+DB_POOL_SIZE     = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW  = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT  = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+DB_POOL_RECYCLE  = int(os.getenv("DB_POOL_RECYCLE", "1800"))   # seconds
+# Rows fetched per round-trip when streaming with a server-side cursor
+DB_STREAM_CHUNK  = int(os.getenv("DB_STREAM_CHUNK", "500"))
+# Set DB_ASYNC=1 to serve the SQL endpoints from an async engine
+DB_ASYNC         = os.getenv("DB_ASYNC", "0") == "1"
 
 AWS_ACCESS_KEY_ID = os.getenv("AWS_ACCESS_KEY_ID")
 AWS_SECRET_ACCESS_KEY = os.getenv("AWS_SECRET_ACCESS_KEY")
 AWS_S3_BUCKET_NAME = os.getenv("AWS_S3_BUCKET_NAME")
 AWS_REGION = os.getenv("AWS_REGION")
 
+
+def _engine_kwargs(url: str) -> dict:
+    """Pool settings for `url`; SQLite's default pools reject sizing args."""
+    kwargs = {"pool_pre_ping": True}
+    if not url.startswith("sqlite"):
+        kwargs.update(
+            pool_size=DB_POOL_SIZE,
+            max_overflow=DB_MAX_OVERFLOW,
+            pool_timeout=DB_POOL_TIMEOUT,
+            pool_recycle=DB_POOL_RECYCLE,
+        )
+    return kwargs
+
+
+def _async_url(url: str) -> str:
+    """Map a sync URL onto its async driver (asyncpg / aiosqlite)."""
+    if url.startswith("postgresql+asyncpg") or url.startswith("sqlite+aiosqlite"):
+        return url
+    if url.startswith("postgresql"):
+        return "postgresql+asyncpg" + url[url.index(":"):]
+    if url.startswith("sqlite"):
+        return "sqlite+aiosqlite" + url[url.index(":"):]
+    return url
+
+
+# Engines are created on first use: importing this module (and the API)
+# doesn't pay for SQLAlchemy, and asyncpg/aiosqlite stay optional
+_engine = None
+_SessionLocal = None
+_async_engine = None
+_AsyncSessionLocal = None
+
+
+def _require_url() -> str:
+    if not DATABASE_URL:
+        raise RuntimeError(
+            "DATABASE_URL is not set (set DB_DEV_SQLITE=1 for a local SQLite database)"
+        )
+    return DATABASE_URL
+
+
+def get_engine():
+    global _engine, _SessionLocal
+    if _engine is None:
+        _require_url()
+        from sqlalchemy import create_engine
+        from sqlalchemy.orm import sessionmaker
+
+        _engine = create_engine(DATABASE_URL, **_engine_kwargs(DATABASE_URL))
+        _SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=_engine)
+    return _engine
+
+
+def __getattr__(name):
+    # keeps `from app.database import engine, SessionLocal` working
+    if name == "engine":
+        return get_engine()
+    if name == "SessionLocal":
+        get_engine()
+        return _SessionLocal
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def get_async_engine():
+    global _async_engine, _AsyncSessionLocal
+    if _async_engine is None:
+        from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+
+        url = os.getenv("DATABASE_ASYNC_URL") or _async_url(_require_url())
+        _async_engine = create_async_engine(url, **_engine_kwargs(url))
+        _AsyncSessionLocal = async_sessionmaker(_async_engine, expire_on_commit=False)
+    return _async_engine
+
+
 def get_db():
     """
     FastAPI dependency that yields an SQLAlchemy Session,
     and makes sure it’s closed after the request.
     """
-    db = SessionLocal()
+    get_engine()
+    db = _SessionLocal()
     try:
         yield db
     finally:
         db.close()
+
+
+async def get_async_db():
+    """Async counterpart of `get_db`, backed by the lazily created async engine."""
+    get_async_engine()
+    async with _AsyncSessionLocal() as db:
+        yield db
+
+
+# ── Query helpers ────────────────────────────────────────────────────────
+def _keyset_sql(table: str, key: str) -> str:
+    # identifiers are fixed by the callers, never taken from a request
+    return (
+        f"SELECT * FROM {table} WHERE {key} > :after "
+        f"ORDER BY {key} LIMIT :limit"
+    )
+
+
+def _page(rows, key: str, limit: int) -> dict:
+    items = [dict(r) for r in rows]
+    next_after = items[-1][key] if len(items) == limit else None
+    return {"items": items, "next_after": next_after}
+
+
+def keyset_page(db, table: str, key: str = "id", after=0, limit: int = 100) -> dict:
+    """
+    Return one page of `table` ordered by `key`, starting after `after`.
+    Keyset pagination keeps every page an index range scan, however deep.
+    Returns {"items": [...], "next_after": <cursor or None>}.
+    """
+    from sqlalchemy import text
+
+    rows = db.execute(
+        text(_keyset_sql(table, key)), {"after": after, "limit": limit}
+    ).mappings()
+    return _page(rows, key, limit)
+
+
+async def keyset_page_async(db, table: str, key: str = "id", after=0, limit: int = 100) -> dict:
+    """Async version of `keyset_page` for an AsyncSession."""
+    from sqlalchemy import text
+
+    result = await db.execute(
+        text(_keyset_sql(table, key)), {"after": after, "limit": limit}
+    )
+    return _page(result.mappings(), key, limit)
+
+
+def stream_rows(db, sql: str, params: dict = None, chunk: int = DB_STREAM_CHUNK):
+    """
+    Yield rows of `sql` as dicts through a server-side cursor, holding
+    at most `chunk` rows in memory at a time.
+    """
+    from sqlalchemy import text
+
+    result = db.execute(
+        text(sql).execution_options(stream_results=True, yield_per=chunk),
+        params or {},
+    )
+    try:
+        for row in result.mappings():
+            yield dict(row)
+    finally:
+        result.close()
+
+
+async def stream_rows_async(db, sql: str, params: dict = None, chunk: int = DB_STREAM_CHUNK):
+    """Async version of `stream_rows` for an AsyncSession."""
+    from sqlalchemy import text
+
+    result = await db.stream(
+        text(sql).execution_options(yield_per=chunk), params or {}
+    )
+    try:
+        async for row in result.mappings():
+            yield dict(row)
+    finally:
+        await result.close()
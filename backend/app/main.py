@@ -1,10 +1,11 @@
 # backend/app/main.py
-import uvicorn
 import os
 from fastapi import FastAPI
 from fastapi.staticfiles import StaticFiles
 from fastapi.responses import FileResponse
 from app.api.inference import router as inference_router, service as inference_service
+from app.api.dbroute import router as db_router
+from app.api.jobs import router as jobs_router
 
 app = FastAPI(
     title="SafeRoom AI Anomaly Inference API",
@@ -14,6 +15,8 @@ app = FastAPI(
 
 # 1) Mount all of your inference endpoints under /predict
 app.include_router(inference_router, prefix="/predict")
+app.include_router(db_router, prefix="/predict")
+app.include_router(jobs_router, prefix="/predict")
 
 # 2) Serve React's build folder
 static_path = os.path.join(os.path.dirname(__file__), "static")
@@ -28,8 +31,10 @@ def shutdown_event():
     # When Uvicorn shuts down, release the camera
     inference_router.service.release()
     inference_service.release()
+    jobs_router.jobs.shutdown()
 
 if __name__ == "__main__":
+    import uvicorn
     uvicorn.run("app.main:app", host="0.0.0.0", port=8000, reload=True)
 
 
@@ -2,27 +2,39 @@
 import os
 from pathlib import Path
 from datetime import datetime
-from pymongo import MongoClient, ASCENDING
 from dotenv import load_dotenv
 
-# ── Load your inner conf/.env ────────────────────────────────────────
 BASE_DIR = Path(__file__).resolve().parents[3]   # …/SafeRoomAI/SafeRoomAI
 ENV_PATH = BASE_DIR / "conf" / ".env"
-if not ENV_PATH.exists():
-    raise RuntimeError(f"Could not find .env at {ENV_PATH}")
-load_dotenv(dotenv_path=str(ENV_PATH))
 
-# ── Connect to MongoDB ───────────────────────────────────────────────
-MONGO_URI = os.getenv("MONGODB_URI")
-if not MONGO_URI:
-    raise RuntimeError("Missing MONGODB_URI in environment")
+_col = None
 
-client = MongoClient(MONGO_URI)
-db     = client.SafeRoomAI
-col    = db.anomaly_metadata
 
-# TTL: expire docs 7 days after their ts
-col.create_index([("ts", ASCENDING)], expireAfterSeconds=7 * 24 * 3600)
+def get_collection():
+    """
+    Load conf/.env and connect to MongoDB on first use (pymongo is only
+    imported then); the service calls this at startup so a missing .env
+    or MONGODB_URI still fails fast.
+    """
+    global _col
+    if _col is None:
+        from pymongo import MongoClient, ASCENDING
+
+        # ── Load your inner conf/.env ────────────────────────────────
+        if not ENV_PATH.exists():
+            raise RuntimeError(f"Could not find .env at {ENV_PATH}")
+        load_dotenv(dotenv_path=str(ENV_PATH))
+
+        # ── Connect to MongoDB ───────────────────────────────────────
+        mongo_uri = os.getenv("MONGODB_URI")
+        if not mongo_uri:
+            raise RuntimeError("Missing MONGODB_URI in environment")
+        col = MongoClient(mongo_uri).SafeRoomAI.anomaly_metadata
+
+        # TTL: expire docs 7 days after their ts
+        col.create_index([("ts", ASCENDING)], expireAfterSeconds=7 * 24 * 3600)
+        _col = col
+    return _col
 
 def log_anomaly(
     camera_id: str,
@@ -44,7 +56,7 @@ def log_anomaly(
         "recon_err":   recon_error,
         "bbox":        bbox or {},
     }
-    col.insert_one(doc)
+    get_collection().insert_one(doc)
 
 def fetch_anomalies(camera_id: str, since: datetime = None):
     """
@@ -54,4 +66,4 @@ def fetch_anomalies(camera_id: str, since: datetime = None):
     q = {"camera_id": camera_id}
     if since:
         q["ts"] = {"$gte": since}
-    return list(col.find(q).sort("ts", ASCENDING))
+    return list(get_collection().find(q).sort("ts", 1))   # ascending
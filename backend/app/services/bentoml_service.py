@@ -1,51 +1,75 @@
 # backend/app/services/bentoml_service.py
+import os
 import base64
+import cv2
+import numpy as np
 import bentoml
 from bentoml.exceptions import NotFound
-from bentoml.legacy import Runner
-from bentoml import service, api
-from bentoml.io import JSON
-from app.services.yolo_services import MotionYoloProcessor  
 
-MODEL_TAG = "yolov8n:latest" 
+from app.services.yolo_detect import decode_image, detect_frames, draw_detections
 
-# 1️⃣ Load the model
+MODEL_TAG = "yolov8n:latest"
+
+# 1️⃣ Resolve the model + its adaptive batching limits
 try:
-    _model = bentoml.pytorch.get(MODEL_TAG)
+    _model_ref = bentoml.pytorch.get(MODEL_TAG)
 except NotFound:
     raise RuntimeError(
         f"Model '{MODEL_TAG}' not found. Run `python scripts/import_yolo_model.py` first."
     )
 
-# 2️⃣ Make it a Runner
-_yolo_runner = _model.to_runner()
+_meta = _model_ref.info.metadata or {}
+MAX_BATCH_SIZE = int(os.getenv("YOLO_MAX_BATCH_SIZE", _meta.get("max_batch_size", 16)))
+MAX_LATENCY_MS = int(os.getenv("YOLO_MAX_LATENCY_MS", _meta.get("max_latency_ms", 50)))
+
+
+# 2️⃣ Batched YOLO worker: concurrent requests are merged into one forward pass
+@bentoml.service(name="safroomai_yolo", traffic={"timeout": 30})
+class YoloDetector:
+    """Adaptive micro-batching around the YOLO model."""
 
-# 3️⃣ Declare your Service
-@service(
+    def __init__(self):
+        self.model = bentoml.pytorch.load_model(_model_ref)
+        self.names = self.model.model.names
+
+    @bentoml.api(
+        batchable=True,
+        max_batch_size=MAX_BATCH_SIZE,
+        max_latency_ms=MAX_LATENCY_MS,
+    )
+    def detect(self, frames: list[np.ndarray]) -> list[dict]:
+        """
+        Decoded BGR frames in (the caller decodes once and may draw on the
+        same array); one entry per frame: {"boxes": [[x1,y1,x2,y2],…],
+        "classes": [int], "labels": [str], "scores": [float]}.
+        """
+        return detect_frames(self.model, self.names, frames)
+
+
+# 3️⃣ Public Service
+@bentoml.service(
     name="safroomai_inference",
-    runners=[_yolo_runner],
-    external_dependencies={
-        "pip": [
-            "ultralytics",
-            "opencv-python-headless",
-            "bentoml>=1.4",
-            "fastapi",
-            "uvicorn[standard]",
-        ]
-    },
+    traffic={"timeout": 30},
 )
 class SafeRoomAIService:
-    """Motion + YOLO inference."""
+    """YOLO inference on uploaded image bytes."""
 
-    yolo_runner: Runner = _yolo_runner
+    detector = bentoml.depends(YoloDetector)
 
-    # 4️⃣ Wire up a JSON ➞ JSON endpoint
-    @api(input=JSON(), output=JSON(), route="/predict")
-    async def predict(self, payload: dict) -> dict:
+    @bentoml.api(route="/predict")
+    async def predict(self, image: bytes, annotate: bool = False) -> dict:
         """
-        Expects {"image_path": "/app/data/foo.jpg"}
-        Returns  {"raw_jpeg_bytes": "<base64…>"}
+        Expects the raw encoded image (JPEG/PNG) bytes.
+        Returns  {"detections": {...}, "raw_jpeg_bytes": "<base64…>" | None}
         """
-        annotated = await self.yolo_runner.async_run(payload["image_path"])
-        encoded = base64.b64encode(annotated).decode("utf-8")
-        return {"raw_jpeg_bytes": encoded}
\ No newline at end of file
+        frame = decode_image(image)         # decoded once, for detection and drawing
+        detections = (await self.detector.to_async.detect([frame]))[0]
+
+        encoded = None
+        if annotate:
+            ok, jpeg = cv2.imencode(".jpg", draw_detections(frame, detections))
+            if not ok:
+                raise RuntimeError("JPEG encoding failed")
+            encoded = base64.b64encode(jpeg.tobytes()).decode("utf-8")
+
+        return {"detections": detections, "raw_jpeg_bytes": encoded}
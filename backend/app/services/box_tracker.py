@@ -0,0 +1,97 @@
+# backend/app/services/box_tracker.py
+import cv2
+import numpy as np
+
+
+class BoxTracker:
+    """
+    Carries YOLO boxes forward between detector runs with sparse
+    Lucas-Kanade optical flow on a small point grid inside each box.
+
+    The detector is asked to run again when:
+      - `detect_every` frames have passed since the last detection,
+      - the scene changed (mean abs. gray difference > `motion_threshold`),
+      - or too few flow points survived (`confidence < min_confidence`).
+    """
+
+    def __init__(
+        self,
+        detect_every: int = 5,
+        motion_threshold: float = 12.0,
+        min_confidence: float = 0.6,
+        grid: int = 4,
+        scale: float = 0.5,
+    ):
+        self.detect_every = max(1, detect_every)
+        self.motion_threshold = motion_threshold
+        self.min_confidence = min_confidence
+        self.grid = grid
+        self.scale = scale
+
+        self.boxes = np.zeros((0, 4), dtype=np.float32)   # xyxy, full-res pixels
+        self.classes = np.zeros(0, dtype=np.int64)
+        self.confidence = 0.0
+        self._prev_gray = None       # last frame, down-scaled gray
+        self._key_gray = None        # frame of the last detection
+        self._since_detect = 0
+
+    def _small_gray(self, frame: np.ndarray) -> np.ndarray:
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        return cv2.resize(gray, None, fx=self.scale, fy=self.scale,
+                          interpolation=cv2.INTER_AREA)
+
+    def should_detect(self, frame: np.ndarray):
+        """Returns (detect_needed, small_gray) – pass `small_gray` on to reset/update."""
+        gray = self._small_gray(frame)
+        if self._key_gray is None or self._since_detect + 1 >= self.detect_every:
+            return True, gray
+        if self.confidence < self.min_confidence:
+            return True, gray
+        motion = float(np.mean(cv2.absdiff(gray, self._key_gray)))
+        return motion > self.motion_threshold, gray
+
+    def reset(self, gray: np.ndarray, boxes: np.ndarray, classes: np.ndarray):
+        """Adopt fresh detector output for the current frame."""
+        # own copies: update() shifts boxes in place, and the caller's
+        # detection frame keeps the arrays it passed in
+        self.boxes = np.array(boxes, dtype=np.float32).reshape(-1, 4)
+        self.classes = np.array(classes, dtype=np.int64).reshape(-1)
+        self.confidence = 1.0
+        self._prev_gray = gray
+        self._key_gray = gray
+        self._since_detect = 0
+
+    def _grid_points(self) -> np.ndarray:
+        """(n_boxes * grid², 1, 2) float32 points in down-scaled coords."""
+        t = (np.arange(self.grid, dtype=np.float32) + 0.5) / self.grid
+        gx, gy = np.meshgrid(t, t)
+        gx, gy = gx.ravel(), gy.ravel()
+        b = self.boxes * self.scale
+        xs = b[:, 0:1] + gx[None, :] * (b[:, 2:3] - b[:, 0:1])
+        ys = b[:, 1:2] + gy[None, :] * (b[:, 3:4] - b[:, 1:2])
+        return np.stack([xs, ys], axis=-1).reshape(-1, 1, 2).astype(np.float32)
+
+    def update(self, gray: np.ndarray):
+        """Shift every box by the median flow of its surviving grid points."""
+        self._since_detect += 1
+        if len(self.boxes) == 0:
+            self.confidence = 1.0
+            self._prev_gray = gray
+            return
+
+        p0 = self._grid_points()
+        p1, status, _ = cv2.calcOpticalFlowPyrLK(
+            self._prev_gray, gray, p0, None, winSize=(15, 15), maxLevel=2
+        )
+        ok = status.reshape(len(self.boxes), -1).astype(bool)
+        flow = (p1 - p0).reshape(len(self.boxes), -1, 2)
+
+        # median over surviving points; boxes with none keep their position
+        flow = np.where(ok[..., None], flow, np.nan)
+        with np.errstate(all="ignore"):
+            shift = np.nanmedian(flow, axis=1)
+        shift = np.nan_to_num(shift, nan=0.0) / self.scale
+        self.boxes += np.concatenate([shift, shift], axis=1)
+
+        self.confidence = float(ok.mean())
+        self._prev_gray = gray
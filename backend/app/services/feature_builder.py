@@ -0,0 +1,92 @@
+# backend/app/services/feature_builder.py
+from typing import Optional, Sequence
+
+import numpy as np
+
+POSE_DIM = 18 * 2       # 18 MediaPipe landmarks × (x, y)
+
+
+def class_histograms(classes: Sequence[np.ndarray], num_classes: int,
+                     out: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    (n, num_classes) per-frame object counts for n arrays of class ids,
+    from one bincount over (frame, class) pairs; ids outside
+    [0, num_classes) are ignored.
+    """
+    n = len(classes)
+    if out is None:
+        out = np.empty((n, num_classes), dtype=np.float32)
+    counts = np.fromiter((len(c) for c in classes), dtype=np.int64, count=n)
+    if not counts.any():
+        out[:] = 0.0
+        return out
+    cls = np.concatenate([np.asarray(c, dtype=np.int64).reshape(-1) for c in classes])
+    frame = np.repeat(np.arange(n), counts)
+    keep = (cls >= 0) & (cls < num_classes)
+    flat = frame[keep] * num_classes + cls[keep]
+    out[:] = np.bincount(flat, minlength=n * num_classes).reshape(n, num_classes)
+    return out
+
+
+class FeatureBuilder:
+    """
+    Builds the autoencoder's input rows
+
+        [ pose (36) | pose velocity (36) | YOLO class histogram (num_classes) ]
+
+    for a batch of consecutive frames, shared by live serving
+    (InferenceService, VideoAnalyzer) and offline extraction
+    (scripts/extract_normal_features.py) so both produce identical
+    features by construction.
+
+    Everything is vectorized over the batch: one `np.bincount` for all
+    histograms, one shifted subtraction for all velocities, written into
+    a preallocated float32 (max_batch, feature_dim) buffer. The previous
+    batch's last pose is carried over, so the velocity of a batch's first
+    frame is the same as if the frames had come one at a time.
+    """
+
+    def __init__(self, num_classes: int, max_batch: int = 1, pose_dim: int = POSE_DIM):
+        self.num_classes = num_classes
+        self.pose_dim = pose_dim
+        self.feature_dim = pose_dim * 2 + num_classes
+        self._out = np.zeros((max_batch, self.feature_dim), dtype=np.float32)
+        self.prev_pose = np.zeros(pose_dim, dtype=np.float32)
+
+    def reset(self, prev_pose: Optional[np.ndarray] = None):
+        """Start a new sequence (velocity is measured from `prev_pose`, default zeros)."""
+        self.prev_pose[:] = 0.0 if prev_pose is None else np.asarray(prev_pose).reshape(-1)
+
+    def build(self, poses: np.ndarray, classes: Sequence[np.ndarray]) -> np.ndarray:
+        """
+        poses:   (n, pose_dim) keypoints of n consecutive frames; a row with
+                 NaNs repeats the last good pose (PoseDetector itself
+                 reports missing joints as (0, 0), never NaN).
+        classes: n arrays of YOLO class ids, one per frame.
+        Returns an (n, feature_dim) view of the internal buffer, valid
+        until the next `build()`.
+        """
+        n = len(poses)
+        if n > len(self._out):
+            self._out = np.zeros((n, self.feature_dim), dtype=np.float32)
+        out = self._out[:n]
+        d = self.pose_dim
+        pose, vel, hist = out[:, :d], out[:, d:2 * d], out[:, 2 * d:]
+
+        pose[:] = np.asarray(poses).reshape(n, d)
+        bad = np.isnan(pose).any(axis=1)
+        if bad.any():
+            # forward-fill from the last good row (or the carried-over pose)
+            last_good = np.where(bad, -1, np.arange(n))
+            np.maximum.accumulate(last_good, out=last_good)
+            src = last_good[bad]
+            pose[bad] = np.where((src >= 0)[:, None], pose[np.maximum(src, 0)], self.prev_pose)
+
+        # velocity: difference along time, first row against the previous batch
+        np.subtract(pose[0], self.prev_pose, out=vel[0])
+        np.subtract(pose[1:], pose[:-1], out=vel[1:])
+        self.prev_pose[:] = pose[-1]
+
+        # histograms: one bincount over (frame, class) pairs for the whole batch
+        class_histograms(classes, self.num_classes, out=hist)
+        return out
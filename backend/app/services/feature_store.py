@@ -0,0 +1,209 @@
+# backend/app/services/feature_store.py
+import os
+import json
+import time
+import threading
+from datetime import datetime, timezone
+from typing import Iterator, Optional, Union
+
+import numpy as np
+
+MANIFEST = "manifest.json"
+_VERSION = 1
+
+
+def record_dtype(feature_dim: int) -> np.dtype:
+    """Fixed-size on-disk record: one per processed frame."""
+    return np.dtype([
+        ("ts",          "<f8"),                  # unix seconds (UTC)
+        ("camera_id",   "S16"),
+        ("recon_error", "<f4"),
+        ("features",    "<f4", (feature_dim,)),
+    ])
+
+
+def _to_unix(t: Union[None, float, datetime]) -> Optional[float]:
+    if t is None or isinstance(t, (int, float)):
+        return t
+    if t.tzinfo is None:
+        t = t.replace(tzinfo=timezone.utc)
+    return t.timestamp()
+
+
+class FeatureStore:
+    """
+    Append-only, segmented, memory-mapped store of per-frame feature
+    vectors. Each segment is a preallocated `seg_XXXXXX.bin` of
+    `segment_records` fixed-size records; `manifest.json` holds the
+    layout and, per segment, the record count and time span.
+
+    Writer:  FeatureStore(root, feature_dim).append(feat, err, cam)
+    Reader:  FeatureStore.open(root).load_features(since, until)
+    """
+
+    def __init__(
+        self,
+        root: str,
+        feature_dim: int,
+        segment_records: int = 100_000,
+        flush_every: int = 500,
+    ):
+        self.root = root
+        self.flush_every = flush_every
+        self._lock = threading.Lock()
+        os.makedirs(root, exist_ok=True)
+
+        manifest = self._read_manifest(root)
+        if manifest is None:
+            manifest = {
+                "version": _VERSION,
+                "feature_dim": int(feature_dim),
+                "segment_records": int(segment_records),
+                "segments": [],
+            }
+        elif manifest["feature_dim"] != feature_dim:
+            raise ValueError(
+                f"Feature store at {root} has feature_dim={manifest['feature_dim']}, "
+                f"service produces {feature_dim}"
+            )
+        self.manifest = manifest
+        self.dtype = record_dtype(manifest["feature_dim"])
+        self._seg = None
+        self._since_flush = 0
+        if manifest["segments"]:
+            last = manifest["segments"][-1]
+            if last["count"] < manifest["segment_records"]:
+                self._seg = self._map(last["file"], "r+")
+
+    # ── manifest ─────────────────────────────────────────────────────────
+    @staticmethod
+    def _read_manifest(root: str) -> Optional[dict]:
+        path = os.path.join(root, MANIFEST)
+        if not os.path.exists(path):
+            return None
+        with open(path) as f:
+            return json.load(f)
+
+    def _write_manifest(self):
+        path = os.path.join(self.root, MANIFEST)
+        tmp = path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(self.manifest, f, indent=1)
+        os.replace(tmp, path)       # atomic: readers never see half a manifest
+
+    def _map(self, fname: str, mode: str) -> np.memmap:
+        return np.memmap(
+            os.path.join(self.root, fname), dtype=self.dtype, mode=mode,
+            shape=(self.manifest["segment_records"],),
+        )
+
+    # ── writer ───────────────────────────────────────────────────────────
+    def append(self, features: np.ndarray, recon_error: float, camera_id: str,
+               ts: Optional[float] = None):
+        """Append one frame's record."""
+        with self._lock:
+            segs = self.manifest["segments"]
+            if self._seg is None:
+                fname = f"seg_{len(segs):06d}.bin"
+                self._seg = self._map(fname, "w+")
+                segs.append({"file": fname, "count": 0, "t_min": None, "t_max": None})
+            meta = segs[-1]
+            ts = time.time() if ts is None else ts
+
+            rec = self._seg[meta["count"]]
+            rec["ts"] = ts
+            rec["camera_id"] = camera_id.encode("ascii", "replace")[:16]
+            rec["recon_error"] = recon_error
+            rec["features"] = features
+            meta["count"] += 1
+            meta["t_max"] = ts
+            if meta["t_min"] is None:
+                meta["t_min"] = ts
+
+            self._since_flush += 1
+            if meta["count"] == self.manifest["segment_records"]:
+                self._seg.flush()
+                self._seg = None
+                self._write_manifest()
+                self._since_flush = 0
+            elif self._since_flush >= self.flush_every:
+                self._flush()
+
+    def _flush(self):
+        if self._seg is not None:
+            self._seg.flush()
+        self._write_manifest()
+        self._since_flush = 0
+
+    def close(self):
+        with self._lock:
+            self._flush()
+            self._seg = None
+
+    # ── reader ───────────────────────────────────────────────────────────
+    @classmethod
+    def open(cls, root: str) -> "FeatureStore":
+        """Open an existing store read-only (the writer may keep appending)."""
+        manifest = cls._read_manifest(root)
+        if manifest is None:
+            raise FileNotFoundError(f"No feature store manifest under {root}")
+        store = cls.__new__(cls)
+        store.root = root
+        store.manifest = manifest
+        store.dtype = record_dtype(manifest["feature_dim"])
+        store._lock = threading.Lock()
+        store._seg = None
+        return store
+
+    def iter_records(self, since=None, until=None, camera_id: Optional[str] = None) -> Iterator[np.ndarray]:
+        """
+        Yield zero-copy memmap slices of records with since <= ts < until,
+        one per overlapping segment. Records are appended in time order,
+        so each slice is found with a binary search on `ts`.
+        """
+        t0, t1 = _to_unix(since), _to_unix(until)
+        for seg in self.manifest["segments"]:
+            n = seg["count"]
+            if n == 0:
+                continue
+            if t0 is not None and seg["t_max"] < t0:
+                continue
+            if t1 is not None and seg["t_min"] >= t1:
+                continue
+            recs = self._map(seg["file"], "r")[:n]
+            lo = 0 if t0 is None else int(np.searchsorted(recs["ts"], t0, side="left"))
+            hi = n if t1 is None else int(np.searchsorted(recs["ts"], t1, side="left"))
+            part = recs[lo:hi]
+            if camera_id is not None:
+                part = part[part["camera_id"] == camera_id.encode("ascii")]
+            if len(part):
+                yield part
+
+    def load(self, since=None, until=None, camera_id: Optional[str] = None) -> np.ndarray:
+        """All matching records; a view when the range sits in one segment."""
+        parts = list(self.iter_records(since, until, camera_id))
+        if not parts:
+            return np.zeros(0, dtype=self.dtype)
+        return parts[0] if len(parts) == 1 else np.concatenate(parts)
+
+    def load_features(self, since=None, until=None, camera_id: Optional[str] = None) -> np.ndarray:
+        """(N, feature_dim) float32 feature matrix for the time range."""
+        return self.load(since, until, camera_id)["features"]
+
+
+def load_features_from_env(fallback_npy: str) -> np.ndarray:
+    """
+    Feature matrix for the offline scripts. If FEATURE_STORE_DIR is set,
+    read it (optionally limited by FEATURE_STORE_SINCE / FEATURE_STORE_UNTIL
+    ISO timestamps and FEATURE_STORE_CAMERA); otherwise np.load the .npy.
+    """
+    root = os.getenv("FEATURE_STORE_DIR")
+    if not root:
+        return np.load(fallback_npy)
+    since = os.getenv("FEATURE_STORE_SINCE")
+    until = os.getenv("FEATURE_STORE_UNTIL")
+    return FeatureStore.open(root).load_features(
+        since=datetime.fromisoformat(since) if since else None,
+        until=datetime.fromisoformat(until) if until else None,
+        camera_id=os.getenv("FEATURE_STORE_CAMERA"),
+    )
@@ -1,7 +1,142 @@
 # app/services/frame_extractor.py
 
-import cv2
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from typing import Dict, List, Sequence, Tuple
+
+import cv2
+import numpy as np
+
+# Past this many frames it is cheaper to seek than to grab() forward.
+SEEK_GAP_FRAMES = 150
+
+# ── Per-file timestamp index cache ───────────────────────────────────────
+# key: (path, mtime, size) → float64 array of frame timestamps in ms
+_index_cache: Dict[Tuple[str, float, int], np.ndarray] = {}
+_index_lock = threading.Lock()
+
+
+def _cache_key(video_path: str):
+    st = os.stat(video_path)
+    return (os.path.abspath(video_path), st.st_mtime, st.st_size)
+
+
+def build_seek_index(video_path: str) -> np.ndarray:
+    """
+    Return the presentation timestamp (ms) of every frame in `video_path`.
+    Built once with a grab-only pass (no retrieve/colour conversion) and
+    cached per file; the cache is invalidated when the file changes.
+    """
+    key = _cache_key(video_path)
+    with _index_lock:
+        cached = _index_cache.get(key)
+    if cached is not None:
+        return cached
+
+    cap = cv2.VideoCapture(video_path)
+    if not cap.isOpened():
+        raise RuntimeError(f"Could not open video '{video_path}'")
+    stamps = []
+    fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
+    while cap.grab():
+        ms = cap.get(cv2.CAP_PROP_POS_MSEC)
+        # some backends report 0 for every frame – fall back to fps
+        if ms <= 0 and stamps:
+            ms = len(stamps) * 1000.0 / fps
+        stamps.append(ms)
+    cap.release()
+
+    index = np.asarray(stamps, dtype=np.float64)
+    with _index_lock:
+        # drop stale entries for the same path
+        for k in [k for k in _index_cache if k[0] == key[0]]:
+            del _index_cache[k]
+        _index_cache[key] = index
+    return index
+
+
+def extract_frames(
+    video_path: str,
+    anomaly_ts: Sequence[datetime],
+    start_ts: datetime,
+    out_paths: Sequence[str],
+    max_workers: int = 4,
+) -> List[str]:
+    """
+    Batch version of `extract_frame` for many anomalies in one recording.
+    - anomaly_ts: UTC datetimes of the anomalies (any order)
+    - start_ts:   UTC datetime when the video recording began
+    - out_paths:  output path for each anomaly, same order as `anomaly_ts`
+
+    Targets are sorted and read in a single forward pass; long gaps are
+    bridged with one seek via the cached timestamp index, and JPEG writes
+    run on a thread pool while decoding continues.
+    """
+    if len(anomaly_ts) != len(out_paths):
+        raise ValueError("anomaly_ts and out_paths must have the same length")
+    if not anomaly_ts:
+        return []
+
+    index = build_seek_index(video_path)
+    if len(index) == 0:
+        raise RuntimeError(f"Video '{video_path}' contains no frames")
+
+    # Map every timestamp to the last frame at or before it
+    offsets_ms = np.array(
+        [(ts - start_ts).total_seconds() * 1000.0 for ts in anomaly_ts]
+    )
+    frame_nos = np.searchsorted(index, offsets_ms, side="right") - 1
+    frame_ms = float(np.median(np.diff(index))) if len(index) > 1 else 0.0
+    bad = (frame_nos < 0) | (offsets_ms > index[-1] + frame_ms)
+    if bad.any():
+        i = int(np.argmax(bad))
+        raise RuntimeError(f"Unable to read frame at {offsets_ms[i] / 1000.0:.3f}s")
+
+    order = np.argsort(frame_nos, kind="stable")
+
+    cap = cv2.VideoCapture(video_path)
+    if not cap.isOpened():
+        raise RuntimeError(f"Could not open video '{video_path}'")
+
+    futures = []
+    pos = 0            # index of the next frame grab() will return
+    frame = None
+    frame_no = -1      # index of the frame currently held in `frame`
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        try:
+            for i in order:
+                target = int(frame_nos[i])
+                if target != frame_no:
+                    if target - pos > SEEK_GAP_FRAMES:
+                        cap.set(cv2.CAP_PROP_POS_FRAMES, target)
+                        pos = target
+                    while pos < target:
+                        if not cap.grab():
+                            raise RuntimeError(
+                                f"Unable to read frame at {offsets_ms[i] / 1000.0:.3f}s"
+                            )
+                        pos += 1
+                    ret, frame = cap.read()
+                    if not ret:
+                        raise RuntimeError(
+                            f"Unable to read frame at {offsets_ms[i] / 1000.0:.3f}s"
+                        )
+                    pos += 1
+                    frame_no = target
+                # several anomalies may share a frame; the array is never
+                # mutated after read() so the writers can share it
+                futures.append(pool.submit(cv2.imwrite, out_paths[i], frame))
+        finally:
+            cap.release()
+
+        for fut, i in zip(futures, order):
+            if not fut.result():
+                raise RuntimeError(f"Failed to write '{out_paths[i]}'")
+
+    return list(out_paths)
+
 
 def extract_frame(video_path: str, anomaly_ts: datetime, start_ts: datetime, out_path: str):
     """
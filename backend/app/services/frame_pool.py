@@ -0,0 +1,34 @@
+# backend/app/services/frame_pool.py
+import cv2
+import numpy as np
+
+
+class FramePool:
+    """
+    Per-camera set of preallocated frame buffers, reused every frame:
+      - `n_frames` BGR capture buffers, handed out round-robin so the
+        previous frame (still referenced by a FrameResult being rendered)
+        is not overwritten by the next read,
+      - one RGB buffer for MediaPipe's colour conversion.
+
+    Annotation draws in place on the capture buffer, so the steady state
+    allocates nothing full-resolution except the JPEG bytes.
+    """
+
+    def __init__(self, height: int, width: int, n_frames: int = 2):
+        self.frames = [np.empty((height, width, 3), dtype=np.uint8) for _ in range(max(1, n_frames))]
+        self.rgb = np.empty((height, width, 3), dtype=np.uint8)
+        self._i = 0
+
+    def read(self, cap: cv2.VideoCapture):
+        """`cap.read()` into the next pooled buffer; returns (ok, frame)."""
+        self._i = (self._i + 1) % len(self.frames)
+        buf = self.frames[self._i]
+        ok, frame = cap.read(image=buf)
+        if ok and frame is not buf:
+            # source size differs from what the driver reported: adopt the
+            # array OpenCV allocated so the next read can reuse it
+            self.frames[self._i] = frame
+            if self.rgb.shape != frame.shape:
+                self.rgb = np.empty_like(frame)
+        return ok, frame
@@ -0,0 +1,49 @@
+# backend/app/services/frame_renderer.py
+import cv2
+import numpy as np
+
+
+def _palette(n: int) -> np.ndarray:
+    """Stable, well-spread BGR colour per class id."""
+    hues = (np.arange(n) * 37) % 180
+    hsv = np.stack([hues, np.full(n, 200), np.full(n, 255)], axis=1).astype(np.uint8)
+    return cv2.cvtColor(hsv[None], cv2.COLOR_HSV2BGR)[0]
+
+
+class FrameRenderer:
+    """
+    Lightweight replacement for ultralytics' `Results.plot()`: draws boxes,
+    labels and the anomaly banner *in place* on the frame it is given
+    (no copy), and JPEG-encodes on demand.
+    """
+
+    def __init__(self, names, jpeg_quality: int = 95, banner_height: int = 50):
+        self.names = names
+        self.colors = [tuple(int(v) for v in c) for c in _palette(len(names))]
+        self.encode_params = [int(cv2.IMWRITE_JPEG_QUALITY), jpeg_quality]
+        self.banner_height = banner_height
+
+    def draw_boxes(self, canvas: np.ndarray, boxes: np.ndarray, classes: np.ndarray):
+        for (x1, y1, x2, y2), c in zip(np.asarray(boxes, dtype=np.int32), classes):
+            color = self.colors[int(c) % len(self.colors)]
+            cv2.rectangle(canvas, (x1, y1), (x2, y2), color, 2)
+            cv2.putText(canvas, str(self.names[int(c)]), (x1, max(y1 - 5, 12)),
+                        cv2.FONT_HERSHEY_SIMPLEX, 0.5, color, 1, cv2.LINE_AA)
+
+    def draw_banner(self, canvas: np.ndarray, text: str = "ANOMALY"):
+        canvas[: self.banner_height] = (0, 0, 255)
+        cv2.putText(canvas, text, (10, 35), cv2.FONT_HERSHEY_SIMPLEX, 1.0, (255, 255, 255), 2)
+
+    def annotate(self, canvas: np.ndarray, boxes, classes, is_anomaly: bool,
+                 draw_boxes: bool = True) -> np.ndarray:
+        if draw_boxes:
+            self.draw_boxes(canvas, boxes, classes)
+        if is_anomaly:
+            self.draw_banner(canvas)
+        return canvas
+
+    def encode(self, canvas: np.ndarray) -> bytes:
+        ok, jpeg = cv2.imencode(".jpg", canvas, self.encode_params)
+        if not ok:
+            raise RuntimeError("JPEG encoding failed")
+        return jpeg.tobytes()
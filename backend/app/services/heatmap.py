@@ -0,0 +1,128 @@
+# backend/app/services/heatmap.py
+import os
+import time
+import datetime
+import threading
+from typing import Optional
+
+import cv2
+import numpy as np
+
+
+class HeatmapAccumulator:
+    """
+    Per-camera spatial heatmap of where anomalies happen.
+
+    The frame is down-sampled into `cell`×`cell` pixel cells. Every
+    anomalous frame's YOLO boxes are rasterized onto
+      - one of 24 hour-of-day planes (bucketed history), and
+      - a `recent` plane with exponential time decay (`half_life_s`).
+    Rasterization is a 2-D difference array + two cumsums, so the cost
+    per frame is O(cells) regardless of how many boxes there are, and
+    reading the map is O(cells) regardless of history length.
+    """
+
+    def __init__(self, frame_width: int, frame_height: int, cell: int = 16,
+                 half_life_s: float = 3600.0):
+        self.cell = cell
+        self.frame_width = frame_width
+        self.frame_height = frame_height
+        self.gh = max(1, -(-frame_height // cell))
+        self.gw = max(1, -(-frame_width // cell))
+        self.half_life_s = half_life_s
+
+        self.hourly = np.zeros((24, self.gh, self.gw), dtype=np.float32)
+        self.hourly_frames = np.zeros(24, dtype=np.int64)   # anomalous frames per hour
+        self.recent = np.zeros((self.gh, self.gw), dtype=np.float32)
+        self._recent_ts = time.time()
+        self._lock = threading.Lock()
+
+    def _rasterize(self, boxes: np.ndarray) -> np.ndarray:
+        b = np.asarray(boxes, dtype=np.float32).reshape(-1, 4)
+        out = np.zeros((self.gh, self.gw), dtype=np.float32)
+        if len(b) == 0:
+            return out
+        x1 = np.clip((b[:, 0] // self.cell).astype(np.int64), 0, self.gw - 1)
+        y1 = np.clip((b[:, 1] // self.cell).astype(np.int64), 0, self.gh - 1)
+        x2 = np.clip((b[:, 2] // self.cell).astype(np.int64), 0, self.gw - 1) + 1
+        y2 = np.clip((b[:, 3] // self.cell).astype(np.int64), 0, self.gh - 1) + 1
+
+        diff = np.zeros((self.gh + 1, self.gw + 1), dtype=np.float32)
+        np.add.at(diff, (y1, x1), 1.0)
+        np.add.at(diff, (y1, x2), -1.0)
+        np.add.at(diff, (y2, x1), -1.0)
+        np.add.at(diff, (y2, x2), 1.0)
+        np.cumsum(diff, axis=0, out=diff)
+        np.cumsum(diff, axis=1, out=diff)
+        return diff[: self.gh, : self.gw]
+
+    def _decay_to(self, now: float):
+        dt = now - self._recent_ts
+        if dt > 0:
+            self.recent *= 0.5 ** (dt / self.half_life_s)
+            self._recent_ts = now
+
+    def add(self, boxes: np.ndarray, ts: Optional[float] = None):
+        """Record the boxes of one anomalous frame."""
+        ts = time.time() if ts is None else ts
+        hour = datetime.datetime.fromtimestamp(ts).hour
+        mask = self._rasterize(boxes)
+        with self._lock:
+            self.hourly[hour] += mask
+            self.hourly_frames[hour] += 1
+            self._decay_to(ts)
+            self.recent += mask
+
+    def grid(self, hour: Optional[int] = None, decayed: bool = False) -> np.ndarray:
+        """Copy of the recent (decayed) map, one hour's plane, or the all-time sum."""
+        with self._lock:
+            if decayed:
+                self._decay_to(time.time())
+                return self.recent.copy()
+            if hour is not None:
+                return self.hourly[hour].copy()
+            return self.hourly.sum(axis=0)
+
+    def hourly_summary(self) -> list:
+        """[{hour, count, intensity}] – the shape the dashboard heatmap expects."""
+        with self._lock:
+            counts = self.hourly_frames.copy()
+        peak = int(counts.max()) or 1
+        return [
+            {"hour": h, "count": int(c), "intensity": round(float(c) / peak, 4)}
+            for h, c in enumerate(counts)
+        ]
+
+    @staticmethod
+    def to_png(grid: np.ndarray, width: int, height: int) -> bytes:
+        peak = float(grid.max()) or 1.0
+        img = (grid * (255.0 / peak)).astype(np.uint8)
+        img = cv2.applyColorMap(img, cv2.COLORMAP_JET)
+        img = cv2.resize(img, (width, height), interpolation=cv2.INTER_NEAREST)
+        ok, png = cv2.imencode(".png", img)
+        if not ok:
+            raise RuntimeError("PNG encoding failed")
+        return png.tobytes()
+
+    # ── persistence (lets the API read a worker's heatmap) ───────────────
+    def save(self, path: str):
+        with self._lock:
+            tmp = path + ".tmp.npz"
+            np.savez(
+                tmp, hourly=self.hourly, hourly_frames=self.hourly_frames,
+                recent=self.recent, recent_ts=self._recent_ts,
+                meta=np.array([self.frame_width, self.frame_height, self.cell]),
+                half_life_s=self.half_life_s,
+            )
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: str) -> "HeatmapAccumulator":
+        data = np.load(path)
+        w, h, cell = (int(v) for v in data["meta"])
+        acc = cls(w, h, cell=cell, half_life_s=float(data["half_life_s"]))
+        acc.hourly[:] = data["hourly"]
+        acc.hourly_frames[:] = data["hourly_frames"]
+        acc.recent[:] = data["recent"]
+        acc._recent_ts = float(data["recent_ts"])
+        return acc
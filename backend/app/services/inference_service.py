@@ -3,16 +3,24 @@
 import os
 import cv2
 import numpy as np
+import time
 import datetime
 import logging
-from collections import deque
-
-import tensorflow as tf
-from ultralytics import YOLO
+import threading
+from collections import deque, namedtuple
 
 from app.services.video_capture import get_video_source
-from app.services.anomaly_metadata import log_anomaly
+from app.services.anomaly_metadata import log_anomaly, get_collection
 from app.services.pose_wrapper import PoseDetector
+from app.services.slo_governor import SloGovernor
+from app.services.box_tracker import BoxTracker
+from app.services.feature_store import FeatureStore
+from app.services.model_reloader import ModelReloader, load_scoring_bundle, read_threshold_file
+from app.services.frame_renderer import FrameRenderer
+from app.services.heatmap import HeatmapAccumulator
+from app.services.frame_pool import FramePool
+from app.services.screenshot_dedup import ScreenshotDeduper
+from app.services.feature_builder import FeatureBuilder
 
 # ── Configure terminal logging ──────────────────────────────────────────────
 logger = logging.getLogger("InferenceService")
@@ -22,6 +30,9 @@ if not logger.hasHandlers():
     ch.setFormatter(logging.Formatter("[%(asctime)s] %(message)s"))
     logger.addHandler(ch)
 
+# Output of the scoring half of the pipeline; `render()` turns it into JPEG.
+FrameResult = namedtuple("FrameResult", "frame boxes classes is_anomaly recon_error level")
+
 
 class InferenceService:
     def __init__(
@@ -32,10 +43,25 @@ class InferenceService:
         anomaly_threshold: float = 0.06564145945012571,
         camera_index: int = 0,
         fallback_video: str = "sample.mp4",
+        target_fps: float = float(os.getenv("SLO_TARGET_FPS", "10")),
+        quality_levels=None,
+        detect_every: int = int(os.getenv("YOLO_DETECT_EVERY", "1")),
+        feature_store_dir: str = os.getenv("FEATURE_STORE_DIR"),
+        watch_models: bool = os.getenv("WATCH_MODELS", "0") == "1",
     ):
         # ── 1) Load all models & statistics ────────────────────────────────
-        self._load_models(yolo_model_path, autoencoder_path, norm_stats_path)
-        self.threshold = anomaly_threshold
+        # connect to MongoDB now: a missing conf/.env fails at startup,
+        # not on the first anomaly
+        get_collection()
+        # models/ae_threshold.json, when present, overrides the default
+        threshold = read_threshold_file(os.path.dirname(autoencoder_path) or ".")
+        self._load_models(
+            yolo_model_path, autoencoder_path, norm_stats_path,
+            anomaly_threshold if threshold is None else threshold,
+        )
+        self.reloader = ModelReloader(self, autoencoder_path, norm_stats_path)
+        if watch_models:
+            self.reloader.start_watching()
 
         # ── 2) Screenshot counters ────────────────────────────────────────
         self._anomaly_counter = 0
@@ -44,8 +70,11 @@ class InferenceService:
         self.screenshot_interval = 100  
         self.screenshot_dir = "data/anomaly_screenshots"
         os.makedirs(self.screenshot_dir, exist_ok=True)
+        # skip screenshots of a scene that is still the same (dHash)
+        self.deduper = ScreenshotDeduper()
 
         # ── 3) Video capture (camera → fallback → error) ────────────────
+        self.camera_index, self.fallback_video = camera_index, fallback_video
         self.cap = get_video_source(camera_index, fallback_video)
         self.frame_width  = int(self.cap.get(cv2.CAP_PROP_FRAME_WIDTH))
         self.frame_height = int(self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
@@ -53,133 +82,214 @@ class InferenceService:
         ok2, self.frame_curr = self.cap.read()
         if not (ok1 and ok2):
             raise RuntimeError("Failed to prime frames from video source")
+        # reused capture / RGB buffers (no per-frame full-res allocations)
+        self.pool = FramePool(*self.frame_curr.shape[:2])
 
         # ── 4) In-memory log queue for `/logs` endpoint ───────────────
         self.log_queue = deque(maxlen=100)
-
-        # ── 5) Pose/velocity state ─────────────────────────────────────
-        self.prev_pose_coords = np.zeros(self.pose_dim, dtype=np.float32)
-
-    def _load_models(self, yolo_path, ae_path, stats_path):
+        self.last_features = None
+        self._drawn = None      # last FrameResult annotated in place
+        # in-process viewers share the pooled buffers and the feature
+        # builder's output: one frame is scored + encoded at a time
+        self._frame_lock = threading.Lock()
+
+        # ── 5) Latency-SLO governor (level 0 = full quality) ───────────
+        self.governor = SloGovernor(target_fps=target_fps, levels=quality_levels)
+
+        # ── 6) Detect-every-N: track boxes between YOLO runs ───────────
+        self.tracker = BoxTracker(detect_every=detect_every) if detect_every > 1 else None
+
+        # ── 7) Optional on-disk store of every frame's features ────────
+        self.camera_id = f"cam{camera_index}"
+        self.feature_store = (
+            FeatureStore(feature_store_dir, self.feature_dim) if feature_store_dir else None
+        )
+
+        # ── 8) Spatial heatmap of anomalous boxes (snapshotted to disk) ─
+        self.heatmap_path = os.path.join("data", "heatmaps", f"{self.camera_id}.npz")
+        self.heatmap = HeatmapAccumulator(self.frame_width, self.frame_height)
+        if os.path.exists(self.heatmap_path):
+            saved = HeatmapAccumulator.load(self.heatmap_path)
+            if (saved.frame_width, saved.frame_height) == (self.frame_width, self.frame_height):
+                self.heatmap = saved
+        os.makedirs(os.path.dirname(self.heatmap_path), exist_ok=True)
+        self.heatmap_save_interval = 60.0
+        self._heatmap_saved = time.monotonic()
+        self._heatmap_dirty = False
+
+    def _load_models(self, yolo_path, ae_path, stats_path, threshold):
         """Load YOLO, Pose, Autoencoder, and normalization stats."""
-        # YOLO
+        # YOLO (ultralytics/torch imported here, not at module import)
+        from ultralytics import YOLO
         self.yolo = YOLO(yolo_path)
         self.num_classes = len(self.yolo.model.names)
+        self.renderer = FrameRenderer(self.yolo.model.names)
 
         # Pose
         self.pose_model = PoseDetector()
-        self.pose_dim = 18 * 2
-        self.feature_dim = self.pose_dim * 2 + self.num_classes
-
-        # Autoencoder
-        self.ae = tf.keras.models.load_model(ae_path, compile=False)
 
-        # Normalization stats
-        stats = np.load(stats_path)
-        self.mean = stats["mean"]
-        self.std  = stats["std"]
-        eps = 1e-3
-        self.std[self.std < eps] = eps
+        # [pose | velocity | class histogram] rows, same code as extraction
+        self.features = FeatureBuilder(self.num_classes)
+        self.pose_dim = self.features.pose_dim
+        self.feature_dim = self.features.feature_dim
 
-    def _extract_features(self, frame: np.ndarray):
-        """Compute pose keypoints, velocity, YOLO histogram → feature vector."""
-        # Pose detection
-        pts = self.pose_model.detect_pose(frame).reshape(-1)
-        if np.isnan(pts).any():
-            pts = self.prev_pose_coords.copy()
+        # Autoencoder + normalization stats + threshold, hot-swappable as one
+        self.scoring = load_scoring_bundle(ae_path, stats_path, threshold, self.feature_dim)
 
-        # Velocity
-        vel = pts - self.prev_pose_coords
-        self.prev_pose_coords = pts.copy()
+    @property
+    def threshold(self) -> float:
+        return self.scoring.threshold
 
-        # YOLO histogram
-        res = self.yolo(frame, verbose=False)[0]
-        hist = np.zeros(self.num_classes, dtype=np.float32)
-        for c in res.boxes.cls.cpu().numpy().astype(int):
-            hist[c] += 1.0
+    def _pose(self, frame: np.ndarray) -> np.ndarray:
+        """Flat pose keypoints; (0, 0) for joints not found, as in training."""
+        return self.pose_model.detect_pose(frame, rgb_out=self.pool.rgb).reshape(-1)
 
-        feat = np.concatenate([pts, vel, hist])
-        return feat, res
+    def _extract_features(self, frame: np.ndarray):
+        """
+        Compute pose keypoints, velocity, YOLO histogram → feature vector.
+        Returns (feature, boxes xyxy, class ids); the feature is a view
+        into the builder's buffer, valid until the next frame.
+        """
+        pts = self._pose(frame)
+
+        # YOLO boxes (carried by the tracker between detections)
+        if self.tracker is not None:
+            detect, gray = self.tracker.should_detect(frame)
+        if self.tracker is None or detect:
+            res = self.yolo(frame, imgsz=self.governor.level.yolo_imgsz, verbose=False)[0]
+            boxes = res.boxes.xyxy.cpu().numpy()
+            cls = res.boxes.cls.cpu().numpy().astype(int)
+            if self.tracker is not None:
+                self.tracker.reset(gray, boxes, cls)
+        else:
+            self.tracker.update(gray)
+            # copies: update() shifts the tracker's boxes in place, and
+            # this frame's FrameResult is rendered/logged later
+            boxes, cls = self.tracker.boxes.copy(), self.tracker.classes.copy()
+
+        feat = self.features.build(pts[None], (cls,))[0]
+        return feat, boxes, cls
+
+    @staticmethod
+    def _score(feats: np.ndarray, m) -> np.ndarray:
+        """Per-row reconstruction MSE of a (n, feature_dim) batch under bundle `m`."""
+        x = (feats - m.mean) / m.std        # float32 throughout: stats are stored float32
+        x = np.nan_to_num(x, copy=False, nan=0.0, posinf=0.0, neginf=0.0)
+        x = x.astype(np.float32, copy=False)
+        x_pred = m.ae.predict(x, batch_size=len(x), verbose=False)
+        return np.mean((x_pred - x) ** 2, axis=1)
 
     def _compute_anomaly(self, feat: np.ndarray):
         """Normalize → autoencode → compute MSE → return (is_anomaly, error)."""
-        x = (feat - self.mean) / self.std
-        x = np.nan_to_num(x, nan=0.0, posinf=0.0, neginf=0.0)
-        x_in = x.reshape(1, -1).astype(np.float32)
+        m = self.scoring        # one bundle per frame, even mid-reload
+        t0 = time.perf_counter()
+        err = float(self._score(feat.reshape(1, -1), m)[0])
+        self.reloader.check(m, err, (time.perf_counter() - t0) * 1000.0)
+        return (err > m.threshold), err
 
-        x_pred = self.ae.predict(x_in, verbose=False)
-        err = float(np.mean((x_pred - x_in) ** 2))
-        return (err > self.threshold), err
-
-    def get_annotated_frame(self) -> bytes:
+    def process_frame(self) -> FrameResult:
         """
+        Scoring only – nothing is drawn or encoded unless a screenshot is due.
         1. Grab frame
         2. Extract features + YOLO
         3. Compute anomaly
         4. Log to terminal
-        5. Overlay boxes + banner
-        6. Screenshot per rules
-        7. Persist metadata
-        8. Encode JPEG + queue in-memory
+        5. Screenshot per rules
+        6. Persist metadata + queue in-memory log
         """
-        # ── 1) Grab frame ────────────────────────────────────────────────
-        ret, frame = self.cap.read()
+        level = self.governor.level
+        self.pose_model.set_model_complexity(level.pose_complexity)
+
+        # ── 1) Grab frame (dropping stride-1 frames when degraded) ──────
+        for _ in range(level.frame_stride - 1):
+            self.cap.grab()
+        ret, frame = self.pool.read(self.cap)
         if not ret:
             raise RuntimeError("Video source returned no frame")
+        # the SLO covers our own work, not waiting for the camera
+        t_start = time.perf_counter()
 
         # ── 2) Feature extraction & 3) anomaly detection ───────────────
-        feat, yolo_res = self._extract_features(frame)
+        feat, boxes, classes = self._extract_features(frame)
         is_anom, err = self._compute_anomaly(feat)
+        self.last_features = feat
+        if self.feature_store is not None:
+            self.feature_store.append(feat, err, self.camera_id)
+        result = FrameResult(frame, boxes, classes, is_anom, err, level)
 
         # ── 4) Terminal log ────────────────────────────────────────────
         logger.info(f"is_anomaly={is_anom}, recon_error={err:.6f}")
 
-        # ── 5) Draw YOLO boxes ─────────────────────────────────────────
-        annotated = yolo_res.plot()
-
-        # ── 6) Anomaly banner + conditional screenshot ───────────────
         if is_anom:
-            # red banner
-            cv2.rectangle(annotated, (0,0), (self.frame_width, 50), (0,0,255), -1)
-            cv2.putText(
-                annotated, "ANOMALY", (10, 35),
-                cv2.FONT_HERSHEY_SIMPLEX, 1.0, (255,255,255), 2
-            )
-
             # bump anomaly count
             self._anomaly_counter += 1
+            self.heatmap.add(boxes)
+            self._heatmap_dirty = True
 
-            # take screenshot on first anomaly, then every `screenshot_interval`
+            # ── 5) Screenshot on first anomaly, then every `screenshot_interval`
             if (self._anomaly_counter == 1 or
                 (self._anomaly_counter - self._last_screenshot_counter) >= self.screenshot_interval):
-                ts = datetime.datetime.now().strftime("%Y%m%d-%H%M%S")
-                fname = f"{ts}_anom_{self._anomaly_counter}.jpg"
-                path = os.path.join(self.screenshot_dir, fname)
-                cv2.imwrite(path, annotated)
-                logger.info(f"Saved anomaly screenshot → {path}")
+                # hash the raw frame, before boxes/banner are drawn on it
+                if self.deduper.check(self.camera_id, frame):
+                    ts = datetime.datetime.now().strftime("%Y%m%d-%H%M%S")
+                    fname = f"{ts}_anom_{self._anomaly_counter}.jpg"
+                    path = os.path.join(self.screenshot_dir, fname)
+                    cv2.imwrite(path, self._draw(result))
+                    logger.info(f"Saved anomaly screenshot → {path}")
+                else:
+                    logger.info("Skipped anomaly screenshot (same scene as a recent one)")
                 self._last_screenshot_counter = self._anomaly_counter
 
-            # ── 7) Persist metadata ───────────────────────────────────
+            # ── 6) Persist metadata ───────────────────────────────────
             frame_index = int(self.cap.get(cv2.CAP_PROP_POS_FRAMES))
             log_anomaly(
                 camera_id=f"cam{frame_index}", 
                 is_anomaly=is_anom, 
                 recon_error=err, 
-                bbox={}
+                bbox={
+                    "boxes":   np.round(boxes, 1).tolist(),
+                    "classes": [int(c) for c in classes],
+                    "frame_size": [self.frame_width, self.frame_height],
+                }
                 )
 
-        # ── 8) JPEG encode + in-memory log ────────────────────────────
-        ok, jpeg = cv2.imencode(".jpg", annotated)
-        if not ok:
-            raise RuntimeError("JPEG encoding failed")
+        if self._heatmap_dirty and time.monotonic() - self._heatmap_saved > self.heatmap_save_interval:
+            self.save_heatmap()
 
         self.log_queue.appendleft({
             "timestamp": datetime.datetime.utcnow().isoformat(),
             "anomaly":   bool(is_anom),
             "recon_error": round(err, 6),
+            "quality_level": level.name,
         })
 
-        return jpeg.tobytes()
+        self.governor.record((time.perf_counter() - t_start) * 1000.0)
+        return result
+
+    def _draw(self, result: FrameResult) -> np.ndarray:
+        """Annotate `result.frame` in place (once) and return it."""
+        if self._drawn is not result:
+            self.renderer.annotate(
+                result.frame, result.boxes, result.classes, result.is_anomaly,
+                draw_boxes=result.level.annotate,
+            )
+            self._drawn = result
+        return result.frame
+
+    def render(self, result: FrameResult) -> bytes:
+        """Presentation: boxes + banner + JPEG, only for viewers."""
+        return self.renderer.encode(self._draw(result))
+
+    def get_annotated_frame(self) -> bytes:
+        """Score the next frame and return it annotated as JPEG bytes."""
+        with self._frame_lock:
+            return self.render(self.process_frame())
+
+    def save_heatmap(self):
+        """Snapshot the heatmap so other processes (the API) can serve it."""
+        self.heatmap.save(self.heatmap_path)
+        self._heatmap_saved = time.monotonic()
+        self._heatmap_dirty = False
 
     def pop_logs(self):
         """Return & clear the in-memory log queue."""
@@ -187,6 +297,16 @@ class InferenceService:
         self.log_queue.clear()
         return entries
 
+    def reopen_source(self):
+        """Re-open the camera (or fallback video) after it stopped delivering frames."""
+        self.cap.release()
+        self.cap = get_video_source(self.camera_index, self.fallback_video)
+
     def release(self):
-        """Release the video capture device."""
+        """Release the video capture device and flush the feature store."""
+        self.reloader.stop()
         self.cap.release()
+        if self._heatmap_dirty:
+            self.save_heatmap()
+        if self.feature_store is not None:
+            self.feature_store.close()
@@ -0,0 +1,108 @@
+# backend/app/services/inference_worker.py
+"""
+Standalone inference process: owns the camera and every model, and
+publishes each frame's feature vector and log entry to shared memory,
+plus the annotated JPEG while any viewer is attached. Run one per camera:
+
+    python -m app.services.inference_worker --camera 0 --ring saferoom_cam0
+
+then start the API with INFERENCE_RING=saferoom_cam0 and as many uvicorn
+workers as you like; each attaches read-only (see RingFrameSource).
+"""
+import argparse
+import logging
+import os
+import signal
+import threading
+
+from app.services.inference_service import InferenceService
+from app.services.shm_ring import FrameRing
+
+logger = logging.getLogger("InferenceService")
+
+# longest wait between attempts to re-open a camera that stopped delivering
+MAX_BACKOFF_S = float(os.getenv("INFERENCE_MAX_BACKOFF_S", "10"))
+
+
+def serve(service, frames: FrameRing, logs: FrameRing, stop: threading.Event,
+          max_backoff_s: float = MAX_BACKOFF_S):
+    """
+    Score and publish frames until `stop` is set. A JPEG too big for a
+    ring slot is skipped; a source that returns no frame is re-opened
+    with exponential backoff. Neither ends the loop.
+    """
+    backoff = 0.0
+    while not stop.is_set():
+        try:
+            result = service.process_frame()
+        except RuntimeError as e:
+            backoff = min(max(2 * backoff, 0.5), max_backoff_s)
+            logger.error(f"{e}; re-opening the video source in {backoff:.1f}s")
+            if stop.wait(backoff):
+                break
+            try:
+                service.reopen_source()
+            except RuntimeError as e:
+                logger.error(f"Re-opening the video source failed: {e}")
+            continue
+        backoff = 0.0
+
+        # score every frame; draw + encode only while someone watches
+        seq = None
+        if frames.reader_active():
+            try:
+                seq = frames.publish(service.render(result))
+            except ValueError as e:
+                logger.warning(f"Skipping frame: {e}")
+        logs.publish(
+            meta={
+                "frame_seq": seq,
+                "log": service.log_queue[0],
+                "governor": service.governor.status(),
+                "dedup": service.deduper.stats(),
+            },
+            features=service.last_features,
+        )
+
+
+def run(args):
+    service = InferenceService(
+        yolo_model_path=args.yolo,
+        autoencoder_path=args.autoencoder,
+        anomaly_threshold=args.threshold,
+        camera_index=args.camera,
+        fallback_video=args.fallback,
+    )
+    frames = FrameRing.create(args.ring, n_slots=args.slots, slot_size=args.slot_mb * 1024 * 1024)
+    # one small record per frame; sized to hold the /logs backlog
+    logs = FrameRing.create(f"{args.ring}_log", n_slots=args.log_slots, slot_size=64 * 1024)
+    logger.info(f"Inference worker publishing to shared memory '{args.ring}'")
+
+    stop = threading.Event()
+    signal.signal(signal.SIGTERM, lambda *_: stop.set())
+    signal.signal(signal.SIGINT, lambda *_: stop.set())
+
+    try:
+        serve(service, frames, logs, stop)
+    finally:
+        service.release()
+        frames.close()
+        logs.close()
+
+
+def main():
+    p = argparse.ArgumentParser(description="SafeRoomAI inference worker")
+    p.add_argument("--camera", type=int, default=0)
+    p.add_argument("--fallback", default="sample.mp4")
+    p.add_argument("--ring", default="saferoom_cam0", help="shared-memory name")
+    p.add_argument("--slots", type=int, default=8, help="frame ring slots")
+    p.add_argument("--slot-mb", type=int, default=2, help="max JPEG size per slot (MiB)")
+    p.add_argument("--log-slots", type=int, default=100, help="log/feature ring slots")
+    p.add_argument("--yolo", default="models/yolov8n.pt")
+    p.add_argument("--autoencoder", default="models/autoencoder.h5")
+    p.add_argument("--threshold", type=float, default=0.06564145945012571)
+    run(p.parse_args())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,246 @@
+# backend/app/services/model_reloader.py
+import os
+import json
+import time
+import logging
+import datetime
+import threading
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+
+from app.services.quantized_ae import PRECISIONS, QuantizedAutoencoder, quantized_path
+
+logger = logging.getLogger("InferenceService")
+
+# Optional file next to the AE holding {"threshold": <float>}
+THRESHOLD_FILE = "ae_threshold.json"
+
+# float32 = the Keras .h5 as trained; float16 / int8 = the NumPy model
+# written by scripts/quantize_autoencoder.py next to it
+AE_PRECISION = os.getenv("AE_PRECISION", "float32")
+
+
+@dataclass(frozen=True)
+class ScoringBundle:
+    """Everything `_compute_anomaly` needs, swapped as one reference."""
+    ae: object
+    mean: np.ndarray
+    std: np.ndarray
+    threshold: float
+    version: str
+
+
+def read_threshold_file(model_dir: str) -> Optional[float]:
+    path = os.path.join(model_dir, THRESHOLD_FILE)
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return float(json.load(f)["threshold"])
+
+
+def scoring_model_path(ae_path: str, precision: str = AE_PRECISION) -> str:
+    """The file actually scored with: the .h5 itself or its reduced-precision twin."""
+    return ae_path if precision == "float32" else quantized_path(ae_path, precision)
+
+
+def load_scoring_bundle(ae_path: str, stats_path: str, threshold: float,
+                        feature_dim: int, precision: str = AE_PRECISION) -> ScoringBundle:
+    """
+    Load + validate + warm up an autoencoder and its normalization stats.
+    Raises ValueError if anything doesn't match `feature_dim` or the AE
+    produces non-finite output.
+    """
+    model_path = scoring_model_path(ae_path, precision)
+    if precision == "float32":
+        import tensorflow as tf
+        ae = tf.keras.models.load_model(ae_path, compile=False)
+    elif precision in PRECISIONS:
+        if not os.path.exists(model_path):
+            raise ValueError(f"{model_path} not found; run scripts/quantize_autoencoder.py")
+        ae = QuantizedAutoencoder.load(model_path)
+    else:
+        raise ValueError(f"Unknown AE_PRECISION '{precision}'")
+    in_dim, out_dim = ae.input_shape[-1], ae.output_shape[-1]
+    if in_dim != feature_dim or out_dim != feature_dim:
+        raise ValueError(
+            f"AE maps {in_dim}→{out_dim}, expected {feature_dim}→{feature_dim}"
+        )
+
+    # float32 like the features, so normalization never upcasts per frame
+    stats = np.load(stats_path)
+    mean = stats["mean"].astype(np.float32)
+    std = stats["std"].astype(np.float32)
+    if mean.shape != (feature_dim,) or std.shape != (feature_dim,):
+        raise ValueError(
+            f"Norm stats have shapes {mean.shape}/{std.shape}, expected ({feature_dim},)"
+        )
+    eps = 1e-3
+    std[std < eps] = eps
+
+    if not np.isfinite(threshold) or threshold <= 0:
+        raise ValueError(f"Invalid anomaly threshold {threshold}")
+
+    # warm-up: builds the predict function now instead of on the first live frame
+    x = np.zeros((1, feature_dim), dtype=np.float32)
+    y = ae.predict(x, verbose=False)
+    if not np.isfinite(y).all():
+        raise ValueError("AE produced NaN/Inf on warm-up input")
+
+    mtime = os.path.getmtime(model_path)
+    version = datetime.datetime.fromtimestamp(mtime).strftime("%Y%m%d-%H%M%S")
+    if precision != "float32":
+        version += f"-{precision}"
+    return ScoringBundle(ae=ae, mean=mean, std=std, threshold=float(threshold), version=version)
+
+
+class ModelReloader:
+    """
+    Loads a new scoring bundle in a background thread and hands it to the
+    service, which swaps it in between frames. Frames keep being scored
+    with the old bundle until then. After a swap the new bundle is on
+    probation for `probation_frames` and rolls back to the previous one
+    on a non-finite recon error, or at the end of probation if it flagged
+    more than `max_anomaly_rate` of the frames or its median scoring time
+    exceeds `max_slowdown` × the old bundle's.
+    """
+
+    def __init__(self, service, ae_path: str, stats_path: str,
+                 probation_frames: int = 30,
+                 max_anomaly_rate: float = float(os.getenv("AE_PROBATION_MAX_ANOMALY_RATE", "0.5")),
+                 max_slowdown: float = float(os.getenv("AE_PROBATION_MAX_SLOWDOWN", "3.0"))):
+        self.service = service
+        self.ae_path = ae_path
+        self.stats_path = stats_path
+        self.model_dir = os.path.dirname(ae_path) or "."
+        self.probation_frames = probation_frames
+        self.max_anomaly_rate = max_anomaly_rate
+        self.max_slowdown = max_slowdown
+
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._watcher: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._previous: Optional[ScoringBundle] = None
+        self._probation_left = 0
+        self._probation_errs: list = []
+        self._probation_ms: list = []
+        self._baseline_ms: Optional[float] = None   # EMA of the live bundle's scoring time
+        self.state = {"status": "idle", "error": None, "version": None, "updated": None}
+
+    # ── reload ───────────────────────────────────────────────────────────
+    def reload_async(self, threshold: Optional[float] = None) -> bool:
+        """Start a background reload; returns False if one is already running."""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return False
+            self._set_state("loading")
+            self._thread = threading.Thread(
+                target=self._reload, args=(threshold,), daemon=True, name="ae-reload"
+            )
+            self._thread.start()
+            return True
+
+    def _reload(self, threshold: Optional[float]):
+        current = self.service.scoring
+        try:
+            if threshold is None:
+                threshold = read_threshold_file(self.model_dir)
+            if threshold is None:
+                threshold = current.threshold
+            bundle = load_scoring_bundle(
+                self.ae_path, self.stats_path, threshold, self.service.feature_dim
+            )
+        except Exception as e:
+            logger.error(f"AE reload failed, keeping {current.version}: {e}")
+            self._set_state("failed", error=str(e), version=current.version)
+            return
+
+        with self._lock:
+            self._previous = current
+            self._probation_left = self.probation_frames
+            self._probation_errs, self._probation_ms = [], []
+            self.service.scoring = bundle          # atomic reference swap
+        logger.info(f"AE reloaded: {current.version} → {bundle.version} (threshold={bundle.threshold})")
+        self._set_state("ok", version=bundle.version)
+
+    def check(self, bundle: ScoringBundle, err: float, ms: Optional[float] = None):
+        """Called by the service after each scored frame (`ms`: scoring time)."""
+        if self._probation_left <= 0:
+            if ms is not None:
+                b = self._baseline_ms
+                self._baseline_ms = ms if b is None else 0.9 * b + 0.1 * ms
+            return
+        with self._lock:
+            if bundle is not self.service.scoring or self._probation_left <= 0:
+                return
+            if not np.isfinite(err):
+                reason = "non-finite recon error"
+            else:
+                self._probation_errs.append(err)
+                if ms is not None:
+                    self._probation_ms.append(ms)
+                self._probation_left -= 1
+                if self._probation_left > 0:
+                    return
+                reason = self._probation_failure(bundle)
+                if reason is None:
+                    return
+            prev = self._previous
+            self.service.scoring = prev
+            self._probation_left = 0
+        logger.error(f"AE {bundle.version} failed probation ({reason}), rolled back to {prev.version}")
+        self._set_state("rolled_back", error=reason, version=prev.version)
+
+    def _probation_failure(self, bundle: ScoringBundle) -> Optional[str]:
+        """Why the finished probation failed, or None if it passed."""
+        rate = float(np.mean(np.asarray(self._probation_errs) > bundle.threshold))
+        if rate > self.max_anomaly_rate:
+            return f"anomaly rate {rate:.2f} > {self.max_anomaly_rate:.2f}"
+        if self._probation_ms and self._baseline_ms:
+            ms = float(np.median(self._probation_ms))
+            if ms > self.max_slowdown * self._baseline_ms:
+                return f"scoring {ms:.2f} ms > {self.max_slowdown:g}× {self._baseline_ms:.2f} ms"
+        return None
+
+    def _set_state(self, status, error=None, version=None):
+        self.state = {
+            "status": status,
+            "error": error,
+            "version": version or self.service.scoring.version,
+            "threshold": self.service.scoring.threshold,
+            "updated": datetime.datetime.utcnow().isoformat(),
+        }
+
+    # ── file watcher ─────────────────────────────────────────────────────
+    def _mtimes(self):
+        paths = (scoring_model_path(self.ae_path), self.stats_path,
+                 os.path.join(self.model_dir, THRESHOLD_FILE))
+        return tuple(os.path.getmtime(p) if os.path.exists(p) else None for p in paths)
+
+    def start_watching(self, interval_s: float = 5.0):
+        """Poll models/ for changes; reload once the files stop changing."""
+        if self._watcher is not None:
+            return
+
+        def _watch():
+            seen = self._mtimes()
+            while not self._stop.wait(interval_s):
+                now = self._mtimes()
+                if now == seen:
+                    continue
+                # debounce: wait for the copy to finish
+                time.sleep(interval_s)
+                if self._mtimes() != now:
+                    continue
+                # a reload already running → leave `seen` and retry next poll
+                if self.reload_async():
+                    seen = now
+                    logger.info("Model files changed on disk, reloading AE")
+
+        self._watcher = threading.Thread(target=_watch, daemon=True, name="ae-watch")
+        self._watcher.start()
+
+    def stop(self):
+        self._stop.set()
@@ -2,7 +2,6 @@
 
 import cv2
 import numpy as np
-import mediapipe as mp
 
 class PoseDetector:
     """
@@ -10,13 +9,14 @@ class PoseDetector:
     Ignores z + visibility; only returns (x, y) in pixel coords.
     """
 
-    def __init__(self, static_image_mode=False, min_detection_confidence=0.5):
+    def __init__(self, static_image_mode=False, min_detection_confidence=0.5, model_complexity=1):
+        import mediapipe as mp
+
         self.mp_pose = mp.solutions.pose
-        self.pose = self.mp_pose.Pose(
-            static_image_mode=static_image_mode,
-            min_detection_confidence=min_detection_confidence,
-            model_complexity=1,
-        )
+        self.static_image_mode = static_image_mode
+        self.min_detection_confidence = min_detection_confidence
+        self.model_complexity = model_complexity
+        self.pose = self._build_pose()
 
         # Select exactly 18 indices from MediaPipe’s 0–32 range.
         self.selected_indices = [
@@ -40,13 +40,29 @@ class PoseDetector:
             32,  # right foot index
         ]
 
-    def detect_pose(self, frame: np.ndarray) -> np.ndarray:
+    def _build_pose(self):
+        return self.mp_pose.Pose(
+            static_image_mode=self.static_image_mode,
+            min_detection_confidence=self.min_detection_confidence,
+            model_complexity=self.model_complexity,
+        )
+
+    def set_model_complexity(self, model_complexity: int):
+        """Rebuild the MediaPipe graph if the requested complexity differs."""
+        if model_complexity == self.model_complexity:
+            return
+        self.model_complexity = model_complexity
+        old, self.pose = self.pose, self._build_pose()
+        old.close()
+
+    def detect_pose(self, frame: np.ndarray, rgb_out: np.ndarray = None) -> np.ndarray:
         """
         Given a BGR frame, return an array of shape (18, 2) containing
         (x, y) pixel coordinates for each selected landmark.
         If no landmarks are detected for a given index, returns (0, 0) for that joint.
+        `rgb_out`, if given, is a reusable buffer for the RGB conversion.
         """
-        img_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+        img_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=rgb_out)
         results = self.pose.process(img_rgb)
 
         coords = np.zeros((len(self.selected_indices), 2), dtype=np.float32)
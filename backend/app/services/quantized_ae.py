@@ -0,0 +1,128 @@
+# backend/app/services/quantized_ae.py
+import os
+
+import numpy as np
+
+PRECISIONS = ("float16", "int8")
+
+
+def _relu(x):
+    return np.maximum(x, 0.0, out=x)
+
+
+def _sigmoid(x):
+    np.negative(x, out=x)
+    np.exp(x, out=x)
+    x += 1.0
+    return np.reciprocal(x, out=x)
+
+
+ACTIVATIONS = {
+    "linear": lambda x: x,
+    "relu": _relu,
+    "sigmoid": _sigmoid,
+    "tanh": lambda x: np.tanh(x, out=x),
+}
+
+
+def quantized_path(ae_path: str, precision: str) -> str:
+    """models/autoencoder.h5 → models/autoencoder_<precision>.npz"""
+    return f"{os.path.splitext(ae_path)[0]}_{precision}.npz"
+
+
+def dense_layers(model) -> list:
+    """[(W, b, activation), …] of a Keras model that is a plain Dense stack."""
+    import tensorflow as tf
+    layers = []
+    for layer in model.layers:
+        if isinstance(layer, (tf.keras.layers.InputLayer, tf.keras.layers.Dropout)):
+            continue                                # Dropout is a no-op at inference
+        if not isinstance(layer, tf.keras.layers.Dense):
+            raise RuntimeError(f"Unsupported layer {layer.name} ({type(layer).__name__}); only Dense stacks")
+        w, b = layer.get_weights()
+        layers.append((w, b, layer.get_config()["activation"]))
+    return layers
+
+
+def quantize_layers(layers, precision: str) -> dict:
+    """
+    [(W, b, activation), …] of a Dense stack → arrays for `np.savez`.
+    float16: weights and biases rounded to half precision.
+    int8:    symmetric per-output-unit weight quantization
+             (W ≈ q · scale, q ∈ [-127, 127]); biases stay float32.
+    """
+    if precision not in PRECISIONS:
+        raise ValueError(f"Unknown precision '{precision}' (choose from {PRECISIONS})")
+    out = {"precision": np.array(precision), "activations": np.array([a for _, _, a in layers])}
+    for i, (w, b, act) in enumerate(layers):
+        if act not in ACTIVATIONS:
+            raise ValueError(f"Layer {i}: unsupported activation '{act}'")
+        if precision == "float16":
+            out[f"w{i}"] = w.astype(np.float16)
+            out[f"b{i}"] = b.astype(np.float16)
+        else:
+            scale = np.abs(w).max(axis=0) / 127.0
+            scale[scale == 0] = 1.0
+            out[f"w{i}"] = np.clip(np.round(w / scale), -127, 127).astype(np.int8)
+            out[f"s{i}"] = scale.astype(np.float32)
+            out[f"b{i}"] = b.astype(np.float32)
+    return out
+
+
+class QuantizedAutoencoder:
+    """
+    NumPy forward pass of a Dense autoencoder stored at reduced precision,
+    with the same `predict` / `input_shape` / `output_shape` surface as the
+    Keras model, so it drops into `ScoringBundle` unchanged.
+
+    Weights stay resident at their stored precision (float16, or int8
+    plus a float32 per-output-unit scale) and are widened to float32 one
+    layer at a time inside `predict`; int8 layers apply the scale to the
+    matmul output (x·(q·s) = (x·q)·s). `resident_bytes` is what the
+    model actually holds in memory.
+    """
+
+    def __init__(self, weights, biases, activations, precision: str, stored_bytes: int,
+                 scales=None):
+        self.weights = weights
+        self.biases = biases
+        self.scales = scales or [None] * len(weights)
+        self.activations = [ACTIVATIONS[a] for a in activations]
+        self.precision = precision
+        self.stored_bytes = stored_bytes
+        self.input_shape = (None, weights[0].shape[0])
+        self.output_shape = (None, weights[-1].shape[1])
+
+    @property
+    def resident_bytes(self) -> int:
+        arrays = self.weights + self.biases + [s for s in self.scales if s is not None]
+        return int(sum(a.nbytes for a in arrays))
+
+    @classmethod
+    def from_arrays(cls, data) -> "QuantizedAutoencoder":
+        precision = str(data["precision"])
+        activations = [str(a) for a in data["activations"]]
+        weights, biases, scales, stored = [], [], [], 0
+        for i in range(len(activations)):
+            w, b = data[f"w{i}"], data[f"b{i}"]
+            s = data[f"s{i}"].astype(np.float32) if precision == "int8" else None
+            stored += w.nbytes + b.nbytes + (s.nbytes if s is not None else 0)
+            weights.append(np.ascontiguousarray(w))
+            biases.append(b.astype(np.float32))
+            scales.append(s)
+        return cls(weights, biases, activations, precision, stored, scales)
+
+    @classmethod
+    def load(cls, path: str) -> "QuantizedAutoencoder":
+        with np.load(path) as data:
+            return cls.from_arrays(data)
+
+    def predict(self, x, batch_size=None, verbose=False) -> np.ndarray:
+        x = np.asarray(x, dtype=np.float32)
+        for w, b, s, act in zip(self.weights, self.biases, self.scales, self.activations):
+            x = x @ (w if w.dtype == np.float32 else w.astype(np.float32))
+            if s is not None:
+                x *= s
+            x += b
+            x = act(x)
+        return x
@@ -0,0 +1,122 @@
+# backend/app/services/screenshot_dedup.py
+import os
+import shutil
+import threading
+from typing import Optional
+
+import cv2
+import numpy as np
+
+
+def dhash(image: np.ndarray, hash_size: int = 8) -> int:
+    """
+    Difference hash: shrink to (hash_size+1)×hash_size, grayscale, and set
+    one bit per horizontally adjacent pixel pair that gets brighter.
+    The shrink is bilinear to 8× the target, then area-averaged: each
+    cell still averages 64 samples, but it costs well under 0.1 ms at
+    1080p (a single INTER_AREA pass over the full frame takes ~6 ms).
+    """
+    w, h = hash_size + 1, hash_size
+    small = cv2.resize(image, (w * 8, h * 8), interpolation=cv2.INTER_LINEAR)
+    small = cv2.resize(small, (w, h), interpolation=cv2.INTER_AREA)
+    if small.ndim == 3:
+        small = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+    bits = (small[:, 1:] > small[:, :-1]).reshape(-1)
+    return int.from_bytes(np.packbits(bits).tobytes(), "big")
+
+
+def _hamming(hashes: np.ndarray, h: int) -> np.ndarray:
+    """Bit distance from `h` to every uint64 in `hashes`."""
+    x = np.bitwise_xor(hashes, np.uint64(h))
+    return np.unpackbits(x.view(np.uint8).reshape(-1, 8), axis=1).sum(axis=1)
+
+
+class ScreenshotDeduper:
+    """
+    Per-camera index of the last `window` saved screenshots' dHashes.
+    A candidate within `max_distance` bits of any of them is a duplicate
+    (same static scene) and should not be written; counters record how
+    many were saved vs. suppressed.
+    """
+
+    def __init__(
+        self,
+        max_distance: int = int(os.getenv("SCREENSHOT_DEDUP_DISTANCE", "6")),
+        window: int = int(os.getenv("SCREENSHOT_DEDUP_WINDOW", "32")),
+        hash_size: int = 8,
+    ):
+        if hash_size * hash_size > 64:
+            raise ValueError("hash_size must be ≤ 8 (64-bit hashes)")
+        self.max_distance = max_distance
+        self.window = window
+        self.hash_size = hash_size
+        self._cams = {}
+        self._lock = threading.Lock()
+
+    def _cam(self, camera_id: str) -> dict:
+        cam = self._cams.get(camera_id)
+        if cam is None:
+            cam = self._cams[camera_id] = {
+                "hashes": np.zeros(self.window, dtype=np.uint64),
+                "n": 0, "saved": 0, "suppressed": 0,
+            }
+        return cam
+
+    def check(self, camera_id: str, image: Optional[np.ndarray] = None,
+              h: Optional[int] = None) -> bool:
+        """
+        True if the screenshot should be saved (and remember its hash),
+        False if it duplicates a recent one (counted as suppressed).
+        """
+        if h is None:
+            h = dhash(image, self.hash_size)
+        with self._lock:
+            cam = self._cam(camera_id)
+            filled = min(cam["n"], self.window)
+            if filled and _hamming(cam["hashes"][:filled], h).min() <= self.max_distance:
+                cam["suppressed"] += 1
+                return False
+            cam["hashes"][cam["n"] % self.window] = h
+            cam["n"] += 1
+            cam["saved"] += 1
+            return True
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                cam_id: {"saved": c["saved"], "suppressed": c["suppressed"]}
+                for cam_id, c in self._cams.items()
+            }
+
+
+def dedup_directory(directory: str, deduper: Optional[ScreenshotDeduper] = None,
+                    action: str = "report", camera_id: str = "bulk") -> dict:
+    """
+    Walk `directory`'s .jpg files oldest-first (the timestamp prefix sorts
+    chronologically) through `deduper` and handle the duplicates:
+    "report" only lists them, "move" moves them to <directory>/duplicates/,
+    "delete" removes them. Images are decoded at 1/8 scale for speed.
+    """
+    if action not in ("report", "move", "delete"):
+        raise ValueError(f"Unknown action '{action}'")
+    deduper = deduper or ScreenshotDeduper()
+    dup_dir = os.path.join(directory, "duplicates")
+    kept, duplicates, unreadable = [], [], []
+
+    for fname in sorted(f for f in os.listdir(directory) if f.lower().endswith(".jpg")):
+        path = os.path.join(directory, fname)
+        img = cv2.imread(path, cv2.IMREAD_REDUCED_GRAYSCALE_8)
+        if img is None:
+            unreadable.append(fname)
+            continue
+        if deduper.check(camera_id, img):
+            kept.append(fname)
+            continue
+        duplicates.append(fname)
+        if action == "move":
+            os.makedirs(dup_dir, exist_ok=True)
+            shutil.move(path, os.path.join(dup_dir, fname))
+        elif action == "delete":
+            os.remove(path)
+
+    return {"kept": kept, "duplicates": duplicates, "unreadable": unreadable, "action": action}
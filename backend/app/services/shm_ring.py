@@ -0,0 +1,277 @@
+# backend/app/services/shm_ring.py
+import os
+import json
+import time
+import struct
+import threading
+from typing import Optional
+
+import numpy as np
+from multiprocessing import shared_memory
+
+# ── Layout ───────────────────────────────────────────────────────────────
+# header: magic(8s) version(u32) n_slots(u32) slot_size(u64) write_seq(u64)
+#         reader_heartbeat(f64)
+# slot:   seq(u64) blob_len(u32) meta_len(u32) feat_len(u32) pad(u32) | data
+_MAGIC = b"SRAIRING"
+_VERSION = 1
+_HDR = struct.Struct("<8sIIQQ")
+_HDR_SIZE = 64
+_SEQ_OFF = 24                       # offset of write_seq inside the header
+_BEAT_OFF = 32                      # last time any reader polled (unix s)
+_SLOT = struct.Struct("<QIIII")
+_SLOT_HDR = _SLOT.size
+
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    """Attach without letting this process' resource tracker unlink the segment."""
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)   # py ≥ 3.13
+    except TypeError:
+        shm = shared_memory.SharedMemory(name=name)
+        try:
+            from multiprocessing import resource_tracker
+            resource_tracker.unregister(shm._name, "shared_memory")
+        except Exception:
+            pass
+        return shm
+
+
+class RingFrame:
+    """One published record. `blob` and `features` are views into shared memory."""
+    __slots__ = ("seq", "blob", "meta", "features")
+
+    def __init__(self, seq, blob, meta, features):
+        self.seq = seq
+        self.blob = blob
+        self.meta = meta
+        self.features = features
+
+
+class FrameRing:
+    """
+    Single-writer / many-reader ring buffer in POSIX shared memory.
+
+    Every record gets a monotonically increasing sequence number. The
+    writer zeroes a slot's seq while filling it and stamps the real seq
+    last, so readers detect torn or overwritten slots by checking the
+    seq before and after they read (seqlock).
+    """
+
+    def __init__(self, shm: shared_memory.SharedMemory, owner: bool):
+        self.shm = shm
+        self.buf = shm.buf
+        self.owner = owner
+        magic, version, self.n_slots, self.slot_size, _ = _HDR.unpack_from(self.buf, 0)
+        if magic == bytes(len(_MAGIC)):
+            # writer created the segment but hasn't stamped the header yet
+            shm.close()
+            raise FileNotFoundError(f"FrameRing '{shm.name}' not initialised yet")
+        if magic != _MAGIC or version != _VERSION:
+            raise RuntimeError(f"Shared memory '{shm.name}' is not a FrameRing")
+
+    # ── construction ─────────────────────────────────────────────────────
+    @classmethod
+    def create(cls, name: str, n_slots: int = 8, slot_size: int = 2 * 1024 * 1024):
+        size = _HDR_SIZE + n_slots * slot_size
+        try:
+            shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        except FileExistsError:
+            # stale segment from a crashed worker
+            stale = _attach(name)
+            stale.close()
+            stale.unlink()
+            shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        _HDR.pack_into(shm.buf, 0, _MAGIC, _VERSION, n_slots, slot_size, 0)
+        for i in range(n_slots):
+            _SLOT.pack_into(shm.buf, _HDR_SIZE + i * slot_size, 0, 0, 0, 0, 0)
+        return cls(shm, owner=True)
+
+    @classmethod
+    def attach(cls, name: str):
+        return cls(_attach(name), owner=False)
+
+    # ── writer ───────────────────────────────────────────────────────────
+    def latest_seq(self) -> int:
+        return struct.unpack_from("<Q", self.buf, _SEQ_OFF)[0]
+
+    def publish(self, blob: bytes = b"", meta: Optional[dict] = None,
+                features: Optional[np.ndarray] = None) -> int:
+        """Write one record; returns its sequence number."""
+        meta_b = json.dumps(meta or {}).encode("utf-8")
+        feat = (np.ascontiguousarray(features, dtype=np.float32).reshape(-1)
+                if features is not None else np.zeros(0, dtype=np.float32))
+        need = _SLOT_HDR + len(blob) + len(meta_b) + feat.nbytes
+        if need > self.slot_size:
+            raise ValueError(f"Record of {need} bytes exceeds slot size {self.slot_size}")
+
+        seq = self.latest_seq() + 1
+        off = _HDR_SIZE + (seq % self.n_slots) * self.slot_size
+        struct.pack_into("<Q", self.buf, off, 0)              # slot busy
+        p = off + _SLOT_HDR
+        self.buf[p:p + len(blob)] = blob
+        p += len(blob)
+        self.buf[p:p + len(meta_b)] = meta_b
+        p += len(meta_b)
+        self.buf[p:p + feat.nbytes] = feat.tobytes()
+        _SLOT.pack_into(self.buf, off, seq, len(blob), len(meta_b), feat.size, 0)
+        struct.pack_into("<Q", self.buf, _SEQ_OFF, seq)       # publish
+        return seq
+
+    def reader_active(self, within_s: float = 2.0) -> bool:
+        """True if any reader polled the ring in the last `within_s` seconds."""
+        beat = struct.unpack_from("<d", self.buf, _BEAT_OFF)[0]
+        return time.time() - beat <= within_s
+
+    # ── reader ───────────────────────────────────────────────────────────
+    def touch(self):
+        """Tell the writer someone is watching (see `reader_active`)."""
+        struct.pack_into("<d", self.buf, _BEAT_OFF, time.time())
+
+    def read(self, seq: int, copy: bool = True) -> Optional[RingFrame]:
+        """
+        Return record `seq`, or None if it was never written, is being
+        written, or has already been overwritten. With copy=False the blob
+        and features are zero-copy views; call `still_valid(seq)` after
+        using them to make sure the writer didn't lap the reader meanwhile.
+        """
+        if seq <= 0:
+            return None
+        off = _HDR_SIZE + (seq % self.n_slots) * self.slot_size
+        s1, blob_len, meta_len, feat_len, _ = _SLOT.unpack_from(self.buf, off)
+        if s1 != seq:
+            return None
+        p = off + _SLOT_HDR
+        blob = self.buf[p:p + blob_len]
+        p += blob_len
+        meta_b = bytes(self.buf[p:p + meta_len])
+        p += meta_len
+        feats = np.frombuffer(self.buf, dtype=np.float32, count=feat_len, offset=p)
+        if copy:
+            blob, feats = bytes(blob), feats.copy()
+        if not self.still_valid(seq):
+            return None
+        return RingFrame(seq, blob, json.loads(meta_b), feats)
+
+    def still_valid(self, seq: int) -> bool:
+        off = _HDR_SIZE + (seq % self.n_slots) * self.slot_size
+        return struct.unpack_from("<Q", self.buf, off)[0] == seq
+
+    def close(self):
+        self.buf = None
+        try:
+            self.shm.close()
+        except BufferError:
+            pass        # a zero-copy view is still alive; the OS frees it at exit
+        if self.owner:
+            self.shm.unlink()
+
+
+class RingFrameSource:
+    """
+    API-side stand-in for `InferenceService` when inference runs in a
+    separate worker (see app/services/inference_worker.py). Reads the
+    worker's frame ring (`<name>`) and log ring (`<name>_log`).
+    """
+
+    def __init__(self, name: str, poll_s: float = 0.005, timeout_s: float = 10.0,
+                 stale_s: float = float(os.getenv("INFERENCE_STALE_S", "10"))):
+        self.name = name
+        self.poll_s = poll_s
+        self.timeout_s = timeout_s
+        # a viewer's stream ends once no new frame arrived for this long
+        # (worker died or hung), instead of pinning its thread forever
+        self.stale_s = stale_s
+        self._frames: Optional[FrameRing] = None
+        self._logs: Optional[FrameRing] = None
+        self._log_seq = 0
+        self._lock = threading.Lock()
+        self.governor = _RemoteGovernor(self)
+
+    def _rings(self):
+        # attach lazily so the API can start before the worker
+        if self._frames is None:
+            deadline = time.monotonic() + self.timeout_s
+            while True:
+                try:
+                    self._logs = FrameRing.attach(f"{self.name}_log")
+                    self._frames = FrameRing.attach(self.name)
+                    break
+                except FileNotFoundError:
+                    if self._logs is not None:
+                        self._logs.close()
+                        self._logs = None
+                    if time.monotonic() > deadline:
+                        raise RuntimeError(f"Inference worker ring '{self.name}' not found")
+                    time.sleep(0.1)
+        return self._frames, self._logs
+
+    def iter_frames(self):
+        """
+        Yield each newly published JPEG once (one generator per viewer).
+        Returns when the ring has been idle for `stale_s`.
+        """
+        frames, _ = self._rings()
+        last = 0
+        last_new = time.monotonic()
+        while True:
+            frames.touch()
+            seq = frames.latest_seq()
+            if seq == last:
+                if time.monotonic() - last_new > self.stale_s:
+                    return
+                time.sleep(self.poll_s)
+                continue
+            rec = frames.read(seq)
+            if rec is not None:
+                last = seq
+                last_new = time.monotonic()
+                yield rec.blob
+
+    def get_annotated_frame(self) -> bytes:
+        """Latest JPEG (may repeat the previous frame)."""
+        frames, _ = self._rings()
+        deadline = time.monotonic() + self.timeout_s
+        while time.monotonic() < deadline:
+            frames.touch()
+            rec = frames.read(frames.latest_seq())
+            if rec is not None:
+                return rec.blob
+            time.sleep(self.poll_s)
+        raise RuntimeError("Inference worker published no frame")
+
+    def latest_meta(self) -> dict:
+        _, logs = self._rings()
+        rec = logs.read(logs.latest_seq())
+        return rec.meta if rec is not None else {}
+
+    def pop_logs(self):
+        """Log entries published since the previous call, newest first."""
+        _, logs = self._rings()
+        with self._lock:
+            latest = logs.latest_seq()
+            start = max(self._log_seq + 1, latest - logs.n_slots + 1, 1)
+            entries = []
+            for seq in range(start, latest + 1):
+                rec = logs.read(seq)
+                if rec is not None and "log" in rec.meta:
+                    entries.append(rec.meta["log"])
+            self._log_seq = latest
+        entries.reverse()
+        return entries
+
+    def release(self):
+        for ring in (self._frames, self._logs):
+            if ring is not None:
+                ring.close()
+        self._frames = self._logs = None
+
+
+class _RemoteGovernor:
+    """Exposes the worker's SLO governor status like `SloGovernor.status()`."""
+
+    def __init__(self, source: RingFrameSource):
+        self.source = source
+
+    def status(self) -> dict:
+        return self.source.latest_meta().get("governor", {})
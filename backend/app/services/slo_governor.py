@@ -0,0 +1,121 @@
+# backend/app/services/slo_governor.py
+import time
+import logging
+import threading
+from dataclasses import dataclass, asdict
+from typing import List, Optional
+
+logger = logging.getLogger("InferenceService")
+
+
+@dataclass(frozen=True)
+class QualityLevel:
+    """One rung of the degradation ladder (level 0 = full quality)."""
+    name: str
+    frame_stride: int = 1        # process 1 of every N camera frames (stays current
+                                 # with the camera; doesn't count towards the SLO)
+    yolo_imgsz: int = 640        # YOLO inference resolution
+    pose_complexity: int = 1     # MediaPipe model_complexity
+    annotate: bool = True        # draw YOLO boxes with plot()
+
+
+DEFAULT_LEVELS: List[QualityLevel] = [
+    QualityLevel("full"),
+    QualityLevel("stride2",   frame_stride=2),
+    QualityLevel("imgsz480",  frame_stride=2, yolo_imgsz=480),
+    QualityLevel("pose_lite", frame_stride=2, yolo_imgsz=480, pose_complexity=0),
+    QualityLevel("no_annot",  frame_stride=3, yolo_imgsz=320, pose_complexity=0, annotate=False),
+]
+
+
+class SloGovernor:
+    """
+    Watches per-frame processing time against a latency SLO and walks
+    the quality ladder: down one level when the smoothed frame time stays
+    above `high_water` × budget, up one level when it stays below
+    `low_water` × budget. The gap between the two water marks, the
+    consecutive-frame requirements and the cooldown give hysteresis.
+
+    The budget is 1/target_fps per *processed* frame: skipping camera
+    frames with `frame_stride` doesn't make a slow frame compliant.
+    """
+
+    def __init__(
+        self,
+        target_fps: float = 10.0,
+        levels: Optional[List[QualityLevel]] = None,
+        high_water: float = 1.0,
+        low_water: float = 0.6,
+        down_after: int = 5,
+        up_after: int = 30,
+        cooldown_s: float = 3.0,
+        alpha: float = 0.2,
+    ):
+        self.levels = levels or DEFAULT_LEVELS
+        self.budget_ms = 1000.0 / target_fps
+        self.high_water = high_water
+        self.low_water = low_water
+        self.down_after = down_after
+        self.up_after = up_after
+        self.cooldown_s = cooldown_s
+        self.alpha = alpha
+
+        self.level_idx = 0
+        self.ewma_ms: Optional[float] = None
+        self._over = 0
+        self._under = 0
+        self._last_change = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def level(self) -> QualityLevel:
+        return self.levels[self.level_idx]
+
+    def record(self, frame_ms: float) -> QualityLevel:
+        """Feed one frame's processing time; returns the level for the next frame."""
+        with self._lock:
+            if self.ewma_ms is None:
+                self.ewma_ms = frame_ms
+            else:
+                self.ewma_ms += self.alpha * (frame_ms - self.ewma_ms)
+
+            if self.ewma_ms > self.high_water * self.budget_ms:
+                self._over += 1
+                self._under = 0
+            elif self.ewma_ms < self.low_water * self.budget_ms:
+                self._under += 1
+                self._over = 0
+            else:
+                self._over = self._under = 0
+
+            now = time.monotonic()
+            if now - self._last_change >= self.cooldown_s:
+                if self._over >= self.down_after and self.level_idx < len(self.levels) - 1:
+                    self._change(self.level_idx + 1, now)
+                elif self._under >= self.up_after and self.level_idx > 0:
+                    self._change(self.level_idx - 1, now)
+            return self.level
+
+    def _change(self, idx: int, now: float):
+        old = self.level
+        self.level_idx = idx
+        self._over = self._under = 0
+        self._last_change = now
+        logger.info(
+            f"SLO governor: {old.name} → {self.level.name} "
+            f"(frame≈{self.ewma_ms:.1f} ms, budget {self.budget_ms:.1f} ms)"
+        )
+
+    def status(self) -> dict:
+        """Snapshot for the `/governor` endpoint."""
+        with self._lock:
+            return {
+                "level_index": self.level_idx,
+                "level": asdict(self.level),
+                "num_levels": len(self.levels),
+                "frame_ms_ewma": None if self.ewma_ms is None else round(self.ewma_ms, 3),
+                "budget_ms": round(self.budget_ms, 3),
+                # processed frames per second, whatever the stride
+                "processed_fps": None if not self.ewma_ms else round(1000.0 / self.ewma_ms, 2),
+                "meets_slo": None if self.ewma_ms is None else self.ewma_ms <= self.budget_ms,
+            }
@@ -0,0 +1,166 @@
+# backend/app/services/video_analyzer.py
+import os
+import time
+from typing import Callable, Optional
+
+import cv2
+import numpy as np
+
+from app.services.inference_service import InferenceService
+from app.services.model_reloader import read_threshold_file
+from app.services.frame_pool import FramePool
+from app.services.feature_builder import FeatureBuilder
+
+
+class VideoAnalyzer(InferenceService):
+    """
+    Offline twin of `InferenceService` for scoring a video file: same
+    models, feature layout and scoring, but no camera, governor, tracker
+    or live side effects (DB log, heatmap, feature store). Frames are
+    processed in batches – one YOLO call and one autoencoder call per
+    batch; pose stays per-frame (MediaPipe has no batch API).
+    """
+
+    def __init__(
+        self,
+        yolo_model_path: str = "models/yolov8n.pt",
+        autoencoder_path: str = "models/autoencoder.h5",
+        norm_stats_path: str = "models/ae_norm_stats.npz",
+        anomaly_threshold: float = 0.06564145945012571,
+        yolo_imgsz: int = 640,
+    ):
+        threshold = read_threshold_file(os.path.dirname(autoencoder_path) or ".")
+        self._load_models(
+            yolo_model_path, autoencoder_path, norm_stats_path,
+            anomaly_threshold if threshold is None else threshold,
+        )
+        self.yolo_imgsz = yolo_imgsz
+
+    def analyze(
+        self,
+        video_path: str,
+        batch_size: int = 32,
+        stride: int = 1,
+        screenshot_dir: Optional[str] = None,
+        max_screenshots: int = 20,
+        event_gap: int = 15,
+        on_progress: Optional[Callable[[int, int], None]] = None,
+    ) -> dict:
+        """
+        Score every `stride`-th frame of `video_path`.
+
+        Consecutive anomalous frames (gaps ≤ `event_gap` source frames)
+        are merged into events; each event's peak-error frame is saved,
+        annotated, to `screenshot_dir` (at most `max_screenshots`).
+        `on_progress(done, total)` is called after every batch and may
+        raise to abort.
+        """
+        cap = cv2.VideoCapture(video_path)
+        if not cap.isOpened():
+            raise RuntimeError(f"Cannot open video {video_path}")
+        src_fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
+        total = int(cap.get(cv2.CAP_PROP_FRAME_COUNT)) // stride
+        width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+        height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+        self.pool = FramePool(height, width, n_frames=batch_size)
+        self.features = FeatureBuilder(self.num_classes, max_batch=batch_size)
+        poses = np.empty((batch_size, self.pose_dim), dtype=np.float32)
+        m = self.scoring
+        if screenshot_dir:
+            os.makedirs(screenshot_dir, exist_ok=True)
+
+        index, errors = [], []
+        events, event, best = [], None, None
+        frame_no = -1
+        t0 = time.perf_counter()
+
+        def close_event():
+            if screenshot_dir and best is not None and len(events) < max_screenshots:
+                name = f"event_{len(events):03d}_f{event['peak_frame']}.jpg"
+                cv2.imwrite(os.path.join(screenshot_dir, name), best)
+                event["screenshot"] = name
+            events.append(event)
+
+        try:
+            while True:
+                # ── read one batch into pooled buffers ───────────────────
+                frames, numbers = [], []
+                while len(frames) < batch_size:
+                    for _ in range(stride - 1):
+                        cap.grab()
+                        frame_no += 1
+                    ok, frame = self.pool.read(cap)
+                    if not ok:
+                        break
+                    frame_no += 1
+                    frames.append(frame)
+                    numbers.append(frame_no)
+                if not frames:
+                    break
+                n = len(frames)
+
+                # ── features: pose per frame, YOLO + builder once per batch
+                results = self.yolo(frames, imgsz=self.yolo_imgsz, verbose=False)
+                dets = []
+                for i, (frame, res) in enumerate(zip(frames, results)):
+                    poses[i] = self._pose(frame)
+                    dets.append((res.boxes.xyxy.cpu().numpy(),
+                                 res.boxes.cls.cpu().numpy().astype(int)))
+                feats = self.features.build(poses[:n], [cls for _, cls in dets])
+
+                # ── one autoencoder call per batch ───────────────────────
+                errs = self._score(feats, m)
+                index.extend(numbers)
+                errors.extend(float(e) for e in errs)
+
+                # ── merge anomalous frames into events ───────────────────
+                for i in np.flatnonzero(errs > m.threshold):
+                    fno, err = numbers[i], float(errs[i])
+                    if event is not None and fno - event["end_frame"] > event_gap:
+                        close_event()
+                        event = None
+                    if event is None:
+                        event = {"start_frame": fno, "end_frame": fno, "frames": 0,
+                                 "peak_frame": fno, "peak_error": err}
+                        best = None
+                        new_peak = True
+                    else:
+                        new_peak = err > event["peak_error"]
+                    event["end_frame"] = fno
+                    event["frames"] += 1
+                    if new_peak:
+                        event["peak_frame"], event["peak_error"] = fno, err
+                        # render only the current peak, and only within the budget
+                        if screenshot_dir and len(events) < max_screenshots:
+                            best = self.renderer.annotate(frames[i].copy(), *dets[i], True)
+
+                if on_progress is not None:
+                    on_progress(len(index), max(total, len(index)))
+            if event is not None:
+                close_event()
+        finally:
+            cap.release()
+
+        for e in events:
+            e["start_s"] = round(e["start_frame"] / src_fps, 3)
+            e["end_s"] = round(e["end_frame"] / src_fps, 3)
+            e["peak_error"] = round(e["peak_error"], 6)
+
+        errors = np.asarray(errors)
+        return {
+            "video": os.path.basename(video_path),
+            "source_fps": src_fps,
+            "frame_size": [width, height],
+            "stride": stride,
+            "threshold": m.threshold,
+            "model_version": m.version,
+            "frames_scored": len(index),
+            "anomalous_frames": int((errors > m.threshold).sum()),
+            "elapsed_s": round(time.perf_counter() - t0, 2),
+            "frames": {
+                "index": index,
+                "time_s": [round(i / src_fps, 3) for i in index],
+                "recon_error": np.round(errors, 6).tolist(),
+            },
+            "events": events,
+        }
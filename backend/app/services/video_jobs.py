@@ -0,0 +1,287 @@
+# backend/app/services/video_jobs.py
+"""
+Background analysis of uploaded / server-side video files.
+
+Jobs run in a small spawn-based process pool, so they never share the
+GIL or the models with the live pipeline; each pool process is niced and
+thread-capped, and loads its `VideoAnalyzer` once. Every job owns a
+directory under data/video_jobs/<id>/:
+
+    status.json    state, progress, timings (rewritten after every batch)
+    result.json    per-frame errors + anomaly events (when done)
+    screenshots/   annotated peak frame of each event
+    cancel         flag file; the worker stops at the next batch
+"""
+import os
+import json
+import uuid
+import shutil
+import logging
+import datetime
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+logger = logging.getLogger("InferenceService")
+
+JOB_ROOT = os.path.join("data", "video_jobs")
+ACTIVE_STATES = ("queued", "running")
+
+
+class JobQueueFull(RuntimeError):
+    pass
+
+
+class JobCancelled(Exception):
+    pass
+
+
+def _now() -> str:
+    return datetime.datetime.utcnow().isoformat()
+
+
+def _write_json(path: str, data: dict):
+    tmp = path + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump(data, f)
+    os.replace(tmp, path)
+
+
+def _read_json(path: str) -> dict:
+    with open(path) as f:
+        return json.load(f)
+
+
+def _alive(pid: Optional[int]) -> bool:
+    if not pid:
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+# ── pool-process side ────────────────────────────────────────────────────
+_analyzer = None
+_analyzer_key = None
+
+
+def _init_worker(threads: int, nice: int):
+    # cap every native thread pool before TF / torch / OpenCV start
+    for var in ("OMP_NUM_THREADS", "MKL_NUM_THREADS", "OPENBLAS_NUM_THREADS",
+                "TF_NUM_INTRAOP_THREADS", "TF_NUM_INTEROP_THREADS"):
+        os.environ[var] = str(threads)
+    if nice:
+        os.nice(nice)
+    import cv2
+    cv2.setNumThreads(threads)
+
+
+def _get_analyzer(models: dict):
+    """One analyzer per pool process, rebuilt when a model file changes."""
+    global _analyzer, _analyzer_key
+    from app.services.video_analyzer import VideoAnalyzer
+
+    key = tuple(
+        (p, os.path.getmtime(p) if os.path.exists(p) else None)
+        for p in (models["yolo_model_path"], models["autoencoder_path"], models["norm_stats_path"])
+    )
+    if _analyzer is None or key != _analyzer_key:
+        _analyzer = VideoAnalyzer(**models)
+        _analyzer_key = key
+    return _analyzer
+
+
+def run_job(job_dir: str, video_path: str, models: dict, params: dict) -> dict:
+    """Pool entry point: analyze one video, keeping status.json current."""
+    status_path = os.path.join(job_dir, "status.json")
+    cancel_path = os.path.join(job_dir, "cancel")
+    status = _read_json(status_path)
+    status.update(state="running", started=_now())
+    _write_json(status_path, status)
+
+    def on_progress(done, total):
+        if os.path.exists(cancel_path):
+            raise JobCancelled()
+        status.update(frames_done=done, frames_total=total, progress=round(done / total, 4))
+        _write_json(status_path, status)
+
+    try:
+        if os.path.exists(cancel_path):
+            raise JobCancelled()
+        result = _get_analyzer(models).analyze(
+            video_path,
+            screenshot_dir=os.path.join(job_dir, "screenshots"),
+            on_progress=on_progress,
+            **params,
+        )
+        _write_json(os.path.join(job_dir, "result.json"), result)
+        status.update(state="done", progress=1.0, events=len(result["events"]),
+                      anomalous_frames=result["anomalous_frames"])
+    except JobCancelled:
+        status.update(state="cancelled")
+    except Exception as e:
+        logger.exception(f"Video job {status['id']} failed")
+        status.update(state="failed", error=str(e))
+    status["finished"] = _now()
+    _write_json(status_path, status)
+    return status
+
+
+# ── API side ─────────────────────────────────────────────────────────────
+class JobManager:
+    """
+    Queues video analysis jobs onto at most `max_workers` processes, with
+    at most `max_pending` jobs waiting; `create()` raises `JobQueueFull`
+    beyond that. Status and results live on disk, so they survive an API
+    restart (jobs whose owning API process is gone are marked failed).
+    """
+
+    def __init__(
+        self,
+        root: str = JOB_ROOT,
+        max_workers: int = int(os.getenv("VIDEO_JOB_WORKERS", "1")),
+        max_pending: int = int(os.getenv("VIDEO_JOB_QUEUE", "4")),
+        threads: int = int(os.getenv("VIDEO_JOB_THREADS", "2")),
+        nice: int = int(os.getenv("VIDEO_JOB_NICE", "10")),
+        models: Optional[dict] = None,
+    ):
+        self.root = root
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.threads = threads
+        self.nice = nice
+        self.models = models or {
+            "yolo_model_path": "models/yolov8n.pt",
+            "autoencoder_path": "models/autoencoder.h5",
+            "norm_stats_path": "models/ae_norm_stats.npz",
+        }
+        self._pool = None
+        self._futures = {}
+        self._lock = threading.Lock()
+        os.makedirs(root, exist_ok=True)
+        self._fail_orphans()
+
+    def _fail_orphans(self):
+        for job_id in os.listdir(self.root):
+            path = os.path.join(self.root, job_id, "status.json")
+            if os.path.exists(path):
+                status = _read_json(path)
+                if status["state"] in ACTIVE_STATES and not _alive(status.get("owner")):
+                    status.update(state="failed", error="Interrupted by API restart", finished=_now())
+                    _write_json(path, status)
+
+    def _executor(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(self.threads, self.nice),
+            )
+        return self._pool
+
+    def job_dir(self, job_id: str) -> str:
+        # ids are generated here; reject anything else before touching disk
+        if not job_id.isalnum():
+            raise KeyError(job_id)
+        path = os.path.join(self.root, job_id)
+        if not os.path.isdir(path):
+            raise KeyError(job_id)
+        return path
+
+    def create(self, source: str, params: dict) -> str:
+        """Reserve a slot and a job directory; the input goes in before `start()`."""
+        with self._lock:
+            self._futures = {k: f for k, f in self._futures.items() if f is None or not f.done()}
+            active = len(self._futures)
+            if active >= self.max_workers + self.max_pending:
+                raise JobQueueFull(f"{active} video jobs already queued or running")
+            job_id = uuid.uuid4().hex[:12]
+            self._futures[job_id] = None
+        job_dir = os.path.join(self.root, job_id)
+        os.makedirs(job_dir)
+        _write_json(os.path.join(job_dir, "status.json"), {
+            "id": job_id, "state": "queued", "source": source, "params": params,
+            "owner": os.getpid(),
+            "created": _now(), "started": None, "finished": None,
+            "progress": 0.0, "frames_done": 0, "frames_total": None, "error": None,
+        })
+        return job_id
+
+    def start(self, job_id: str, video_path: str):
+        job_dir = self.job_dir(job_id)
+        params = _read_json(os.path.join(job_dir, "status.json"))["params"]
+        with self._lock:
+            try:
+                future = self._executor().submit(run_job, job_dir, video_path, self.models, params)
+            except RuntimeError:
+                # pool broken by a crashed worker: start a fresh one
+                self._pool = None
+                future = self._executor().submit(run_job, job_dir, video_path, self.models, params)
+            self._futures[job_id] = future
+        future.add_done_callback(lambda f, job_id=job_id: self._on_done(job_id, f))
+
+    def _on_done(self, job_id: str, future):
+        if future.cancelled():
+            self._set_state(job_id, "cancelled")
+        elif future.exception() is not None:
+            # the pool process died (OOM, segfault, …) before writing a status
+            self._set_state(job_id, "failed", error=repr(future.exception()))
+
+    def _set_state(self, job_id: str, state: str, **fields):
+        path = os.path.join(self.job_dir(job_id), "status.json")
+        status = _read_json(path)
+        status.update(state=state, finished=_now(), **fields)
+        _write_json(path, status)
+
+    def discard(self, job_id: str):
+        """Drop a job whose input never arrived."""
+        with self._lock:
+            self._futures.pop(job_id, None)
+        shutil.rmtree(os.path.join(self.root, job_id), ignore_errors=True)
+
+    def status(self, job_id: str) -> dict:
+        return _read_json(os.path.join(self.job_dir(job_id), "status.json"))
+
+    def list(self) -> list:
+        jobs = []
+        for job_id in os.listdir(self.root):
+            path = os.path.join(self.root, job_id, "status.json")
+            if os.path.exists(path):
+                jobs.append(_read_json(path))
+        return sorted(jobs, key=lambda s: s["created"], reverse=True)
+
+    def result(self, job_id: str) -> Optional[dict]:
+        path = os.path.join(self.job_dir(job_id), "result.json")
+        return _read_json(path) if os.path.exists(path) else None
+
+    def screenshot(self, job_id: str, name: str) -> str:
+        path = os.path.join(self.job_dir(job_id), "screenshots", os.path.basename(name))
+        if not os.path.exists(path):
+            raise KeyError(name)
+        return path
+
+    def cancel(self, job_id: str) -> dict:
+        """Cancel a queued job now, or ask a running one to stop after its batch."""
+        job_dir = self.job_dir(job_id)
+        future = self._futures.get(job_id)
+        if future is not None and future.cancel():
+            return self.status(job_id)      # _on_done has marked it cancelled
+        status = self.status(job_id)
+        if status["state"] in ACTIVE_STATES:
+            open(os.path.join(job_dir, "cancel"), "w").close()
+            status["cancel_requested"] = True
+        return status
+
+    def shutdown(self):
+        if self._pool is not None:
+            for job_id, future in list(self._futures.items()):
+                if future is not None and not future.done():
+                    self.cancel(job_id)
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
@@ -0,0 +1,42 @@
+# backend/app/services/yolo_detect.py
+"""Framework-free halves of the BentoML YOLO service (see bentoml_service.py)."""
+import cv2
+import numpy as np
+
+
+def decode_image(image: bytes) -> np.ndarray:
+    frame = cv2.imdecode(np.frombuffer(image, dtype=np.uint8), cv2.IMREAD_COLOR)
+    if frame is None:
+        raise ValueError("Could not decode image bytes")
+    return frame
+
+
+def detect_frames(model, names, frames) -> list:
+    """
+    One YOLO forward pass over `frames`; one entry per frame:
+    {"boxes": [[x1,y1,x2,y2],…], "classes": [int], "labels": [str], "scores": [float]}.
+    """
+    out = []
+    for res in model(list(frames), verbose=False):
+        cls = res.boxes.cls.cpu().numpy().astype(int)
+        out.append({
+            "boxes":   res.boxes.xyxy.cpu().numpy().round(1).tolist(),
+            "classes": cls.tolist(),
+            "labels":  [names[c] for c in cls],
+            "scores":  res.boxes.conf.cpu().numpy().round(4).tolist(),
+        })
+    return out
+
+
+def draw_detections(frame: np.ndarray, detections: dict) -> np.ndarray:
+    """Boxes + "label score" captions, drawn in place."""
+    for (x1, y1, x2, y2), label, score in zip(
+        detections["boxes"], detections["labels"], detections["scores"]
+    ):
+        p1, p2 = (int(x1), int(y1)), (int(x2), int(y2))
+        cv2.rectangle(frame, p1, p2, (0, 255, 0), 2)
+        cv2.putText(
+            frame, f"{label} {score:.2f}", (p1[0], max(p1[1] - 5, 10)),
+            cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 255, 0), 1
+        )
+    return frame
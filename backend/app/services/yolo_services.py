@@ -1,6 +1,5 @@
 # backend/app/services/yolo_service.py
 import os
-from ultralytics import YOLO
 import cv2, logging
 import numpy as np
 from threading import Thread
@@ -9,7 +8,8 @@ from app.services.video_capture import get_video_source
 
 class MotionYoloProcessor:
     def __init__(self, model_path: str = "yolov8n.pt", source: int = 0):
-        # Load YOLO model
+        # Load YOLO model (ultralytics/torch imported only when one is built)
+        from ultralytics import YOLO
         self.model = YOLO(model_path)
         # OpenCV video capture with fallback
         PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
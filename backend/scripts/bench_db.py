@@ -0,0 +1,91 @@
+# backend/scripts/bench_db.py
+"""
+Latency check for the SQL data-access layer against a throwaway SQLite DB.
+
+    python scripts/bench_db.py
+
+Seeds N users, then times (p50/p99):
+  - the old `SELECT * FROM users` + fetchall()
+  - keyset pages at the start and the end of the table
+  - a full server-side-cursor stream
+  - GET /predict/users and /predict/users/stream through FastAPI
+"""
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+# Point the data-access layer at a temp SQLite file *before* importing it
+TMP_DIR = tempfile.mkdtemp(prefix="saferoom_db_")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(TMP_DIR, 'bench.db')}"
+
+SCRIPT_DIR = os.path.dirname(os.path.realpath(__file__))
+BACKEND_DIR = os.path.abspath(os.path.join(SCRIPT_DIR, os.pardir))
+sys.path.insert(0, BACKEND_DIR)
+
+from sqlalchemy import text
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.database import engine, SessionLocal, keyset_page, stream_rows
+from app.api.dbroute import router as db_router
+
+N_USERS  = int(os.getenv("BENCH_USERS", "50000"))
+REPEATS  = int(os.getenv("BENCH_REPEATS", "50"))
+PAGE     = 100
+
+
+def timed(fn, repeats=REPEATS):
+    samples = []
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - t0) * 1000.0)
+    return np.percentile(samples, 50), np.percentile(samples, 99)
+
+
+def report(name, p50_p99):
+    p50, p99 = p50_p99
+    print(f"   {name:<32} p50={p50:8.3f} ms   p99={p99:8.3f} ms")
+
+
+# 1) Seed
+print(f"1) Seeding {N_USERS} users into {os.environ['DATABASE_URL']}")
+with engine.begin() as conn:
+    conn.execute(text("CREATE TABLE users (id INTEGER PRIMARY KEY, name TEXT, email TEXT)"))
+    conn.execute(
+        text("INSERT INTO users (id, name, email) VALUES (:id, :name, :email)"),
+        [{"id": i, "name": f"user{i}", "email": f"user{i}@example.com"}
+         for i in range(1, N_USERS + 1)],
+    )
+
+# 2) Session-level timings
+print("2) Data-access layer:")
+db = SessionLocal()
+report("fetchall (old /users)", timed(
+    lambda: db.execute(text("SELECT * FROM users")).fetchall(), repeats=5))
+report("keyset page, first", timed(lambda: keyset_page(db, "users", limit=PAGE)))
+report("keyset page, last", timed(
+    lambda: keyset_page(db, "users", after=N_USERS - PAGE, limit=PAGE)))
+report("stream all rows", timed(
+    lambda: sum(1 for _ in stream_rows(db, "SELECT * FROM users")), repeats=5))
+db.close()
+
+# 3) Endpoint timings
+print("3) HTTP endpoints:")
+app = FastAPI()
+app.include_router(db_router, prefix="/predict")
+client = TestClient(app)
+
+page = client.get("/predict/users", params={"limit": PAGE}).json()
+assert len(page["items"]) == PAGE and page["next_after"] == PAGE, page
+report("GET /predict/users", timed(
+    lambda: client.get("/predict/users", params={"limit": PAGE})))
+report("GET /predict/users (deep)", timed(
+    lambda: client.get("/predict/users", params={"after": N_USERS - PAGE, "limit": PAGE})))
+report("GET /predict/users/stream", timed(
+    lambda: client.get("/predict/users/stream").content, repeats=5))
+
+print("Done.")
@@ -0,0 +1,117 @@
+# backend/scripts/bench_frame_pool.py
+"""
+Allocation / RSS benchmark for the per-frame image path, without models:
+read → BGR→RGB → draw boxes + banner → JPEG encode.
+
+    python scripts/bench_frame_pool.py [video] [WIDTHxHEIGHT]
+
+  baseline: cap.read() + cvtColor() + frame.copy() (what plot() did)
+  pooled:   FramePool.read() + cvtColor(dst=…) + in-place FrameRenderer
+
+For each, reports bytes allocated per frame (tracemalloc peak over the
+frame), allocation blocks per frame, and process RSS before/after.
+The clip is first re-encoded at the requested size (default 1920x1080)
+so the numbers reflect full-resolution cameras.
+"""
+import os
+import sys
+import tempfile
+import tracemalloc
+
+SCRIPT_DIR = os.path.dirname(os.path.realpath(__file__))
+BACKEND_DIR = os.path.abspath(os.path.join(SCRIPT_DIR, os.pardir))
+sys.path.insert(0, BACKEND_DIR)
+
+import cv2
+import numpy as np
+
+from app.services.frame_pool import FramePool
+from app.services.frame_renderer import FrameRenderer
+
+VIDEO   = sys.argv[1] if len(sys.argv) > 1 else "sample.mp4"
+SIZE    = tuple(int(v) for v in (sys.argv[2] if len(sys.argv) > 2 else "1920x1080").split("x"))
+FRAMES  = int(os.getenv("BENCH_FRAMES", "120"))
+BOXES   = np.array([[100, 100, 400, 600], [800, 200, 1100, 900], [1300, 300, 1600, 1000]], dtype=np.float32)
+CLASSES = np.array([0, 0, 56])
+
+
+def rss_mb() -> float:
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) / 1024.0
+    return float("nan")
+
+
+def make_clip(src, size, n):
+    path = os.path.join(tempfile.mkdtemp(), "bench.avi")
+    cap = cv2.VideoCapture(src)
+    out = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*"MJPG"), 30, size)
+    for _ in range(n):
+        ok, f = cap.read()
+        if not ok:
+            cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            ok, f = cap.read()
+        out.write(cv2.resize(f, size))
+    out.release()
+    cap.release()
+    return path
+
+
+def baseline_frame(cap, renderer, state):
+    ok, frame = cap.read()
+    if not ok:
+        return False
+    rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+    annotated = frame.copy()
+    renderer.annotate(annotated, BOXES, CLASSES, True)
+    renderer.encode(annotated)
+    return True
+
+
+def pooled_frame(cap, renderer, state):
+    pool = state["pool"]
+    ok, frame = pool.read(cap)
+    if not ok:
+        return False
+    cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=pool.rgb)
+    renderer.annotate(frame, BOXES, CLASSES, True)
+    renderer.encode(frame)
+    return True
+
+
+def run(name, step, clip):
+    cap = cv2.VideoCapture(clip)
+    w, h = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)), int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+    state = {"pool": FramePool(h, w)}
+    renderer = FrameRenderer({0: "person", 56: "chair"} | {i: str(i) for i in range(80) if i not in (0, 56)})
+    step(cap, renderer, state)             # warm-up (codec, first buffers)
+
+    rss0 = rss_mb()
+    per_frame_bytes, per_frame_blocks = [], []
+    tracemalloc.start()
+    n = 0
+    while True:
+        start, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        blocks0 = sys.getallocatedblocks()
+        if not step(cap, renderer, state):
+            break
+        _, peak = tracemalloc.get_traced_memory()
+        per_frame_bytes.append(peak - start)
+        per_frame_blocks.append(max(0, sys.getallocatedblocks() - blocks0))
+        n += 1
+    tracemalloc.stop()
+    cap.release()
+
+    print(f"   {name:<9} frames={n:<4} alloc/frame={np.mean(per_frame_bytes) / 1e6:7.2f} MB "
+          f"(p99 {np.percentile(per_frame_bytes, 99) / 1e6:6.2f})  "
+          f"py-blocks/frame={np.mean(per_frame_blocks):5.1f}  "
+          f"RSS {rss0:7.1f} → {rss_mb():7.1f} MB")
+
+
+print(f"1) Re-encoding {VIDEO} at {SIZE[0]}x{SIZE[1]} ({FRAMES} frames)…")
+clip = make_clip(VIDEO, SIZE, FRAMES)
+print("2) Per-frame image path:")
+run("baseline", baseline_frame, clip)
+run("pooled", pooled_frame, clip)
@@ -1,16 +1,22 @@
 # backend\scripts\compute_threshold.py
 import os
+import sys
 import numpy as np
 import tensorflow as tf
 
+# Make sure “app” is on the path
+SCRIPT_DIR = os.path.dirname(os.path.realpath(__file__))
+sys.path.insert(0, os.path.abspath(os.path.join(SCRIPT_DIR, os.pardir)))
+from app.services.feature_store import load_features_from_env
+
 # 1) Load the saved AE and normalization stats
 ae     = tf.keras.models.load_model("models/autoencoder.h5", compile=False)
 stats  = np.load("models/ae_norm_stats.npz")
 mean   = stats["mean"]
 std    = stats["std"]
 
-# 2) Load held-out “normal” features.
-raw = np.load("data/normal_features.npy")  # shape = (N, feature_dim)
+# 2) Load held-out “normal” features (or a FEATURE_STORE_DIR time range).
+raw = load_features_from_env("data/normal_features.npy")  # shape = (N, feature_dim)
 from sklearn.model_selection import train_test_split
 _, X_val_raw = train_test_split(
     raw, test_size=0.1, random_state=42, shuffle=True
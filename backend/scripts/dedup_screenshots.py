@@ -0,0 +1,52 @@
+# backend/scripts/dedup_screenshots.py
+"""
+Bulk-deduplicate an existing anomaly screenshot directory with the same
+dHash index the live service uses.
+
+    python scripts/dedup_screenshots.py                       # report only
+    python scripts/dedup_screenshots.py --action move         # → duplicates/
+    python scripts/dedup_screenshots.py --action delete --distance 4
+
+Files are compared oldest-first against the last --window kept ones;
+anything within --distance bits is a duplicate.
+"""
+import os
+import sys
+import time
+import argparse
+
+SCRIPT_DIR = os.path.dirname(os.path.realpath(__file__))
+BACKEND_DIR = os.path.abspath(os.path.join(SCRIPT_DIR, os.pardir))
+sys.path.insert(0, BACKEND_DIR)
+
+from app.services.screenshot_dedup import ScreenshotDeduper, dedup_directory
+
+p = argparse.ArgumentParser(description="Deduplicate anomaly screenshots")
+p.add_argument("directory", nargs="?", default=os.path.join("data", "anomaly_screenshots"))
+p.add_argument("--action", choices=("report", "move", "delete"), default="report")
+p.add_argument("--distance", type=int, default=6, help="max Hamming distance for a duplicate")
+p.add_argument("--window", type=int, default=32, help="recent kept hashes to compare against")
+p.add_argument("-v", "--verbose", action="store_true", help="list every duplicate")
+args = p.parse_args()
+
+t0 = time.perf_counter()
+report = dedup_directory(
+    args.directory,
+    ScreenshotDeduper(max_distance=args.distance, window=args.window),
+    action=args.action,
+)
+elapsed = time.perf_counter() - t0
+
+n_kept, n_dup = len(report["kept"]), len(report["duplicates"])
+total = n_kept + n_dup
+print(f"{total} screenshots in {elapsed:.2f}s: kept {n_kept}, duplicates {n_dup}"
+      f" ({100.0 * n_dup / max(1, total):.1f}%)")
+if report["unreadable"]:
+    print(f"Unreadable: {len(report['unreadable'])}")
+if args.verbose:
+    for fname in report["duplicates"]:
+        print(f"   dup  {fname}")
+if args.action == "report" and n_dup:
+    print("Nothing changed; re-run with --action move or --action delete.")
+elif args.action == "move":
+    print(f"Duplicates moved to {os.path.join(args.directory, 'duplicates')}")
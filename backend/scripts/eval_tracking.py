@@ -0,0 +1,101 @@
+# backend/scripts/eval_tracking.py
+"""
+Measure what detect-every-N + box tracking costs in accuracy and saves in
+YOLO time, against running YOLO on every frame.
+
+    python scripts/eval_tracking.py [video] [N ...]
+
+Reports, per N: YOLO calls, YOLO seconds, exact class-histogram match
+rate, mean L1 histogram error and mean best-match box IoU vs. per-frame
+detection.
+"""
+import os
+import sys
+import time
+
+SCRIPT_DIR = os.path.dirname(os.path.realpath(__file__))
+BACKEND_DIR = os.path.abspath(os.path.join(SCRIPT_DIR, os.pardir))
+sys.path.insert(0, BACKEND_DIR)
+
+import cv2
+import numpy as np
+from ultralytics import YOLO
+
+from app.services.box_tracker import BoxTracker
+from app.services.feature_builder import class_histograms
+
+VIDEO      = sys.argv[1] if len(sys.argv) > 1 else "sample.mp4"
+N_VALUES   = [int(n) for n in sys.argv[2:]] or [2, 5, 10]
+MAX_FRAMES = int(os.getenv("EVAL_MAX_FRAMES", "300"))
+
+yolo = YOLO("models/yolov8n.pt")
+num_classes = len(yolo.model.names)
+
+
+def read_frames(path, limit):
+    cap = cv2.VideoCapture(path)
+    frames = []
+    while len(frames) < limit:
+        ok, f = cap.read()
+        if not ok:
+            break
+        frames.append(f)
+    cap.release()
+    return frames
+
+
+def mean_best_iou(a, b):
+    """Mean over boxes in `a` of the best IoU against any box in `b`."""
+    if len(a) == 0 and len(b) == 0:
+        return 1.0
+    if len(a) == 0 or len(b) == 0:
+        return 0.0
+    x1 = np.maximum(a[:, None, 0], b[None, :, 0])
+    y1 = np.maximum(a[:, None, 1], b[None, :, 1])
+    x2 = np.minimum(a[:, None, 2], b[None, :, 2])
+    y2 = np.minimum(a[:, None, 3], b[None, :, 3])
+    inter = np.clip(x2 - x1, 0, None) * np.clip(y2 - y1, 0, None)
+    area_a = (a[:, 2] - a[:, 0]) * (a[:, 3] - a[:, 1])
+    area_b = (b[:, 2] - b[:, 0]) * (b[:, 3] - b[:, 1])
+    iou = inter / (area_a[:, None] + area_b[None, :] - inter + 1e-9)
+    return float(iou.max(axis=1).mean())
+
+
+frames = read_frames(VIDEO, MAX_FRAMES)
+print(f"1) {len(frames)} frames from {VIDEO}")
+
+# 2) Reference: YOLO on every frame
+ref_boxes, ref_hists = [], []
+t0 = time.perf_counter()
+for f in frames:
+    res = yolo(f, verbose=False)[0]
+    cls = res.boxes.cls.cpu().numpy().astype(int)
+    ref_boxes.append(res.boxes.xyxy.cpu().numpy())
+    ref_hists.append(class_histograms([cls], num_classes)[0])
+ref_time = time.perf_counter() - t0
+print(f"2) every frame: {len(frames)} YOLO calls, {ref_time:.2f}s")
+
+# 3) Detect-every-N
+print(f"3) {'N':>3} {'calls':>6} {'yolo s':>7} {'speedup':>8} {'hist==':>7} {'L1':>6} {'IoU':>6}")
+for n in N_VALUES:
+    tracker = BoxTracker(detect_every=n)
+    calls, yolo_time = 0, 0.0
+    matches, l1, ious = 0, 0.0, []
+    for i, f in enumerate(frames):
+        detect, gray = tracker.should_detect(f)
+        if detect:
+            t0 = time.perf_counter()
+            res = yolo(f, verbose=False)[0]
+            yolo_time += time.perf_counter() - t0
+            calls += 1
+            tracker.reset(gray, res.boxes.xyxy.cpu().numpy(), res.boxes.cls.cpu().numpy().astype(int))
+        else:
+            tracker.update(gray)
+        hist = class_histograms([tracker.classes], num_classes)[0]
+        matches += int(np.array_equal(hist, ref_hists[i]))
+        l1 += float(np.abs(hist - ref_hists[i]).sum())
+        ious.append(mean_best_iou(tracker.boxes, ref_boxes[i]))
+    print(
+        f"   {n:>3} {calls:>6} {yolo_time:>7.2f} {ref_time / max(yolo_time, 1e-9):>7.1f}x "
+        f"{matches / len(frames):>7.2%} {l1 / len(frames):>6.2f} {np.mean(ious):>6.3f}"
+    )
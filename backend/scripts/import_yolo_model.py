@@ -1,5 +1,6 @@
 # backend/scripts/import_yolo_model.py
 
+import os
 from ultralytics import YOLO
 import bentoml
 from bentoml.exceptions import NotFound
@@ -7,6 +8,10 @@ from bentoml.exceptions import NotFound
 MODEL_PATH = "models/yolov8n.pt"
 MODEL_NAME = "yolov8n"
 
+# Adaptive batching limits picked up by app/services/bentoml_service.py
+MAX_BATCH_SIZE = int(os.getenv("YOLO_MAX_BATCH_SIZE", "16"))
+MAX_LATENCY_MS = int(os.getenv("YOLO_MAX_LATENCY_MS", "50"))
+
 try:
     bentoml.pytorch.get(f"{MODEL_NAME}:latest")
     print(f"✔️  '{MODEL_NAME}:latest' already in BentoML model store")
@@ -16,6 +21,10 @@ except NotFound:
     bentoml.pytorch.save_model(
         MODEL_NAME,
         yolom,
-        signatures={"predict": {"batchable": False}},
+        signatures={"predict": {"batchable": True, "batch_dim": 0}},
+        metadata={
+            "max_batch_size": MAX_BATCH_SIZE,
+            "max_latency_ms": MAX_LATENCY_MS,
+        },
     )
-    print("✅ Done.")
+    print(f"✅ Done (batchable, max_batch_size={MAX_BATCH_SIZE}, max_latency_ms={MAX_LATENCY_MS}).")
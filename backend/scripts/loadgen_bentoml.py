@@ -0,0 +1,71 @@
+# backend/scripts/loadgen_bentoml.py
+"""
+Local load generator for the BentoML YOLO service.
+
+    bentoml serve app.services.bentoml_service:SafeRoomAIService   # terminal 1
+    python scripts/loadgen_bentoml.py                               # terminal 2
+
+For each concurrency level, N client threads post the same image to
+/predict for DURATION seconds; prints throughput and p50/p99 latency.
+"""
+import os
+import sys
+import threading
+import time
+
+import httpx
+import numpy as np
+
+URL          = os.getenv("BENTO_URL", "http://localhost:3000/predict")
+IMAGE_DIR    = os.path.join("data", "anomaly_screenshots")
+LEVELS       = [int(c) for c in os.getenv("LOADGEN_LEVELS", "1,4,8,16,32").split(",")]
+DURATION     = float(os.getenv("LOADGEN_SECONDS", "15"))
+ANNOTATE     = os.getenv("LOADGEN_ANNOTATE", "0") == "1"
+
+# Pick any screenshot as the payload
+images = sorted(f for f in os.listdir(IMAGE_DIR) if f.lower().endswith(".jpg"))
+if not images:
+    print(f"No .jpg found under {IMAGE_DIR}")
+    sys.exit(1)
+with open(os.path.join(IMAGE_DIR, images[0]), "rb") as f:
+    PAYLOAD = f.read()
+
+
+def worker(stop_at, latencies, errors):
+    with httpx.Client(timeout=60.0) as client:
+        while time.perf_counter() < stop_at:
+            t0 = time.perf_counter()
+            try:
+                r = client.post(
+                    URL,
+                    files={"image": ("frame.jpg", PAYLOAD, "image/jpeg")},
+                    data={"annotate": str(ANNOTATE).lower()},
+                )
+                r.raise_for_status()
+                latencies.append(time.perf_counter() - t0)
+            except Exception:
+                errors.append(1)
+
+
+print(f"Target: {URL}  payload: {images[0]} ({len(PAYLOAD)} bytes)  annotate={ANNOTATE}")
+print(f"{'conc':>5} {'req/s':>8} {'p50 ms':>9} {'p99 ms':>9} {'errors':>7}")
+for conc in LEVELS:
+    latencies, errors = [], []
+    stop_at = time.perf_counter() + DURATION
+    threads = [
+        threading.Thread(target=worker, args=(stop_at, latencies, errors))
+        for _ in range(conc)
+    ]
+    t0 = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - t0
+
+    if latencies:
+        lat_ms = np.array(latencies) * 1000.0
+        p50, p99 = np.percentile(lat_ms, 50), np.percentile(lat_ms, 99)
+    else:
+        p50 = p99 = float("nan")
+    print(f"{conc:>5} {len(latencies) / elapsed:>8.1f} {p50:>9.1f} {p99:>9.1f} {len(errors):>7}")
@@ -0,0 +1,170 @@
+# backend/scripts/profile_startup.py
+"""
+Import-time / cold-start profile of the backend.
+
+    python scripts/profile_startup.py                      # app.main, ring mode
+    python scripts/profile_startup.py app.services.video_jobs scripts.bench_db
+    python scripts/profile_startup.py --budget-s 1.0 --budget-mb 150   # CI gate
+
+Each target is imported in a fresh interpreter with an import hook that
+records, per newly imported module, wall time and RSS growth – both
+"self" (excluding nested imports) and cumulative – plus which module
+imported it first. Reports the heaviest packages and imports, and which
+heavy frameworks (--forbid) got pulled in and by whom.
+
+By default INFERENCE_RING is set, so app.main starts as a lightweight API
+front-end (no models in-process); pass --in-process to profile the full
+InferenceService start instead (needs the models and the camera/video).
+Exits 1 if a target exceeds --budget-s / --budget-mb or imports a
+forbidden module.
+"""
+import os
+import sys
+import json
+import argparse
+import subprocess
+
+SCRIPT_DIR = os.path.dirname(os.path.realpath(__file__))
+BACKEND_DIR = os.path.abspath(os.path.join(SCRIPT_DIR, os.pardir))
+
+HEAVY = "tensorflow,keras,torch,ultralytics,mediapipe,pymongo,sqlalchemy,bentoml,sklearn"
+
+# Runs inside the child interpreter: argv[1] = module to import.
+_PROBE = r'''
+import builtins, json, os, sys, time
+
+def rss_mb():
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 1048576.0
+
+rss_start = rss_mb()
+t_start = time.perf_counter()
+_import = builtins.__import__
+stack = []          # [name, t0, rss0, child_s, child_mb]
+records = {}
+
+def _hooked(name, globals=None, locals=None, fromlist=(), level=0):
+    if level or name in sys.modules:
+        return _import(name, globals, locals, fromlist, level)
+    parent = stack[-1][0] if stack else "<target>"
+    frame = [name, time.perf_counter(), rss_mb(), 0.0, 0.0]
+    stack.append(frame)
+    try:
+        return _import(name, globals, locals, fromlist, level)
+    finally:
+        stack.pop()
+        cum_s = time.perf_counter() - frame[1]
+        cum_mb = rss_mb() - frame[2]
+        if stack:
+            stack[-1][3] += cum_s
+            stack[-1][4] += cum_mb
+        if name not in records:
+            records[name] = {
+                "parent": parent,
+                "cum_s": cum_s, "self_s": cum_s - frame[3],
+                "cum_mb": cum_mb, "self_mb": cum_mb - frame[4],
+            }
+
+builtins.__import__ = _hooked
+error = None
+try:
+    __import__(sys.argv[1])
+except BaseException as e:
+    error = f"{type(e).__name__}: {e}"
+builtins.__import__ = _import
+print("\n__PROFILE__" + json.dumps({
+    "total_s": time.perf_counter() - t_start,
+    "rss_start_mb": rss_start,
+    "rss_mb": rss_mb(),
+    "records": records,
+    "loaded": sorted({m.split(".")[0] for m in sys.modules}),
+    "error": error,
+}))
+'''
+
+
+def profile(target: str, env: dict) -> dict:
+    proc = subprocess.run(
+        [sys.executable, "-c", _PROBE, target],
+        cwd=BACKEND_DIR, env=env, capture_output=True, text=True,
+    )
+    marker = proc.stdout.rfind("__PROFILE__")
+    if marker < 0:
+        raise RuntimeError(f"Profiling {target} failed:\n{proc.stderr[-2000:]}")
+    return json.loads(proc.stdout[marker + len("__PROFILE__"):])
+
+
+def report(target, prof, top, forbid):
+    recs = prof["records"]
+    by_pkg = {}
+    for name, r in recs.items():
+        pkg = by_pkg.setdefault(name.split(".")[0], {"self_s": 0.0, "self_mb": 0.0, "modules": 0})
+        pkg["self_s"] += r["self_s"]
+        pkg["self_mb"] += r["self_mb"]
+        pkg["modules"] += 1
+
+    print(f"\n== {target}: {prof['total_s']:.3f}s, RSS {prof['rss_start_mb']:.0f} → {prof['rss_mb']:.0f} MB "
+          f"({prof['rss_mb'] - prof['rss_start_mb']:+.0f} MB), {len(recs)} modules")
+    if prof["error"]:
+        print(f"   import failed: {prof['error']}")
+
+    print(f"   {'package':<28}{'self s':>9}{'self MB':>9}{'modules':>9}")
+    for pkg, r in sorted(by_pkg.items(), key=lambda kv: -kv[1]["self_s"])[:top]:
+        print(f"   {pkg:<28}{r['self_s']:>9.3f}{r['self_mb']:>9.1f}{r['modules']:>9}")
+
+    print(f"   {'slowest imports (cumulative)':<40}{'cum s':>8}{'cum MB':>8}  imported by")
+    for name, r in sorted(recs.items(), key=lambda kv: -kv[1]["cum_s"])[:top]:
+        print(f"   {name:<40}{r['cum_s']:>8.3f}{r['cum_mb']:>8.1f}  {r['parent']}")
+
+    pulled = []
+    for pkg in forbid:
+        if pkg in prof["loaded"]:
+            first = min((n for n in recs if n.split(".")[0] == pkg), key=len, default=pkg)
+            who = recs.get(first, {}).get("parent", "?")
+            pulled.append(pkg)
+            print(f"   heavy import: {pkg} (via {who})")
+    return pulled
+
+
+def main():
+    p = argparse.ArgumentParser(description="Profile backend import time and memory")
+    p.add_argument("targets", nargs="*", default=["app.main"])
+    p.add_argument("--top", type=int, default=12)
+    p.add_argument("--in-process", action="store_true",
+                   help="don't set INFERENCE_RING (loads every model at import)")
+    p.add_argument("--forbid", default=HEAVY,
+                   help="comma-separated packages that must not be imported ('' to allow all)")
+    p.add_argument("--budget-s", type=float, default=None, help="max import time per target")
+    p.add_argument("--budget-mb", type=float, default=None, help="max RSS growth per target")
+    p.add_argument("--json", default=None, help="write raw profiles here")
+    args = p.parse_args()
+
+    env = dict(os.environ, PYTHONPATH=BACKEND_DIR)
+    if not args.in_process:
+        env.setdefault("INFERENCE_RING", "saferoom_profile")
+    forbid = [f for f in args.forbid.split(",") if f] if not args.in_process else []
+
+    failures, profiles = [], {}
+    for target in args.targets:
+        prof = profiles[target] = profile(target, env)
+        pulled = report(target, prof, args.top, forbid)
+        growth = prof["rss_mb"] - prof["rss_start_mb"]
+        if prof["error"]:
+            failures.append(f"{target}: {prof['error']}")
+        if args.budget_s is not None and prof["total_s"] > args.budget_s:
+            failures.append(f"{target}: {prof['total_s']:.2f}s > {args.budget_s}s")
+        if args.budget_mb is not None and growth > args.budget_mb:
+            failures.append(f"{target}: +{growth:.0f} MB > {args.budget_mb} MB")
+        if pulled:
+            failures.append(f"{target}: imports {', '.join(pulled)}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(profiles, f, indent=2)
+    for msg in failures:
+        print(f"FAIL: {msg}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+# backend/scripts/quantize_autoencoder.py
+"""
+Convert models/autoencoder.h5 to reduced-precision NumPy models and
+report how far their reconstruction errors drift from float32 Keras.
+
+    python scripts/quantize_autoencoder.py                 # float16 + int8
+    python scripts/quantize_autoencoder.py --precision int8
+
+Writes models/autoencoder_<precision>.npz (scored with AE_PRECISION=<precision>)
+and models/autoencoder_<precision>.report.json. The calibration runs on
+data/normal_features.npy (or FEATURE_STORE_DIR, see feature_store.py) and
+reports error drift, how many samples flip across the anomaly threshold,
+the threshold with the same false-positive rate, and per-frame latency.
+Exits 1 if any flip rate exceeds --max-flip-rate.
+"""
+import os
+import sys
+import json
+import time
+import argparse
+
+import numpy as np
+import tensorflow as tf
+
+SCRIPT_DIR = os.path.dirname(os.path.realpath(__file__))
+sys.path.insert(0, os.path.abspath(os.path.join(SCRIPT_DIR, os.pardir)))
+from app.services.feature_store import load_features_from_env
+from app.services.model_reloader import read_threshold_file
+from app.services.quantized_ae import (
+    PRECISIONS, QuantizedAutoencoder, dense_layers, quantize_layers, quantized_path,
+)
+
+p = argparse.ArgumentParser(description="Quantize the anomaly autoencoder")
+p.add_argument("--precision", choices=PRECISIONS + ("all",), default="all")
+p.add_argument("--ae", default="models/autoencoder.h5")
+p.add_argument("--stats", default="models/ae_norm_stats.npz")
+p.add_argument("--features", default="data/normal_features.npy")
+p.add_argument("--threshold", type=float, default=None,
+               help="default: models/ae_threshold.json, else the service default")
+p.add_argument("--max-samples", type=int, default=50000)
+p.add_argument("--max-flip-rate", type=float, default=0.001,
+               help="allowed fraction of samples whose anomaly decision changes")
+args = p.parse_args()
+
+precisions = PRECISIONS if args.precision == "all" else (args.precision,)
+threshold = args.threshold or read_threshold_file(os.path.dirname(args.ae) or ".") or 0.06564145945012571
+
+# 1) Load the AE and pull out its Dense stack
+print(f"1) Loading {args.ae}…")
+ae = tf.keras.models.load_model(args.ae, compile=False)
+layers = dense_layers(ae)
+print(f"   {len(layers)} Dense layers: " + " → ".join(str(w.shape[1]) for w, _, _ in layers))
+
+# 2) Calibration data, normalized exactly like the service (float32 throughout)
+stats = np.load(args.stats)
+mean = stats["mean"].astype(np.float32)
+std = stats["std"].astype(np.float32)
+std[std < 1e-3] = 1e-3
+raw = load_features_from_env(args.features)
+if len(raw) > args.max_samples:
+    raw = raw[np.random.default_rng(42).choice(len(raw), args.max_samples, replace=False)]
+X = np.nan_to_num((raw.astype(np.float32) - mean) / std, nan=0.0, posinf=0.0, neginf=0.0)
+print(f"2) Calibrating on {len(X)} normal samples, threshold={threshold:.6f}")
+
+
+def recon_errors(model, x):
+    return np.mean((model.predict(x, batch_size=1024, verbose=False) - x) ** 2, axis=1)
+
+
+def per_frame_ms(model, x, n=200):
+    row = x[:1]
+    model.predict(row, verbose=False)
+    t0 = time.perf_counter()
+    for _ in range(n):
+        model.predict(row, verbose=False)
+    return (time.perf_counter() - t0) * 1000.0 / n
+
+
+err32 = recon_errors(ae, X)
+keras_ms = per_frame_ms(ae, X)
+keras_bytes = sum(w.nbytes + b.nbytes for w, b, _ in layers)
+
+# A float32 NumPy pass must reproduce Keras; otherwise the graph isn't a plain chain
+ref = QuantizedAutoencoder([w for w, _, _ in layers], [b for _, b, _ in layers],
+                           [a for _, _, a in layers], "float32", keras_bytes)
+if not np.allclose(recon_errors(ref, X[:1000]), err32[:1000], rtol=1e-3, atol=1e-6):
+    raise RuntimeError("NumPy float32 pass disagrees with Keras; model is not a sequential Dense stack")
+
+anom32 = err32 > threshold
+fpr32 = float(anom32.mean())
+failed = False
+
+# 3) Quantize, reload from disk, compare
+for precision in precisions:
+    out_path = quantized_path(args.ae, precision)
+    np.savez(out_path, **quantize_layers(layers, precision))
+    q = QuantizedAutoencoder.load(out_path)
+
+    errq = recon_errors(q, X)
+    rel = np.abs(errq - err32) / np.maximum(err32, 1e-12)
+    anomq = errq > threshold
+    flips = int((anomq != anom32).sum())
+    report = {
+        "precision": precision,
+        "source": args.ae,
+        "samples": int(len(X)),
+        "threshold": threshold,
+        "rel_drift": {
+            "median": float(np.median(rel)),
+            "p99": float(np.percentile(rel, 99)),
+            "max": float(rel.max()),
+        },
+        "error_p50": {"float32": float(np.median(err32)), precision: float(np.median(errq))},
+        "error_p99": {"float32": float(np.percentile(err32, 99)), precision: float(np.percentile(errq, 99))},
+        "false_positive_rate": {"float32": fpr32, precision: float(anomq.mean())},
+        "threshold_flips": flips,
+        "flip_rate": flips / len(X),
+        # threshold giving the quantized model float32's false-positive rate
+        "matched_threshold": float(np.quantile(errq, 1.0 - fpr32)) if fpr32 > 0 else None,
+        "weight_bytes_on_disk": {"float32": int(keras_bytes), precision: int(q.stored_bytes)},
+        "weight_bytes_resident": {"float32": int(keras_bytes), precision: q.resident_bytes},
+        "per_frame_ms": {"keras_float32": round(keras_ms, 4), precision: round(per_frame_ms(q, X), 4)},
+    }
+    report["threshold_holds"] = report["flip_rate"] <= args.max_flip_rate
+    failed |= not report["threshold_holds"]
+    with open(os.path.splitext(out_path)[0] + ".report.json", "w") as f:
+        json.dump(report, f, indent=2)
+
+    print(f"\n   {precision} → {out_path}")
+    print(f"   drift |Δerr|/err     median {report['rel_drift']['median']:.2e}  "
+          f"p99 {report['rel_drift']['p99']:.2e}  max {report['rel_drift']['max']:.2e}")
+    print(f"   error p99            {report['error_p99']['float32']:.6f} → {report['error_p99'][precision]:.6f}")
+    print(f"   false-positive rate  {fpr32:.4%} → {report['false_positive_rate'][precision]:.4%}  "
+          f"({flips} flips, {report['flip_rate']:.4%})")
+    if report["matched_threshold"] is not None:
+        print(f"   matched threshold    {report['matched_threshold']:.6f}")
+    print(f"   weights in memory    {keras_bytes / 1024:.1f} KiB → {q.resident_bytes / 1024:.1f} KiB "
+          f"(on disk {q.stored_bytes / 1024:.1f} KiB)")
+    print(f"   per frame            {keras_ms:.3f} ms (Keras) → {report['per_frame_ms'][precision]:.3f} ms")
+    print(f"   threshold holds:     {'yes' if report['threshold_holds'] else 'NO'}")
+
+print("\nScore with one of them by starting the service with AE_PRECISION=<precision>.")
+sys.exit(1 if failed else 0)
@@ -1,10 +1,16 @@
 # backend\scripts\retrain_autoencoder.py
 import os
+import sys
 import numpy as np
 import tensorflow as tf
 from tensorflow.keras import layers, models
 from sklearn.model_selection import train_test_split
 
+# Make sure “app” is on the path
+SCRIPT_DIR = os.path.dirname(os.path.realpath(__file__))
+sys.path.insert(0, os.path.abspath(os.path.join(SCRIPT_DIR, os.pardir)))
+from app.services.feature_store import load_features_from_env
+
 # ── Config ───────────────────────────────────────────────────────────────────
 
 # Paths 
@@ -25,8 +31,9 @@ EPS_STD       = 1e-3       # floor for any very small std
 
 # ── Load data ────────────────────────────────────────────────────────────────
 
-print("1) Loading normal features from:", FEATURES_PATH)
-features = np.load(FEATURES_PATH)  # shape: (N, D)
+# FEATURE_STORE_DIR (+ _SINCE/_UNTIL/_CAMERA) reads live features instead
+print("1) Loading normal features from:", os.getenv("FEATURE_STORE_DIR") or FEATURES_PATH)
+features = load_features_from_env(FEATURES_PATH)  # shape: (N, D)
 FEATURE_DIM = features.shape[1]
 print(f"   → features.shape = {features.shape}\n")
 
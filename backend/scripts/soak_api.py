@@ -0,0 +1,472 @@
+# backend/scripts/soak_api.py
+"""
+Soak / load test for the FastAPI app: N MJPEG viewers on /predict/video
+while dashboard pollers hit /predict/logs, /predict/activity/list and
+/predict/analytics/summary.
+
+    python scripts/soak_api.py --viewers 20 --pollers logs=2,activity=1,summary=1 \
+                               --duration 600 --report soak.json
+
+By default it starts everything itself, in a scratch working directory:
+  - a stub inference worker (`worker` role) that loops a video file and
+    publishes pre-encoded JPEGs + fake log entries to the shared-memory
+    ring, at --fps, exactly like app/services/inference_worker.py but
+    without loading any model;
+  - the real app (`serve` role: app.main under uvicorn, INFERENCE_RING
+    pointing at that ring) plus an async /__soak/stats route that reports
+    thread-pool usage, threads, open fds and RSS.
+Use --url to drive an already running server instead (no server stats).
+
+Reports delivered FPS and worst stall per viewer, latency percentiles
+per endpoint, thread-pool saturation and RSS growth (after --warmup).
+--max-p99-ms / --min-fps / --max-rss-growth-mb turn it into a gate:
+the exit code is 1 when any limit is exceeded.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+import datetime
+
+SCRIPT_DIR = os.path.dirname(os.path.realpath(__file__))
+BACKEND_DIR = os.path.abspath(os.path.join(SCRIPT_DIR, os.pardir))
+sys.path.insert(0, BACKEND_DIR)
+
+import numpy as np
+
+ENDPOINTS = {
+    "logs":     "/predict/logs",
+    "activity": "/predict/activity/list",
+    "summary":  "/predict/analytics/summary",
+    "governor": "/predict/governor",
+    "heatmap":  "/predict/analytics/heatmap",
+}
+FEATURE_DIM = 18 * 2 * 2 + 80      # pose + velocity + YOLO class histogram
+
+
+def proc_status(pid="self") -> dict:
+    """RSS (MB) and thread count of a process, from /proc."""
+    out = {"rss_mb": float("nan"), "threads": 0}
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    out["rss_mb"] = int(line.split()[1]) / 1024.0
+                elif line.startswith("Threads:"):
+                    out["threads"] = int(line.split()[1])
+    except FileNotFoundError:
+        pass
+    return out
+
+
+def pct(values, q):
+    return round(float(np.percentile(values, q)), 2) if len(values) else None
+
+
+# ── worker role: stub inference worker ───────────────────────────────────
+def run_worker(args):
+    import cv2
+    from app.services.shm_ring import FrameRing
+
+    cap = cv2.VideoCapture(args.video)
+    jpegs = []
+    while len(jpegs) < args.clip_frames:
+        ok, frame = cap.read()
+        if not ok:
+            break
+        if args.width:
+            frame = cv2.resize(frame, (args.width, frame.shape[0] * args.width // frame.shape[1]))
+        jpegs.append(cv2.imencode(".jpg", frame, [int(cv2.IMWRITE_JPEG_QUALITY), 95])[1].tobytes())
+    cap.release()
+    if not jpegs:
+        raise RuntimeError(f"Could not read any frame from {args.video}")
+
+    frames = FrameRing.create(args.ring, n_slots=8, slot_size=max(len(j) for j in jpegs) + 4096)
+    logs = FrameRing.create(f"{args.ring}_log", n_slots=100, slot_size=64 * 1024)
+    shots = os.path.join("data", "anomaly_screenshots")
+    os.makedirs(shots, exist_ok=True)
+
+    running = True
+
+    def _stop(*_):
+        nonlocal running
+        running = False
+
+    signal.signal(signal.SIGTERM, _stop)
+    signal.signal(signal.SIGINT, _stop)
+
+    features = np.zeros(FEATURE_DIM, dtype=np.float32)
+    period = 1.0 / args.fps
+    anomalies = 0
+    i = 0
+    next_t = time.perf_counter()
+    try:
+        while running:
+            jpeg = jpegs[i % len(jpegs)]
+            is_anom = random.random() < args.anomaly_rate
+            if is_anom:
+                anomalies += 1
+                # same cadence as InferenceService: first, then every 100th
+                if anomalies == 1 or anomalies % 100 == 0:
+                    ts = datetime.datetime.now().strftime("%Y%m%d-%H%M%S")
+                    with open(os.path.join(shots, f"{ts}_anom_{anomalies}.jpg"), "wb") as f:
+                        f.write(jpeg)
+            seq = frames.publish(jpeg) if frames.reader_active() else None
+            logs.publish(
+                meta={
+                    "frame_seq": seq,
+                    "log": {
+                        "timestamp": datetime.datetime.utcnow().isoformat(),
+                        "anomaly": is_anom,
+                        "recon_error": round(random.random() * 0.1, 6),
+                        "quality_level": "full",
+                    },
+                    "governor": {"level": "full", "frame_ms": 1.0, "budget_ms": period * 1000.0},
+                },
+                features=features,
+            )
+            i += 1
+            next_t += period
+            time.sleep(max(0.0, next_t - time.perf_counter()))
+    finally:
+        frames.close()
+        logs.close()
+
+
+# ── serve role: the real app + a stats route ─────────────────────────────
+def run_server(args):
+    import anyio.to_thread
+    import uvicorn
+    from fastapi.responses import JSONResponse
+
+    from app.main import app
+
+    sampler = {"peak_borrowed": 0, "peak_waiting": 0, "samples": 0, "saturated": 0}
+
+    async def sample_limiter():
+        limiter = anyio.to_thread.current_default_thread_limiter()
+        while True:
+            st = limiter.statistics()
+            sampler["peak_borrowed"] = max(sampler["peak_borrowed"], st.borrowed_tokens)
+            sampler["peak_waiting"] = max(sampler["peak_waiting"], st.tasks_waiting)
+            sampler["samples"] += 1
+            sampler["saturated"] += st.borrowed_tokens >= limiter.total_tokens
+            await asyncio.sleep(0.02)
+
+    async def soak_stats():
+        # async on purpose: must answer even when the thread pool is exhausted
+        if not hasattr(app.state, "soak_sampler"):
+            app.state.soak_sampler = asyncio.create_task(sample_limiter())
+        limiter = anyio.to_thread.current_default_thread_limiter()
+        st = limiter.statistics()
+        out = {
+            **proc_status(),
+            "open_fds": len(os.listdir("/proc/self/fd")),
+            "pool_total": limiter.total_tokens,
+            "pool_borrowed": st.borrowed_tokens,
+            "pool_waiting": st.tasks_waiting,
+            "pool_peak_borrowed": sampler["peak_borrowed"],
+            "pool_peak_waiting": sampler["peak_waiting"],
+            "pool_saturated_frac": round(sampler["saturated"] / max(1, sampler["samples"]), 4),
+        }
+        sampler.update(peak_borrowed=0, peak_waiting=0, samples=0, saturated=0)
+        return JSONResponse(content=out)
+
+    # the frontend StaticFiles mount at "/" would shadow a route added after it
+    app.add_api_route("/__soak/stats", soak_stats, methods=["GET"])
+    app.router.routes.insert(0, app.router.routes.pop())
+
+    uvicorn.run(app, host="127.0.0.1", port=args.port, log_level="warning")
+
+
+# ── run role: drive the load ─────────────────────────────────────────────
+async def viewer(client, stop_at, out):
+    boundary = b"--frame"
+    times = []
+    tail = b""
+    out.append(times)
+    try:
+        async with client.stream("GET", "/predict/video") as r:
+            async for chunk in r.aiter_bytes():
+                data = tail + chunk
+                n = data.count(boundary)
+                if n:
+                    now = time.perf_counter()
+                    times.extend([now] * n)
+                tail = data[-(len(boundary) - 1):]
+                if time.perf_counter() >= stop_at:
+                    break
+    except Exception as e:
+        times.append(e)
+
+
+async def poller(client, path, interval, stop_at, latencies, errors):
+    while time.perf_counter() < stop_at:
+        t0 = time.perf_counter()
+        try:
+            r = await client.get(path)
+            if r.status_code != 200:
+                errors[f"HTTP {r.status_code}"] = errors.get(f"HTTP {r.status_code}", 0) + 1
+            else:
+                latencies.append((time.perf_counter() - t0) * 1000.0)
+        except Exception as e:
+            errors[type(e).__name__] = errors.get(type(e).__name__, 0) + 1
+        await asyncio.sleep(max(0.0, interval - (time.perf_counter() - t0)))
+
+
+async def sample_stats(client, every, stop_at, worker_pid, out):
+    t_start = time.perf_counter()
+    while time.perf_counter() < stop_at:
+        row = {"t": round(time.perf_counter() - t_start, 1)}
+        try:
+            row.update((await client.get("/__soak/stats")).json())
+        except Exception:
+            pass
+        if worker_pid:
+            row["worker_rss_mb"] = proc_status(worker_pid)["rss_mb"]
+        out.append(row)
+        await asyncio.sleep(every)
+
+
+async def drive(args, pollers, worker_pid):
+    import httpx
+
+    n_conn = args.viewers + sum(pollers.values()) + 4
+    limits = httpx.Limits(max_connections=n_conn, max_keepalive_connections=n_conn)
+    timeout = httpx.Timeout(args.timeout, read=None)
+    async with httpx.AsyncClient(base_url=args.url, limits=limits, timeout=timeout) as client:
+        stop_at = time.perf_counter() + args.duration
+        viewers, latencies, errors, stats = [], {}, {}, []
+        tasks = [asyncio.create_task(sample_stats(client, args.sample_every, stop_at, worker_pid, stats))]
+        for _ in range(args.viewers):
+            tasks.append(asyncio.create_task(viewer(client, stop_at, viewers)))
+            await asyncio.sleep(args.ramp / max(1, args.viewers))
+        for name, n in pollers.items():
+            latencies[name], errors[name] = [], {}
+            for _ in range(n):
+                tasks.append(asyncio.create_task(
+                    poller(client, ENDPOINTS[name], args.poll_interval, stop_at,
+                           latencies[name], errors[name])))
+        await asyncio.wait(tasks, timeout=args.duration + args.timeout + 5)
+        for t in tasks:
+            t.cancel()
+    return viewers, latencies, errors, stats
+
+
+def summarize(args, viewers, latencies, errors, stats):
+    report = {"config": vars(args).copy(), "viewers": [], "endpoints": {}, "server": {}}
+    fps_all = []
+    for times in viewers:
+        err = next((t for t in times if isinstance(t, Exception)), None)
+        ts = np.array([t for t in times if not isinstance(t, Exception)])
+        fps = (len(ts) - 1) / (ts[-1] - ts[0]) if len(ts) > 1 and ts[-1] > ts[0] else 0.0
+        fps_all.append(fps)
+        report["viewers"].append({
+            "frames": int(len(ts)),
+            "fps": round(fps, 2),
+            "max_gap_ms": round(float(np.diff(ts).max() * 1000.0), 1) if len(ts) > 1 else None,
+            "error": repr(err) if err else None,
+        })
+    report["fps"] = {"min": pct(fps_all, 0), "p50": pct(fps_all, 50), "mean": round(float(np.mean(fps_all)), 2) if fps_all else None}
+
+    for name, lat in latencies.items():
+        report["endpoints"][name] = {
+            "requests": len(lat), "errors": errors[name],
+            "p50_ms": pct(lat, 50), "p95_ms": pct(lat, 95), "p99_ms": pct(lat, 99),
+            "max_ms": pct(lat, 100),
+        }
+
+    rows = [r for r in stats if "rss_mb" in r]
+    steady = [r for r in rows if r["t"] >= args.warmup] or rows
+    if steady:
+        t = np.array([r["t"] for r in steady])
+        rss = np.array([r["rss_mb"] for r in steady])
+        slope = float(np.polyfit(t, rss, 1)[0]) * 60.0 if len(steady) > 2 and np.ptp(t) > 0 else 0.0
+        report["server"] = {
+            "rss_start_mb": round(float(rss[0]), 1),
+            "rss_end_mb": round(float(rss[-1]), 1),
+            "rss_growth_mb": round(float(rss[-1] - rss[0]), 1),
+            "rss_slope_mb_per_min": round(slope, 3),
+            "threads_max": max(r["threads"] for r in steady),
+            "open_fds_max": max(r["open_fds"] for r in steady),
+            "pool_total": steady[-1]["pool_total"],
+            "pool_peak_borrowed": max(r["pool_peak_borrowed"] for r in steady),
+            "pool_peak_waiting": max(r["pool_peak_waiting"] for r in steady),
+            "pool_saturated_frac": round(float(np.mean([r["pool_saturated_frac"] for r in steady])), 4),
+        }
+        if "worker_rss_mb" in steady[-1]:
+            report["server"]["worker_rss_growth_mb"] = round(steady[-1]["worker_rss_mb"] - steady[0]["worker_rss_mb"], 1)
+    report["timeline"] = stats
+    return report
+
+
+def print_report(report):
+    fps = report["fps"]
+    print(f"\nViewers: {len(report['viewers'])}   FPS min={fps['min']} p50={fps['p50']} mean={fps['mean']}")
+    for i, v in enumerate(report["viewers"]):
+        print(f"   viewer {i:<3} frames={v['frames']:<6} fps={v['fps']:<6} max_gap={v['max_gap_ms']} ms"
+              + (f"  ERROR {v['error']}" if v["error"] else ""))
+    print("\nEndpoints:")
+    for name, e in report["endpoints"].items():
+        print(f"   {name:<9} n={e['requests']:<6} p50={e['p50_ms']} p95={e['p95_ms']} "
+              f"p99={e['p99_ms']} max={e['max_ms']} ms  errors={e['errors'] or 0}")
+    s = report["server"]
+    if s:
+        print("\nServer:")
+        print(f"   thread pool  peak {s['pool_peak_borrowed']}/{s['pool_total']} borrowed, "
+              f"peak {s['pool_peak_waiting']} waiting, saturated {s['pool_saturated_frac'] * 100:.1f}% of samples")
+        print(f"   RSS          {s['rss_start_mb']} → {s['rss_end_mb']} MB "
+              f"({s['rss_growth_mb']:+} MB, {s['rss_slope_mb_per_min']:+} MB/min)")
+        print(f"   threads max  {s['threads_max']}   open fds max {s['open_fds_max']}")
+
+
+def check_limits(args, report) -> list:
+    failures = []
+    if args.min_fps is not None and (report["fps"]["min"] or 0.0) < args.min_fps:
+        failures.append(f"viewer FPS {report['fps']['min']} < {args.min_fps}")
+    if args.max_p99_ms is not None:
+        for name, e in report["endpoints"].items():
+            if e["p99_ms"] is None or e["p99_ms"] > args.max_p99_ms:
+                failures.append(f"{name} p99 {e['p99_ms']} ms > {args.max_p99_ms} ms")
+    if args.max_rss_growth_mb is not None and report["server"]:
+        if report["server"]["rss_growth_mb"] > args.max_rss_growth_mb:
+            failures.append(f"RSS grew {report['server']['rss_growth_mb']} MB > {args.max_rss_growth_mb} MB")
+    return failures
+
+
+def seed_screenshots(workdir, n):
+    """Backdate `n` tiny .jpg files so the listing endpoints have real work."""
+    shots = os.path.join(workdir, "data", "anomaly_screenshots")
+    os.makedirs(shots, exist_ok=True)
+    t0 = datetime.datetime.now() - datetime.timedelta(seconds=n * 7)
+    for i in range(n):
+        ts = (t0 + datetime.timedelta(seconds=i * 7)).strftime("%Y%m%d-%H%M%S")
+        open(os.path.join(shots, f"{ts}_anom_{i}.jpg"), "wb").close()
+
+
+def wait_ready(url, timeout_s, proc):
+    import httpx
+    deadline = time.monotonic() + timeout_s
+    while time.monotonic() < deadline:
+        if proc is not None and proc.poll() is not None:
+            raise RuntimeError("Server exited during startup")
+        try:
+            if httpx.get(url + "/__soak/stats", timeout=1.0).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"Server at {url} not ready after {timeout_s}s")
+
+
+def run(args):
+    pollers = {}
+    for item in filter(None, args.pollers.split(",")):
+        name, _, n = item.partition("=")
+        if name not in ENDPOINTS:
+            raise SystemExit(f"Unknown poller '{name}' (choose from {', '.join(ENDPOINTS)})")
+        pollers[name] = int(n or 1)
+
+    procs = []
+    worker_pid = None
+    try:
+        if args.url is None:
+            workdir = tempfile.mkdtemp(prefix="saferoom_soak_")
+            seed_screenshots(workdir, args.screenshots)
+            ring = f"saferoom_soak_{os.getpid()}"
+            env = dict(os.environ, INFERENCE_RING=ring, PYTHONPATH=BACKEND_DIR)
+            me = [sys.executable, os.path.realpath(__file__)]
+            video = os.path.abspath(args.video)
+            worker = subprocess.Popen(
+                me + ["worker", "--ring", ring, "--video", video, "--fps", str(args.fps),
+                      "--anomaly-rate", str(args.anomaly_rate)] + (["--width", str(args.width)] if args.width else []),
+                cwd=workdir, env=env)
+            procs.append(worker)
+            worker_pid = worker.pid
+            server = subprocess.Popen(me + ["serve", "--port", str(args.port)], cwd=workdir, env=env)
+            procs.append(server)
+            args.url = f"http://127.0.0.1:{args.port}"
+            print(f"1) Stub worker ({args.fps} fps from {args.video}) + app on {args.url}, cwd {workdir}")
+            wait_ready(args.url, 60, server)
+        else:
+            print(f"1) Driving existing server {args.url}")
+
+        print(f"2) {args.viewers} viewers, pollers {pollers or 'none'} every {args.poll_interval}s, "
+              f"{args.duration}s (warm-up {args.warmup}s)…")
+        viewers, latencies, errors, stats = asyncio.run(drive(args, pollers, worker_pid))
+    finally:
+        for p in reversed(procs):
+            p.send_signal(signal.SIGTERM)
+        for p in reversed(procs):
+            try:
+                p.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                p.kill()
+
+    report = summarize(args, viewers, latencies, errors, stats)
+    print_report(report)
+    if args.report:
+        with open(args.report, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nFull report (with timeline) → {args.report}")
+
+    failures = check_limits(args, report)
+    for msg in failures:
+        print(f"FAIL: {msg}")
+    return 1 if failures else 0
+
+
+def main():
+    p = argparse.ArgumentParser(description="SafeRoomAI API soak test")
+    sub = p.add_subparsers(dest="role")
+
+    w = sub.add_parser("worker", help="(internal) stub inference worker")
+    w.add_argument("--ring", required=True)
+    w.add_argument("--video", required=True)
+    w.add_argument("--fps", type=float, default=15.0)
+    w.add_argument("--width", type=int, default=0)
+    w.add_argument("--anomaly-rate", type=float, default=0.05)
+    w.add_argument("--clip-frames", type=int, default=300, help="frames pre-encoded and looped")
+
+    s = sub.add_parser("serve", help="(internal) app.main under uvicorn with /__soak/stats")
+    s.add_argument("--port", type=int, default=8765)
+
+    # run role (default): options live on the top-level parser
+    p.add_argument("--url", default=None, help="existing server; default: start worker + app")
+    p.add_argument("--port", type=int, default=8765)
+    p.add_argument("--video", default=os.path.join(BACKEND_DIR, "sample.mp4"))
+    p.add_argument("--fps", type=float, default=15.0, help="stub worker frame rate")
+    p.add_argument("--width", type=int, default=0, help="resize frames to this width (0 = source)")
+    p.add_argument("--anomaly-rate", type=float, default=0.05)
+    p.add_argument("--screenshots", type=int, default=2000, help="pre-seeded screenshot files")
+    p.add_argument("--viewers", type=int, default=20)
+    p.add_argument("--pollers", default="logs=2,activity=1,summary=1",
+                   help=f"name=count,… from {', '.join(ENDPOINTS)}")
+    p.add_argument("--poll-interval", type=float, default=1.0)
+    p.add_argument("--duration", type=float, default=60.0)
+    p.add_argument("--warmup", type=float, default=10.0, help="seconds excluded from RSS growth")
+    p.add_argument("--ramp", type=float, default=2.0, help="seconds to spread viewer connects over")
+    p.add_argument("--sample-every", type=float, default=2.0)
+    p.add_argument("--timeout", type=float, default=30.0)
+    p.add_argument("--report", default=None, help="write the JSON report here")
+    p.add_argument("--min-fps", type=float, default=None)
+    p.add_argument("--max-p99-ms", type=float, default=None)
+    p.add_argument("--max-rss-growth-mb", type=float, default=None)
+    args = p.parse_args()
+
+    if args.role == "worker":
+        run_worker(args)
+    elif args.role == "serve":
+        run_server(args)
+    else:
+        sys.exit(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,283 @@
+# backend/scripts/sweep_autoencoder.py
+"""
+Parallel hyperparameter sweep for the anomaly autoencoder.
+
+    python scripts/sweep_autoencoder.py                    # full grid
+    python scripts/sweep_autoencoder.py --random 12        # 12 random configs
+    python scripts/sweep_autoencoder.py --anomalies data/anomalous_features.npy --promote
+
+Data is split and normalized once and shared with the workers as
+memory-mapped .npy files. Each candidate trains with early stopping in
+its own process (one TF thread each) and is scored on:
+  - recall: share of anomalies whose recon error exceeds the 99th
+    percentile of normal validation errors (threshold at 1% FPR)
+  - sep:    median anomaly error / p99 normal error
+  - ms:     median single-frame scoring latency
+Real anomalous features can be given with --anomalies; otherwise they are
+synthesized by shuffling feature columns across validation rows and
+adding noise.
+
+Writes models/sweep/report.json and the best model + norm stats; with
+--promote also installs them as models/autoencoder.h5 / ae_norm_stats.npz
+together with the winner's p99 threshold in models/ae_threshold.json
+and, when AE_PRECISION is float16/int8, its autoencoder_<precision>.npz
+(picked up by the model watcher, or live with POST /predict/models/reload).
+"""
+import os
+import sys
+import json
+import time
+import shutil
+import random
+import argparse
+import itertools
+import tempfile
+import multiprocessing as mp
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+# Make sure “app” is on the path
+SCRIPT_DIR = os.path.dirname(os.path.realpath(__file__))
+sys.path.insert(0, os.path.abspath(os.path.join(SCRIPT_DIR, os.pardir)))
+from app.services.feature_store import load_features_from_env
+from app.services.model_reloader import AE_PRECISION, THRESHOLD_FILE
+from app.services.quantized_ae import dense_layers, quantize_layers, quantized_path
+
+FEATURES_PATH = os.path.join("data", "normal_features.npy")
+MODEL_DIR     = os.path.join("models")
+SWEEP_DIR     = os.path.join(MODEL_DIR, "sweep")
+TEST_SIZE     = 0.1
+RANDOM_SEED   = 42
+EPS_STD       = 1e-3
+
+# ── Search space ─────────────────────────────────────────────────────────────
+ENCODERS      = [[128, 64], [64], [128], [64, 32]]   # decoder mirrors encoder
+BOTTLENECKS   = [8, 16, 32]
+LEARNING_RATES = [1e-3, 3e-4]
+BATCH_SIZE    = 32
+MAX_EPOCHS    = 200
+PATIENCE      = 10
+
+
+def build_autoencoder(feature_dim, encoder, bottleneck, lr):
+    import tensorflow as tf
+    from tensorflow.keras import layers, models
+
+    inputs = layers.Input(shape=(feature_dim,), name="encoder_input")
+    x = inputs
+    for i, units in enumerate(encoder):
+        x = layers.Dense(units, activation="relu", name=f"encoder_dense_{i}")(x)
+    x = layers.Dense(bottleneck, activation="relu", name="bottleneck")(x)
+    for i, units in enumerate(reversed(encoder)):
+        x = layers.Dense(units, activation="relu", name=f"decoder_dense_{i}")(x)
+    outputs = layers.Dense(feature_dim, activation="linear", name="decoder_output")(x)
+    model = models.Model(inputs, outputs, name="autoencoder")
+    model.compile(optimizer=tf.keras.optimizers.Adam(learning_rate=lr), loss="mse")
+    return model
+
+
+def recon_errors(model, X, batch=1024):
+    errs = []
+    for i in range(0, len(X), batch):
+        xb = np.asarray(X[i:i + batch], dtype=np.float32)
+        pred = model(xb, training=False).numpy()
+        errs.append(np.mean((pred - xb) ** 2, axis=1))
+    return np.concatenate(errs) if errs else np.zeros(0, dtype=np.float32)
+
+
+def train_candidate(cfg, data_dir, out_dir):
+    """Runs in a worker process."""
+    import tensorflow as tf
+    tf.config.threading.set_intra_op_parallelism_threads(1)
+    tf.config.threading.set_inter_op_parallelism_threads(1)
+    tf.random.set_seed(RANDOM_SEED)
+
+    X_train = np.load(os.path.join(data_dir, "train.npy"), mmap_mode="r")
+    X_val   = np.load(os.path.join(data_dir, "val.npy"), mmap_mode="r")
+    X_anom  = np.load(os.path.join(data_dir, "anom.npy"), mmap_mode="r")
+
+    model = build_autoencoder(X_train.shape[1], cfg["encoder"], cfg["bottleneck"], cfg["lr"])
+    t0 = time.perf_counter()
+    hist = model.fit(
+        X_train, X_train,
+        validation_data=(X_val, X_val),
+        epochs=MAX_EPOCHS, batch_size=BATCH_SIZE, shuffle=True, verbose=0,
+        callbacks=[tf.keras.callbacks.EarlyStopping(
+            monitor="val_loss", patience=PATIENCE, restore_best_weights=True
+        )],
+    )
+    train_s = time.perf_counter() - t0
+
+    val_err  = recon_errors(model, X_val)
+    anom_err = recon_errors(model, X_anom)
+    thr = float(np.percentile(val_err, 99))
+
+    # per-frame scoring latency, the way the live service calls it
+    x1 = np.asarray(X_val[:1], dtype=np.float32)
+    for _ in range(20):
+        model.predict(x1, batch_size=1, verbose=False)
+    lat = []
+    for _ in range(200):
+        t = time.perf_counter()
+        model.predict(x1, batch_size=1, verbose=False)
+        lat.append((time.perf_counter() - t) * 1000.0)
+
+    path = os.path.join(out_dir, f"{cfg['name']}.h5")
+    model.save(path, include_optimizer=False)
+    return {
+        **cfg,
+        "params":        int(model.count_params()),
+        "epochs":        len(hist.history["loss"]),
+        "train_s":       round(train_s, 2),
+        "val_loss":      float(min(hist.history["val_loss"])),
+        "val_err_p99":   thr,
+        "recall_at_p99": float(np.mean(anom_err > thr)),
+        "separation":    float(np.median(anom_err) / max(thr, 1e-12)),
+        "latency_ms":    float(np.median(lat)),
+        "path":          path,
+    }
+
+
+def candidates(n_random=None):
+    grid = [
+        {"encoder": e, "bottleneck": b, "lr": lr}
+        for e, b, lr in itertools.product(ENCODERS, BOTTLENECKS, LEARNING_RATES)
+        if all(b < u for u in e)
+    ]
+    if n_random:
+        random.Random(RANDOM_SEED).shuffle(grid)
+        grid = grid[:n_random]
+    for cfg in grid:
+        cfg["name"] = "ae_" + "-".join(map(str, cfg["encoder"])) + f"_b{cfg['bottleneck']}_lr{cfg['lr']:g}"
+    return grid
+
+
+def rank(results, max_latency_ms=None):
+    """Detection quality first (recall, then separation), then inference cost."""
+    eligible = [r for r in results
+                if max_latency_ms is None or r["latency_ms"] <= max_latency_ms]
+    return sorted(eligible or results,
+                  key=lambda r: (-r["recall_at_p99"], -r["separation"], r["latency_ms"]))
+
+
+def synth_anomalies(X_val, rng):
+    """Break the joint structure of normal rows: shuffle each column independently + noise."""
+    A = np.array(X_val, copy=True)
+    for j in range(A.shape[1]):
+        rng.shuffle(A[:, j])
+    return A + rng.normal(0.0, 1.0, size=A.shape).astype(np.float32)
+
+
+def main():
+    p = argparse.ArgumentParser(description="Autoencoder hyperparameter sweep")
+    p.add_argument("--random", type=int, default=None, help="sample N configs instead of the full grid")
+    p.add_argument("--workers", type=int, default=max(1, (os.cpu_count() or 2) - 1))
+    p.add_argument("--anomalies", default=None, help=".npy of raw anomalous feature vectors")
+    p.add_argument("--max-latency-ms", type=float, default=None, help="drop slower candidates")
+    p.add_argument("--promote", action="store_true", help="copy the winner over models/autoencoder.h5")
+    args = p.parse_args()
+    from sklearn.model_selection import train_test_split
+
+    # 1) Load + split + normalize once
+    features = load_features_from_env(FEATURES_PATH)
+    train_feats, val_feats = train_test_split(
+        np.asarray(features), test_size=TEST_SIZE, random_state=RANDOM_SEED, shuffle=True
+    )
+    mean = train_feats.mean(axis=0)
+    std = train_feats.std(axis=0)
+    std[std < EPS_STD] = EPS_STD
+    X_train = ((train_feats - mean) / std).astype(np.float32)
+    X_val   = ((val_feats - mean) / std).astype(np.float32)
+    if args.anomalies:
+        X_anom = ((np.load(args.anomalies) - mean) / std).astype(np.float32)
+    else:
+        X_anom = synth_anomalies(X_val, np.random.default_rng(RANDOM_SEED))
+    print(f"1) train={X_train.shape} val={X_val.shape} anomalies={X_anom.shape}")
+
+    # 2) Share the arrays with the workers as memory-mapped files
+    data_dir = tempfile.mkdtemp(prefix="ae_sweep_")
+    for name, arr in (("train", X_train), ("val", X_val), ("anom", X_anom)):
+        np.save(os.path.join(data_dir, f"{name}.npy"), arr)
+    os.makedirs(SWEEP_DIR, exist_ok=True)
+    np.savez(os.path.join(SWEEP_DIR, "ae_norm_stats.npz"), mean=mean, std=std)
+
+    # 3) Train in parallel (spawn: TF is not fork-safe)
+    cfgs = candidates(args.random)
+    print(f"2) Training {len(cfgs)} candidates on {args.workers} workers…")
+    results = []
+    try:
+        with ProcessPoolExecutor(max_workers=args.workers, mp_context=mp.get_context("spawn")) as pool:
+            futs = {pool.submit(train_candidate, c, data_dir, SWEEP_DIR): c for c in cfgs}
+            for fut in as_completed(futs):
+                cfg = futs[fut]
+                try:
+                    r = fut.result()
+                except Exception as e:
+                    print(f"   ✗ {cfg['name']}: {e}")
+                    continue
+                results.append(r)
+                print(f"   ✓ {r['name']:<28} recall={r['recall_at_p99']:.3f} "
+                      f"sep={r['separation']:.2f} {r['latency_ms']:.3f} ms ({r['epochs']} ep)")
+    finally:
+        shutil.rmtree(data_dir, ignore_errors=True)
+
+    if not results:
+        print("No candidate finished.")
+        sys.exit(1)
+
+    # 4) Rank: detection quality first, then inference cost
+    ranked = rank(results, args.max_latency_ms)
+    best = ranked[0]
+
+    print(f"\n3) {'rank':>4} {'name':<28} {'recall':>7} {'sep':>6} {'ms':>7} {'params':>8}")
+    for i, r in enumerate(ranked, 1):
+        print(f"   {i:>4} {r['name']:<28} {r['recall_at_p99']:>7.3f} {r['separation']:>6.2f} "
+              f"{r['latency_ms']:>7.3f} {r['params']:>8}")
+
+    best_path = os.path.join(SWEEP_DIR, "best_autoencoder.h5")
+    shutil.copyfile(best["path"], best_path)
+    with open(os.path.join(SWEEP_DIR, "report.json"), "w") as f:
+        json.dump({"best": best, "ranked": ranked}, f, indent=2)
+    print(f"\n4) Best: {best['name']} → {best_path}  (report: {SWEEP_DIR}/report.json)")
+
+    if args.promote:
+        promote(best, best_path)
+
+
+def load_dense_layers(path):
+    import tensorflow as tf
+    return dense_layers(tf.keras.models.load_model(path, compile=False))
+
+
+def promote(best, best_path, precision=AE_PRECISION):
+    """
+    Install model, norm stats and the threshold it was calibrated with as
+    one set: everything is staged next to the targets first, then renamed
+    into place back to back, so the watcher never reloads a new model
+    against an old threshold. With AE_PRECISION float16/int8 the winner is
+    quantized too, since that .npz is what the service actually scores with.
+    """
+    staged = []
+    if precision != "float32":
+        dst = quantized_path(os.path.join(MODEL_DIR, "autoencoder.h5"), precision)
+        with open(dst + ".tmp", "wb") as f:      # np.savez would append .npz to a path
+            np.savez(f, **quantize_layers(load_dense_layers(best_path), precision))
+        staged.append((dst + ".tmp", dst))
+    for src, name in ((best_path, "autoencoder.h5"),
+                      (os.path.join(SWEEP_DIR, "ae_norm_stats.npz"), "ae_norm_stats.npz")):
+        dst = os.path.join(MODEL_DIR, name)
+        shutil.copyfile(src, dst + ".tmp")
+        staged.append((dst + ".tmp", dst))
+    thr_path = os.path.join(MODEL_DIR, THRESHOLD_FILE)
+    with open(thr_path + ".tmp", "w") as f:
+        json.dump({"threshold": best["val_err_p99"], "source": best["name"]}, f, indent=2)
+    staged.append((thr_path + ".tmp", thr_path))
+    for tmp, dst in staged:
+        os.replace(tmp, dst)
+    print("   Promoted to " + " + ".join(os.path.basename(dst) for _, dst in staged)
+          + f" (threshold={best['val_err_p99']:.6f})")
+
+
+if __name__ == "__main__":
+    main()
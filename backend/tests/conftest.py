@@ -0,0 +1,175 @@
+# backend/tests/conftest.py
+import collections
+import os
+import sys
+import threading
+import time
+
+import numpy as np
+import pytest
+
+# Make sure “app” is importable when pytest runs from backend/ or the repo root
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
+sys.path.insert(0, BACKEND_DIR)
+
+
+class FakeTensor:
+    """Just enough of a torch tensor for `.cpu().numpy()`."""
+
+    def __init__(self, arr):
+        self.arr = np.asarray(arr)
+
+    def cpu(self):
+        return self
+
+    def numpy(self):
+        return self.arr
+
+
+class FakeYolo:
+    """
+    Stand-in for an ultralytics model: every frame gets the same boxes
+    (a list of frames gets one result per frame, like YOLO batching).
+    """
+
+    def __init__(self, boxes=None, classes=None, names=None):
+        self.boxes = np.zeros((0, 4), np.float32) if boxes is None else np.asarray(boxes, np.float32)
+        self.classes = np.zeros(0) if classes is None else np.asarray(classes, np.float32)
+        self.model = collections.namedtuple("Model", "names")(names or {0: "person", 1: "chair"})
+        self.calls = 0
+
+    def _result(self):
+        Boxes = collections.namedtuple("Boxes", "xyxy cls")
+        Result = collections.namedtuple("Result", "boxes")
+        return Result(Boxes(FakeTensor(self.boxes.copy()), FakeTensor(self.classes.copy())))
+
+    def __call__(self, frames, imgsz=None, verbose=False):
+        self.calls += 1
+        n = len(frames) if isinstance(frames, list) else 1
+        return [self._result() for _ in range(n)]
+
+
+class FakePose:
+    def __init__(self):
+        self.model_complexity = 1
+
+    def set_model_complexity(self, c):
+        self.model_complexity = c
+
+    def detect_pose(self, frame, rgb_out=None):
+        return np.full((18, 2), float(frame[0, 0, 0]), dtype=np.float32)
+
+
+class ZeroAE:
+    """Autoencoder stub reconstructing zeros: error = mean(x²)."""
+    input_shape = output_shape = (None, None)
+
+    def predict(self, x, batch_size=None, verbose=False):
+        return np.zeros_like(x)
+
+
+class FrameSource:
+    """cv2.VideoCapture stand-in: solid frames numbered 1, 2, …; optional per-read delay."""
+
+    def __init__(self, h=48, w=64, delay_s=0.0, n_frames=None):
+        self.h, self.w, self.delay_s, self.n_frames = h, w, delay_s, n_frames
+        self.n = 0
+
+    def _next(self):
+        if self.delay_s:
+            time.sleep(self.delay_s)
+        self.n += 1
+        return self.n_frames is None or self.n <= self.n_frames
+
+    def grab(self):
+        return self._next()
+
+    def read(self, image=None):
+        if not self._next():
+            return False, None
+        if image is None or image.shape != (self.h, self.w, 3):
+            image = np.empty((self.h, self.w, 3), dtype=np.uint8)
+        image[:] = self.n % 256
+        return True, image
+
+    def get(self, prop):
+        return {3: self.w, 4: self.h, 1: self.n}.get(prop, 0)
+
+    def release(self):
+        pass
+
+
+@pytest.fixture
+def make_service(tmp_path):
+    """
+    InferenceService wired to in-memory stand-ins for the camera, YOLO,
+    MediaPipe and the autoencoder, so process_frame/render run without
+    models. Keyword arguments override attributes.
+    """
+    from app.services.inference_service import InferenceService
+    from app.services.feature_builder import FeatureBuilder
+    from app.services.frame_pool import FramePool
+    from app.services.frame_renderer import FrameRenderer
+    from app.services.heatmap import HeatmapAccumulator
+    from app.services.model_reloader import ScoringBundle
+    from app.services.screenshot_dedup import ScreenshotDeduper
+    from app.services.slo_governor import SloGovernor
+
+    class _Reloader:
+        def check(self, bundle, err, ms=None):
+            pass
+
+        def stop(self):
+            pass
+
+    def _make(**overrides):
+        svc = InferenceService.__new__(InferenceService)
+        cap = overrides.pop("cap", None) or FrameSource()
+        svc.cap = cap
+        svc.frame_width, svc.frame_height = cap.w, cap.h
+        svc.pool = FramePool(cap.h, cap.w)
+        svc.yolo = FakeYolo()
+        svc.num_classes = len(svc.yolo.model.names)
+        svc.renderer = FrameRenderer(svc.yolo.model.names)
+        svc.pose_model = FakePose()
+        svc.features = FeatureBuilder(svc.num_classes)
+        svc.pose_dim, svc.feature_dim = svc.features.pose_dim, svc.features.feature_dim
+        svc.scoring = ScoringBundle(
+            ae=ZeroAE(), mean=np.zeros(svc.feature_dim, np.float32),
+            std=np.ones(svc.feature_dim, np.float32), threshold=1e12, version="test",
+        )
+        svc.reloader = _Reloader()
+        svc.governor = SloGovernor(target_fps=10.0)
+        svc.tracker = None
+        svc.feature_store = None
+        svc.camera_id = "cam0"
+        svc.camera_index, svc.fallback_video = 0, "sample.mp4"
+        svc.log_queue = collections.deque(maxlen=100)
+        svc.last_features = None
+        svc._drawn = None
+        svc._frame_lock = threading.Lock()
+        svc._anomaly_counter = svc._last_screenshot_counter = 0
+        svc.screenshot_interval = 100
+        svc.screenshot_dir = str(tmp_path / "shots")
+        svc.deduper = ScreenshotDeduper()
+        svc.heatmap = HeatmapAccumulator(cap.w, cap.h)
+        svc.heatmap_path = str(tmp_path / "heatmap.npz")
+        svc.heatmap_save_interval = 60.0
+        svc._heatmap_saved = 0.0
+        svc._heatmap_dirty = False
+        for k, v in overrides.items():
+            setattr(svc, k, v)
+        return svc
+
+    return _make
+
+
+def write_video(path, values, h=48, w=64, fps=30.0):
+    """Lossless-ish MJPG clip of solid frames, one per value in `values`."""
+    import cv2
+
+    out = cv2.VideoWriter(str(path), cv2.VideoWriter_fourcc(*"MJPG"), fps, (w, h))
+    for v in values:
+        out.write(np.full((h, w, 3), v, dtype=np.uint8))
+    out.release()
+    return str(path)
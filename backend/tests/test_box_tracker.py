@@ -0,0 +1,110 @@
+# backend/tests/test_box_tracker.py
+import cv2
+import numpy as np
+import pytest
+
+from app.services.box_tracker import BoxTracker
+from conftest import FakeYolo
+
+H, W = 240, 320
+BOX = [100.0, 80.0, 180.0, 160.0]
+
+
+@pytest.fixture(scope="module")
+def texture():
+    rng = np.random.default_rng(0)
+    return cv2.GaussianBlur(rng.integers(0, 256, (H, W)).astype(np.uint8), (0, 0), 2)
+
+
+def _shifted(texture, dx=0.0, dy=0.0):
+    m = np.float32([[1, 0, dx], [0, 1, dy]])
+    return cv2.cvtColor(cv2.warpAffine(texture, m, (W, H)), cv2.COLOR_GRAY2BGR)
+
+
+def _start(tracker, frame, boxes=(BOX,)):
+    detect, gray = tracker.should_detect(frame)
+    assert detect                           # nothing to track yet
+    tracker.reset(gray, np.array(boxes), np.zeros(len(boxes), int))
+
+
+def test_redetects_every_n_frames(texture):
+    t = BoxTracker(detect_every=3)
+    frame = _shifted(texture)
+    _start(t, frame)
+    pattern = []
+    for _ in range(6):
+        detect, gray = t.should_detect(frame)
+        pattern.append(detect)
+        if detect:
+            t.reset(gray, np.array([BOX]), np.zeros(1, int))
+        else:
+            t.update(gray)
+    assert pattern == [False, False, True, False, False, True]
+
+
+def test_scene_change_forces_detection(texture):
+    t = BoxTracker(detect_every=100, motion_threshold=12.0)
+    _start(t, _shifted(texture))
+    assert t.should_detect(_shifted(texture))[0] is False
+    assert t.should_detect(255 - _shifted(texture))[0] is True
+
+
+def test_lost_tracks_force_detection(texture):
+    # a box at the right edge whose grid points leave the frame
+    t = BoxTracker(detect_every=100, motion_threshold=1e9, min_confidence=0.95)
+    _start(t, _shifted(texture), boxes=([250.0, 80.0, 318.0, 160.0],))
+    detect, gray = t.should_detect(_shifted(texture, dx=60))
+    assert not detect
+    t.update(gray)
+    assert t.confidence < 0.95
+    assert t.should_detect(_shifted(texture, dx=60))[0] is True
+
+
+def test_flow_shifts_boxes_with_the_image(texture):
+    t = BoxTracker(detect_every=100)
+    _start(t, _shifted(texture))
+    _, gray = t.should_detect(_shifted(texture, dx=6, dy=4))
+    t.update(gray)
+    np.testing.assert_allclose(t.boxes[0], np.array(BOX) + [6, 4, 6, 4], atol=0.5)
+    assert t.confidence == 1.0
+
+
+def test_no_boxes_is_trivially_confident(texture):
+    t = BoxTracker(detect_every=100)
+    _start(t, _shifted(texture), boxes=())
+    _, gray = t.should_detect(_shifted(texture, dx=3))
+    t.update(gray)
+    assert t.boxes.shape == (0, 4) and t.confidence == 1.0
+
+
+class _PanningSource:
+    """Camera panning 2 px per frame across the texture."""
+
+    def __init__(self, texture):
+        self.texture, self.n, self.h, self.w = texture, 0, H, W
+
+    def grab(self):
+        self.n += 1
+        return True
+
+    def read(self, image=None):
+        frame = _shifted(self.texture, dx=2.0 * self.n)
+        self.n += 1
+        if image is not None and image.shape == frame.shape:
+            image[:] = frame
+            return True, image
+        return True, frame
+
+    def get(self, prop):
+        return 0
+
+
+def test_frame_results_keep_their_own_boxes(make_service, texture):
+    svc = make_service(cap=_PanningSource(texture),
+                       tracker=BoxTracker(detect_every=10, motion_threshold=1e9))
+    svc.yolo = FakeYolo(boxes=[BOX], classes=[0])
+    results = [svc.process_frame() for _ in range(4)]
+    firsts = [r.boxes[0, 0] for r in results]
+    assert firsts[0] == BOX[0]
+    assert all(b > a for a, b in zip(firsts, firsts[1:]))    # each frame its own snapshot
+    assert results[1].boxes is not svc.tracker.boxes
@@ -0,0 +1,153 @@
+# backend/tests/test_database.py
+"""
+Data-access layer against a throwaway SQLite database (DB_DEV_SQLITE=1
+inside a temp working directory): keyset pages, cursor streaming and the
+/users endpoints, sync and async, with a latency ceiling on the pages.
+"""
+import asyncio
+import importlib
+import inspect
+import json
+import os
+import time
+
+import numpy as np
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+N_USERS = 5000
+PAGE_P50_MS = float(os.getenv("DB_TEST_PAGE_P50_MS", "50"))
+
+
+@pytest.fixture(scope="module")
+def db_module(tmp_path_factory):
+    with pytest.MonkeyPatch.context() as mp:
+        root = tmp_path_factory.mktemp("db")
+        (root / "data").mkdir()
+        mp.chdir(root)
+        mp.delenv("DATABASE_URL", raising=False)
+        mp.setenv("DB_DEV_SQLITE", "1")
+        import app.database
+        database = importlib.reload(app.database)
+        assert database.DATABASE_URL == "sqlite:///data/saferoom.db"
+
+        from sqlalchemy import text
+        with database.get_engine().begin() as conn:
+            conn.execute(text("CREATE TABLE users (id INTEGER PRIMARY KEY, name TEXT)"))
+            conn.execute(text("INSERT INTO users (id, name) VALUES (:id, :name)"),
+                         [{"id": i, "name": f"user{i}"} for i in range(1, N_USERS + 1)])
+        yield database, mp
+        database.get_engine().dispose()
+        if database._async_engine is not None:
+            asyncio.run(database._async_engine.dispose())
+    importlib.reload(app.database)
+
+
+@pytest.fixture(scope="module", params=["sync", "async"])
+def client(request, db_module):
+    database, mp = db_module
+    mp.setenv("DB_ASYNC", "1" if request.param == "async" else "0")
+    database.DB_ASYNC = request.param == "async"
+    import app.api.dbroute
+    dbroute = importlib.reload(app.api.dbroute)
+    api = FastAPI()
+    api.include_router(dbroute.router, prefix="/predict")
+    assert inspect.iscoroutinefunction(dbroute.read_users) == database.DB_ASYNC
+    with TestClient(api) as c:
+        yield c
+
+
+def _session(database):
+    return database.SessionLocal()
+
+
+def test_keyset_page_boundaries(db_module):
+    database, _ = db_module
+    db = _session(database)
+    try:
+        first = database.keyset_page(db, "users", limit=100)
+        assert [r["id"] for r in first["items"]] == list(range(1, 101))
+        assert first["next_after"] == 100
+        nxt = database.keyset_page(db, "users", after=first["next_after"], limit=100)
+        assert nxt["items"][0]["id"] == 101
+        last = database.keyset_page(db, "users", after=N_USERS - 30, limit=100)
+        assert len(last["items"]) == 30 and last["next_after"] is None
+        exact = database.keyset_page(db, "users", after=N_USERS - 100, limit=100)
+        assert exact["next_after"] == N_USERS      # full page: one more (empty) fetch
+        assert database.keyset_page(db, "users", after=N_USERS, limit=100) == \
+            {"items": [], "next_after": None}
+    finally:
+        db.close()
+
+
+def test_keyset_page_async_matches_sync(db_module):
+    database, _ = db_module
+
+    async def pages():
+        async for db in database.get_async_db():
+            return [await database.keyset_page_async(db, "users", after=a, limit=50)
+                    for a in (0, 2500, N_USERS - 10)]
+
+    got = asyncio.run(pages())
+    db = _session(database)
+    try:
+        want = [database.keyset_page(db, "users", after=a, limit=50) for a in (0, 2500, N_USERS - 10)]
+    finally:
+        db.close()
+    assert got == want
+
+
+def test_stream_rows_yields_everything_in_chunks(db_module):
+    database, _ = db_module
+    db = _session(database)
+    try:
+        ids = [r["id"] for r in database.stream_rows(db, "SELECT * FROM users ORDER BY id", chunk=7)]
+    finally:
+        db.close()
+    assert ids == list(range(1, N_USERS + 1))
+
+
+def test_json_array_chunks(client):
+    from app.api.dbroute import json_array
+    parts = list(json_array(({"id": i} for i in range(10)), chunk=4))
+    assert len(parts) == 4                      # 3 batches + closing bracket
+    assert json.loads("".join(parts)) == [{"id": i} for i in range(10)]
+    assert json.loads("".join(json_array(iter(())))) == []
+
+
+def test_users_default_is_plain_list(client):
+    r = client.get("/predict/users")
+    assert r.status_code == 200
+    users = r.json()
+    assert isinstance(users, list) and len(users) == N_USERS
+    assert users[0] == {"id": 1, "name": "user1"}
+
+
+def test_users_paginates_when_asked(client):
+    page = client.get("/predict/users", params={"limit": 100}).json()
+    assert len(page["items"]) == 100 and page["next_after"] == 100
+    page = client.get("/predict/users", params={"after": N_USERS - 5}).json()
+    assert [u["id"] for u in page["items"]] == list(range(N_USERS - 4, N_USERS + 1))
+    assert client.get("/predict/users", params={"limit": 0}).status_code == 422
+
+
+def test_users_stream_ndjson(client):
+    r = client.get("/predict/users/stream")
+    lines = r.text.strip().split("\n")
+    assert len(lines) == N_USERS
+    assert json.loads(lines[-1])["id"] == N_USERS
+
+
+def test_page_latency(client):
+    def p50(params):
+        samples = []
+        for _ in range(20):
+            t0 = time.perf_counter()
+            assert client.get("/predict/users", params=params).status_code == 200
+            samples.append((time.perf_counter() - t0) * 1000.0)
+        return float(np.percentile(samples, 50))
+
+    assert p50({"limit": 100}) < PAGE_P50_MS
+    # keyset: a deep page costs about the same as the first
+    assert p50({"after": N_USERS - 100, "limit": 100}) < PAGE_P50_MS
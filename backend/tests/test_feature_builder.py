@@ -0,0 +1,67 @@
+# backend/tests/test_feature_builder.py
+import numpy as np
+import pytest
+
+from app.services.feature_builder import POSE_DIM, FeatureBuilder, class_histograms
+
+C = 80
+
+
+def _sequence(n=64, seed=0, nan_rows=(0, 5, 6, 40)):
+    rng = np.random.default_rng(seed)
+    poses = rng.random((n, POSE_DIM)).astype(np.float32)
+    poses[list(nan_rows)] = np.nan
+    classes = [rng.integers(0, C, rng.integers(0, 6)) for _ in range(n)]
+    return poses, classes
+
+
+def _reference(poses, classes):
+    """The original per-frame formula: fill missing pose, diff, histogram."""
+    prev = np.zeros(POSE_DIM, np.float32)
+    rows = []
+    for p, c in zip(poses, classes):
+        pts = prev.copy() if np.isnan(p).any() else p.copy()
+        rows.append(np.concatenate([pts, pts - prev, np.bincount(c, minlength=C).astype(np.float32)]))
+        prev = pts
+    return np.array(rows)
+
+
+@pytest.mark.parametrize("batch", [1, 7, 16, 64])
+def test_batched_matches_per_frame(batch):
+    poses, classes = _sequence()
+    b = FeatureBuilder(C, max_batch=batch)
+    out = np.vstack([b.build(poses[i:i + batch], classes[i:i + batch]).copy()
+                     for i in range(0, len(poses), batch)])
+    np.testing.assert_array_equal(out, _reference(poses, classes))
+
+
+def test_layout_and_buffer_reuse():
+    b = FeatureBuilder(C, max_batch=4)
+    assert b.feature_dim == 2 * POSE_DIM + C
+    poses, classes = _sequence(4, nan_rows=())
+    first = b.build(poses, classes)
+    assert first.dtype == np.float32 and first.shape == (4, b.feature_dim)
+    assert b.build(poses[:2], classes[:2]).base is first.base    # no new allocation
+
+
+def test_grows_for_oversized_batch():
+    poses, classes = _sequence(10, nan_rows=())
+    out = FeatureBuilder(C, max_batch=2).build(poses, classes)
+    np.testing.assert_array_equal(out, _reference(poses, classes))
+
+
+def test_reset_sets_velocity_origin():
+    b = FeatureBuilder(C)
+    first = np.full(POSE_DIM, 2.0, np.float32)
+    b.reset(first)
+    row = b.build(np.full((1, POSE_DIM), 5.0, np.float32), [np.array([], int)])[0]
+    assert np.all(row[POSE_DIM:2 * POSE_DIM] == 3.0)
+    b.reset()
+    assert not b.prev_pose.any()
+
+
+def test_class_histograms_ignores_out_of_range_ids():
+    hist = class_histograms([np.array([0, 0, 3, C, -1]), np.array([], int)], C)
+    assert hist.shape == (2, C)
+    assert hist[0, 0] == 2 and hist[0, 3] == 1 and hist[0].sum() == 3
+    assert not hist[1].any()
@@ -0,0 +1,72 @@
+# backend/tests/test_feature_store.py
+import numpy as np
+import pytest
+
+from app.services.feature_store import FeatureStore, load_features_from_env
+
+DIM = 6
+
+
+def _fill(store, n, t0=1000.0, cam="cam0"):
+    feats = np.random.default_rng(0).random((n, DIM)).astype(np.float32)
+    for i, f in enumerate(feats):
+        store.append(f, float(i), cam, ts=t0 + i)
+    return feats
+
+
+def test_roundtrip_across_segments(tmp_path):
+    store = FeatureStore(str(tmp_path), DIM, segment_records=4, flush_every=2)
+    feats = _fill(store, 10)
+    store.close()
+
+    reader = FeatureStore.open(str(tmp_path))
+    assert len(reader.manifest["segments"]) == 3
+    np.testing.assert_array_equal(reader.load_features(), feats)
+    recs = reader.load()
+    np.testing.assert_array_equal(recs["recon_error"], np.arange(10, dtype=np.float32))
+
+
+def test_time_range_and_camera_filter(tmp_path):
+    store = FeatureStore(str(tmp_path), DIM, segment_records=4)
+    feats = _fill(store, 10)
+    store.append(np.ones(DIM, np.float32), 0.0, "cam1", ts=2000.0)
+    store.close()
+
+    reader = FeatureStore.open(str(tmp_path))
+    np.testing.assert_array_equal(reader.load_features(since=1003.0, until=1007.0), feats[3:7])
+    assert len(reader.load(camera_id="cam1")) == 1
+    assert len(reader.load(since=3000.0)) == 0
+
+
+def test_reopen_appends_to_partial_segment(tmp_path):
+    store = FeatureStore(str(tmp_path), DIM, segment_records=8)
+    first = _fill(store, 3)
+    store.close()
+
+    store = FeatureStore(str(tmp_path), DIM, segment_records=8)
+    second = _fill(store, 2, t0=1100.0)
+    store.close()
+
+    reader = FeatureStore.open(str(tmp_path))
+    assert len(reader.manifest["segments"]) == 1
+    np.testing.assert_array_equal(reader.load_features(), np.vstack([first, second]))
+
+
+def test_feature_dim_mismatch_is_rejected(tmp_path):
+    FeatureStore(str(tmp_path), DIM).close()
+    with pytest.raises(ValueError):
+        FeatureStore(str(tmp_path), DIM + 1)
+
+
+def test_load_features_from_env(tmp_path, monkeypatch):
+    npy = tmp_path / "normal.npy"
+    np.save(npy, np.zeros((2, DIM), np.float32))
+    monkeypatch.delenv("FEATURE_STORE_DIR", raising=False)
+    assert load_features_from_env(str(npy)).shape == (2, DIM)
+
+    root = tmp_path / "store"
+    store = FeatureStore(str(root), DIM)
+    _fill(store, 5)
+    store.close()
+    monkeypatch.setenv("FEATURE_STORE_DIR", str(root))
+    assert load_features_from_env(str(npy)).shape == (5, DIM)
@@ -0,0 +1,115 @@
+# backend/tests/test_frame_extractor.py
+import os
+import shutil
+from datetime import datetime, timedelta, timezone
+
+import cv2
+import numpy as np
+import pytest
+
+from conftest import BACKEND_DIR
+from app.services import frame_extractor
+from app.services.frame_extractor import build_seek_index, extract_frames
+
+SAMPLE = os.path.join(BACKEND_DIR, "sample.mp4")
+START = datetime(2025, 1, 1, tzinfo=timezone.utc)
+_VideoCapture = cv2.VideoCapture
+
+
+@pytest.fixture
+def video(tmp_path):
+    cap = cv2.VideoCapture(SAMPLE)
+    if not cap.isOpened() or cap.get(cv2.CAP_PROP_FRAME_COUNT) < 800:
+        pytest.skip("sample.mp4 not readable")
+    cap.release()
+    path = tmp_path / "clip.mp4"
+    shutil.copyfile(SAMPLE, path)
+    return str(path)
+
+
+def _naive(path, frame_no):
+    cap = cv2.VideoCapture(path)
+    cap.set(cv2.CAP_PROP_POS_FRAMES, frame_no)
+    ok, frame = cap.read()
+    cap.release()
+    assert ok
+    return frame
+
+
+class _CountingCapture:
+    """cv2.VideoCapture that counts seeks."""
+    seeks = 0
+
+    def __init__(self, path):
+        self._cap = _VideoCapture(path)
+
+    def set(self, prop, value):
+        if prop == cv2.CAP_PROP_POS_FRAMES:
+            _CountingCapture.seeks += 1
+        return self._cap.set(prop, value)
+
+    def __getattr__(self, name):
+        return getattr(self._cap, name)
+
+
+def _extract(video, tmp_path, frame_nos, monkeypatch):
+    index = build_seek_index(video)
+    half = float(np.median(np.diff(index))) / 2
+    stamps = [START + timedelta(milliseconds=index[n] + half) for n in frame_nos]
+    outs = [str(tmp_path / f"out_{i}.png") for i in range(len(frame_nos))]
+    _CountingCapture.seeks = 0
+    with monkeypatch.context() as m:
+        m.setattr(cv2, "VideoCapture", _CountingCapture)
+        assert extract_frames(video, stamps, START, outs) == outs
+    return [cv2.imread(p) for p in outs]
+
+
+# out of order, a duplicate, and gaps on both sides of SEEK_GAP_FRAMES
+FRAMES = [700, 5, 6, 400, 6, 120]
+
+
+def test_matches_naive_seek_and_read(video, tmp_path, monkeypatch):
+    got = _extract(video, tmp_path, FRAMES, monkeypatch)
+    for n, frame in zip(FRAMES, got):
+        np.testing.assert_array_equal(frame, _naive(video, n), err_msg=f"frame {n}")
+    # 6 → 120 is bridged with grab(); 120 → 400 → 700 each take one seek
+    assert _CountingCapture.seeks == 2
+
+
+def test_seeking_and_sequential_reads_agree(video, tmp_path, monkeypatch):
+    seek = _extract(video, tmp_path, FRAMES, monkeypatch)
+    monkeypatch.setattr(frame_extractor, "SEEK_GAP_FRAMES", 10 ** 9)
+    seq = _extract(video, tmp_path, FRAMES, monkeypatch)
+    assert _CountingCapture.seeks == 0
+    for a, b in zip(seek, seq):
+        np.testing.assert_array_equal(a, b)
+
+
+def test_out_of_range_timestamp_raises(video, tmp_path):
+    index = build_seek_index(video)
+    late = START + timedelta(milliseconds=index[-1] + 1000)
+    with pytest.raises(RuntimeError, match="Unable to read frame"):
+        extract_frames(video, [late], START, [str(tmp_path / "x.png")])
+    with pytest.raises(RuntimeError, match="Unable to read frame"):
+        extract_frames(video, [START - timedelta(seconds=1)], START, [str(tmp_path / "x.png")])
+
+
+def test_seek_index_is_cached_per_path_mtime_and_size(video):
+    first = build_seek_index(video)
+    assert build_seek_index(video) is first
+    assert len(first) == int(cv2.VideoCapture(video).get(cv2.CAP_PROP_FRAME_COUNT))
+    assert np.all(np.diff(first) > 0)
+
+    st = os.stat(video)
+    os.utime(video, (st.st_atime, st.st_mtime + 10))           # mtime changed
+    second = build_seek_index(video)
+    assert second is not first
+    np.testing.assert_array_equal(second, first)
+
+    with open(video, "ab") as f:                               # size changed
+        f.write(b"\0" * 16)
+    os.utime(video, (st.st_atime, st.st_mtime + 10))           # same mtime as before
+    assert build_seek_index(video) is not second
+
+    path = os.path.abspath(video)
+    assert sum(k[0] == path for k in frame_extractor._index_cache) == 1
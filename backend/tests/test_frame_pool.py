@@ -0,0 +1,56 @@
+# backend/tests/test_frame_pool.py
+import os
+
+import cv2
+import numpy as np
+import pytest
+
+from app.services.frame_pool import FramePool
+
+SAMPLE = os.path.join(os.path.dirname(__file__), os.pardir, "sample.mp4")
+
+
+class _Source:
+    """cap.read(image=...) stand-in producing frames of a fixed size."""
+
+    def __init__(self, h, w):
+        self.h, self.w, self.n = h, w, 0
+
+    def read(self, image=None):
+        self.n += 1
+        if image is None or image.shape != (self.h, self.w, 3):
+            image = np.empty((self.h, self.w, 3), dtype=np.uint8)
+        image[:] = self.n
+        return True, image
+
+
+def test_reads_round_robin_into_pooled_buffers():
+    pool = FramePool(4, 6, n_frames=2)
+    ids = {id(b) for b in pool.frames}
+    src = _Source(4, 6)
+    _, a = pool.read(src)
+    _, b = pool.read(src)
+    _, c = pool.read(src)
+    assert {id(a), id(b)} == ids and c is a
+    assert b[0, 0, 0] == 2          # previous frame survives the next read
+
+
+def test_adopts_frames_of_an_unexpected_size():
+    pool = FramePool(4, 6, n_frames=1)
+    _, frame = pool.read(_Source(8, 10))
+    assert frame.shape == (8, 10, 3)
+    assert pool.frames[0] is frame
+    assert pool.rgb.shape == frame.shape
+
+
+def test_video_capture_reuses_buffer():
+    cap = cv2.VideoCapture(SAMPLE)
+    if not cap.isOpened():
+        pytest.skip("sample.mp4 not readable")
+    h, w = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)), int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+    pool = FramePool(h, w, n_frames=2)
+    buffers = [id(b) for b in pool.frames]
+    for _ in range(4):
+        ok, frame = pool.read(cap)
+        assert ok and id(frame) in buffers
+    cap.release()
@@ -0,0 +1,103 @@
+# backend/tests/test_frame_renderer.py
+import os
+import threading
+import tracemalloc
+
+import cv2
+import numpy as np
+import pytest
+
+from conftest import FakeYolo, FrameSource
+from app.services.frame_renderer import FrameRenderer
+from app.services.inference_worker import serve
+from app.services.shm_ring import FrameRing
+
+BOX = [[40, 30, 120, 90]]
+
+
+def test_annotate_draws_in_place():
+    canvas = np.zeros((120, 160, 3), dtype=np.uint8)
+    r = FrameRenderer({0: "person"}, banner_height=20)
+    out = r.annotate(canvas, np.array(BOX, np.float32), np.array([0]), is_anomaly=True)
+    assert out is canvas
+    assert (canvas[:20] == (0, 0, 255)).all(axis=-1).mean() > 0.5      # banner
+    assert canvas[60, 40].any() and not canvas[60, 80].any()           # box edge, not its inside
+
+
+def test_annotate_skips_boxes_when_degraded():
+    canvas = np.zeros((120, 160, 3), dtype=np.uint8)
+    FrameRenderer({0: "person"}).annotate(canvas, np.array(BOX, np.float32), np.array([0]),
+                                          is_anomaly=False, draw_boxes=False)
+    assert not canvas.any()
+
+
+def test_render_draws_into_the_pooled_buffer_without_allocating(make_service):
+    svc = make_service(cap=FrameSource(h=240, w=320), yolo=FakeYolo(BOX, [0]))
+    result = svc.process_frame()
+    assert any(result.frame is b for b in svc.pool.frames)
+    before = result.frame.copy()
+
+    tracemalloc.start()
+    jpeg = svc.render(result)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    assert peak < result.frame.nbytes // 4            # no full-resolution copy
+    assert (result.frame != before).any()             # boxes drawn on the buffer itself
+    decoded = cv2.imdecode(np.frombuffer(jpeg, np.uint8), cv2.IMREAD_COLOR)
+    assert decoded.shape == result.frame.shape
+
+
+def test_render_draws_each_result_once(make_service):
+    svc = make_service(yolo=FakeYolo([[5, 5, 30, 30]], [0]))
+    result = svc.process_frame()
+    first = svc.render(result)
+    drawn = result.frame.copy()
+    assert svc.render(result) == first
+    np.testing.assert_array_equal(result.frame, drawn)
+
+
+@pytest.fixture
+def rings(request):
+    name = f"srai_r_{os.getpid()}_{request.node.name[:16]}"
+    frames = FrameRing.create(name, n_slots=4, slot_size=256 * 1024)
+    logs = FrameRing.create(f"{name}_log", n_slots=16, slot_size=64 * 1024)
+    yield frames, logs
+    frames.close()
+    logs.close()
+
+
+def _serve(svc, frames, logs, n):
+    """Run the worker loop for `n` frames; returns how often render() ran."""
+    stop, rendered = threading.Event(), []
+    process, render = svc.process_frame, svc.render
+
+    def process_frame():
+        result = process()
+        if svc.cap.n >= n:
+            stop.set()
+        return result
+
+    def counting_render(result):
+        rendered.append(result)
+        return render(result)
+
+    svc.process_frame, svc.render = process_frame, counting_render
+    serve(svc, frames, logs, stop)
+    return rendered
+
+
+def test_no_reader_means_no_encoding(make_service, rings):
+    frames, logs = rings
+    svc = make_service()
+    assert not frames.reader_active()
+    assert _serve(svc, frames, logs, 5) == []
+    assert frames.latest_seq() == 0 and logs.latest_seq() == 5
+
+
+def test_attached_reader_gets_every_frame(make_service, rings):
+    frames, logs = rings
+    svc = make_service()
+    frames.touch()
+    assert len(_serve(svc, frames, logs, 5)) == 5
+    assert frames.latest_seq() == 5
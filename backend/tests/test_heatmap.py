@@ -0,0 +1,57 @@
+# backend/tests/test_heatmap.py
+import datetime
+
+import numpy as np
+
+from app.services.heatmap import HeatmapAccumulator
+
+
+def _naive_raster(acc, boxes):
+    out = np.zeros((acc.gh, acc.gw), dtype=np.float32)
+    for x1, y1, x2, y2 in boxes:
+        cx1 = min(int(x1 // acc.cell), acc.gw - 1)
+        cy1 = min(int(y1 // acc.cell), acc.gh - 1)
+        cx2 = min(int(x2 // acc.cell), acc.gw - 1)
+        cy2 = min(int(y2 // acc.cell), acc.gh - 1)
+        out[cy1:cy2 + 1, cx1:cx2 + 1] += 1.0
+    return out
+
+
+def test_rasterize_matches_per_box_fill():
+    acc = HeatmapAccumulator(640, 480, cell=16)
+    rng = np.random.default_rng(0)
+    xy = rng.random((20, 2)) * [600, 440]
+    boxes = np.hstack([xy, xy + rng.random((20, 2)) * 200])   # some run off-frame
+    np.testing.assert_array_equal(acc._rasterize(boxes), _naive_raster(acc, boxes))
+    assert not acc._rasterize(np.zeros((0, 4))).any()
+
+
+def test_hourly_buckets_and_summary():
+    acc = HeatmapAccumulator(64, 64, cell=16)
+    ts = datetime.datetime(2026, 1, 1, 14, 30).timestamp()
+    acc.add([[0, 0, 20, 20]], ts=ts)
+    acc.add([[0, 0, 20, 20]], ts=ts)
+    assert acc.grid(hour=14)[0, 0] == 2.0
+    assert acc.grid(hour=13).sum() == 0.0
+    summary = acc.hourly_summary()
+    assert summary[14] == {"hour": 14, "count": 2, "intensity": 1.0}
+    assert summary[0]["count"] == 0
+
+
+def test_recent_plane_decays_by_half_life():
+    acc = HeatmapAccumulator(32, 32, cell=16, half_life_s=10.0)
+    t0 = acc._recent_ts
+    acc.add([[0, 0, 10, 10]], ts=t0)
+    acc._decay_to(t0 + 10.0)
+    assert np.isclose(acc.recent[0, 0], 0.5)
+
+
+def test_save_load_roundtrip(tmp_path):
+    acc = HeatmapAccumulator(100, 50, cell=10, half_life_s=60.0)
+    acc.add([[5, 5, 40, 30]], ts=datetime.datetime(2026, 1, 1, 3).timestamp())
+    path = str(tmp_path / "cam0.npz")
+    acc.save(path)
+    back = HeatmapAccumulator.load(path)
+    assert (back.frame_width, back.frame_height, back.cell) == (100, 50, 10)
+    np.testing.assert_array_equal(back.hourly, acc.hourly)
+    np.testing.assert_array_equal(back.hourly_frames, acc.hourly_frames)
@@ -0,0 +1,93 @@
+# backend/tests/test_inference_worker.py
+import os
+import threading
+import time
+
+import pytest
+
+from conftest import FrameSource
+from app.services import inference_service
+from app.services.inference_worker import serve
+from app.services.shm_ring import FrameRing
+
+
+@pytest.fixture
+def rings(request):
+    name = f"srai_w_{os.getpid()}_{request.node.name[:16]}"
+    frames = FrameRing.create(name, n_slots=4, slot_size=1024)
+    logs = FrameRing.create(f"{name}_log", n_slots=16, slot_size=64 * 1024)
+    yield frames, logs
+    frames.close()
+    logs.close()
+
+
+def _stop_after(svc, n):
+    """Set the returned event once process_frame has succeeded `n` times."""
+    stop, done = threading.Event(), []
+    process = svc.process_frame
+
+    def process_frame():
+        result = process()
+        done.append(result)
+        if len(done) >= n:
+            stop.set()
+        return result
+
+    svc.process_frame = process_frame
+    return stop, done
+
+
+def test_oversized_frames_are_skipped_not_fatal(make_service, rings):
+    frames, logs = rings
+    svc = make_service(cap=FrameSource(h=240, w=320))
+    stop, done = _stop_after(svc, 3)
+    frames.touch()                                # a viewer is attached
+    serve(svc, frames, logs, stop)
+
+    assert len(done) == 3
+    assert frames.latest_seq() == 0               # every JPEG exceeded the 1 KiB slot
+    assert logs.latest_seq() == 3
+    assert all(logs.read(s).meta["frame_seq"] is None for s in (1, 2, 3))
+
+
+def test_frames_are_published_while_a_viewer_is_attached(make_service, rings):
+    frames, logs = rings
+    svc = make_service(cap=FrameSource(h=8, w=8))
+    stop, _ = _stop_after(svc, 2)
+    frames.touch()
+    serve(svc, frames, logs, stop)
+    assert frames.latest_seq() == 2
+    assert logs.read(2).meta["frame_seq"] == 2
+
+
+def test_dead_source_is_reopened_with_backoff(make_service, rings, monkeypatch):
+    frames, logs = rings
+    svc = make_service(cap=FrameSource(n_frames=2))
+    opened = []
+
+    def get_video_source(camera_index, fallback_video):
+        opened.append((camera_index, fallback_video))
+        if len(opened) == 1:
+            raise RuntimeError("camera still gone")
+        return FrameSource(n_frames=10)
+
+    monkeypatch.setattr(inference_service, "get_video_source", get_video_source)
+    stop, done = _stop_after(svc, 5)
+    serve(svc, frames, logs, stop, max_backoff_s=0.01)
+
+    # 2 frames, a failed re-open, a successful one, then 3 more frames
+    assert opened == [(0, "sample.mp4")] * 2
+    assert len(done) == 5 and logs.latest_seq() == 5
+    assert svc.cap.n == 3
+
+
+def test_stop_interrupts_backoff(make_service, rings, monkeypatch):
+    frames, logs = rings
+    svc = make_service(cap=FrameSource(n_frames=0))
+    monkeypatch.setattr(inference_service, "get_video_source",
+                        lambda *a: pytest.fail("re-opened after stop"))
+    stop = threading.Event()
+    threading.Timer(0.05, stop.set).start()
+    t0 = time.perf_counter()
+    serve(svc, frames, logs, stop, max_backoff_s=30)
+    assert time.perf_counter() - t0 < 0.4          # the first backoff alone is 0.5 s
@@ -0,0 +1,176 @@
+# backend/tests/test_model_reloader.py
+import functools
+import os
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from app.services import model_reloader
+from app.services.model_reloader import ModelReloader, ScoringBundle, THRESHOLD_FILE
+from app.services.quantized_ae import quantize_layers, quantized_path
+
+DIM = 6
+
+
+class _Service:
+    def __init__(self, bundle):
+        self.scoring = bundle
+        self.feature_dim = DIM
+
+
+def _bundle(version, threshold=1.0):
+    return ScoringBundle(ae=None, mean=np.zeros(DIM, np.float32), std=np.ones(DIM, np.float32),
+                         threshold=threshold, version=version)
+
+
+def _write_models(model_dir, dim=DIM):
+    """A real int8 model + stats on disk, loadable without TensorFlow."""
+    rng = np.random.default_rng(0)
+    layers = [(rng.normal(size=(dim, 3)).astype(np.float32), np.zeros(3, np.float32), "relu"),
+              (rng.normal(size=(3, dim)).astype(np.float32), np.zeros(dim, np.float32), "linear")]
+    ae_path = os.path.join(model_dir, "autoencoder.h5")
+    np.savez(quantized_path(ae_path, "int8"), **quantize_layers(layers, "int8"))
+    stats_path = os.path.join(model_dir, "ae_norm_stats.npz")
+    np.savez(stats_path, mean=np.zeros(dim), std=np.ones(dim))
+    return ae_path, stats_path
+
+
+@pytest.fixture
+def int8(monkeypatch):
+    monkeypatch.setattr(model_reloader, "load_scoring_bundle",
+                        functools.partial(model_reloader.load_scoring_bundle, precision="int8"))
+
+
+def _reload(reloader, threshold=None):
+    assert reloader.reload_async(threshold)
+    reloader._thread.join(5)
+
+
+def test_reload_swaps_in_validated_bundle(tmp_path, int8):
+    ae_path, stats_path = _write_models(str(tmp_path))
+    svc = _Service(_bundle("old"))
+    reloader = ModelReloader(svc, ae_path, stats_path)
+    _reload(reloader, threshold=0.5)
+    assert svc.scoring.version.endswith("-int8") and svc.scoring.threshold == 0.5
+    assert reloader.state["status"] == "ok"
+
+
+def test_failed_validation_keeps_old_bundle(tmp_path, int8):
+    ae_path, stats_path = _write_models(str(tmp_path), dim=DIM + 1)   # wrong feature_dim
+    old = _bundle("old")
+    svc = _Service(old)
+    reloader = ModelReloader(svc, ae_path, stats_path)
+    _reload(reloader)
+    assert svc.scoring is old
+    assert reloader.state["status"] == "failed" and "expected" in reloader.state["error"]
+
+
+def test_threshold_file_is_picked_up(tmp_path, int8):
+    ae_path, stats_path = _write_models(str(tmp_path))
+    (tmp_path / THRESHOLD_FILE).write_text('{"threshold": 0.25}')
+    svc = _Service(_bundle("old"))
+    _reload(ModelReloader(svc, ae_path, stats_path))
+    assert svc.scoring.threshold == 0.25
+
+
+def _on_probation(monkeypatch, frames=10, **kw):
+    """A reloader that just swapped `new` in over `old`, with a 1 ms baseline."""
+    old, new = _bundle("old"), _bundle("new")
+    monkeypatch.setattr(model_reloader, "load_scoring_bundle", lambda *a, **k: new)
+    svc = _Service(old)
+    reloader = ModelReloader(svc, "models/autoencoder.h5", "models/ae_norm_stats.npz",
+                             probation_frames=frames, **kw)
+    for _ in range(20):
+        reloader.check(old, 0.1, 1.0)
+    _reload(reloader)
+    assert svc.scoring is new
+    return svc, reloader, old, new
+
+
+def test_probation_passes_on_healthy_frames(monkeypatch):
+    svc, reloader, old, new = _on_probation(monkeypatch)
+    for _ in range(10):
+        reloader.check(new, 0.1, 1.2)
+    assert svc.scoring is new and reloader.state["status"] == "ok"
+    reloader.check(new, float("nan"), 1.0)          # probation over: no longer watched
+    assert svc.scoring is new
+
+
+def test_probation_rolls_back_on_non_finite_error(monkeypatch):
+    svc, reloader, old, new = _on_probation(monkeypatch)
+    reloader.check(new, 0.1, 1.0)
+    reloader.check(new, float("inf"), 1.0)
+    assert svc.scoring is old
+    assert reloader.state["status"] == "rolled_back" and "non-finite" in reloader.state["error"]
+
+
+def test_probation_rolls_back_on_anomaly_rate(monkeypatch):
+    svc, reloader, old, new = _on_probation(monkeypatch, max_anomaly_rate=0.5)
+    for i in range(10):
+        reloader.check(new, 2.0 if i < 6 else 0.1, 1.0)    # 60 % above threshold 1.0
+    assert svc.scoring is old
+    assert "anomaly rate" in reloader.state["error"]
+
+
+def test_probation_rolls_back_when_scoring_is_slow(monkeypatch):
+    svc, reloader, old, new = _on_probation(monkeypatch, max_slowdown=3.0)
+    for _ in range(10):
+        reloader.check(new, 0.1, 5.0)
+    assert svc.scoring is old
+    assert "scoring" in reloader.state["error"]
+
+
+def test_concurrent_reload_is_rejected(monkeypatch):
+    release = threading.Event()
+    new = _bundle("new")
+
+    def slow_load(*a, **k):
+        release.wait(5)
+        return new
+
+    monkeypatch.setattr(model_reloader, "load_scoring_bundle", slow_load)
+    svc = _Service(_bundle("old"))
+    reloader = ModelReloader(svc, "models/autoencoder.h5", "models/ae_norm_stats.npz")
+    assert reloader.reload_async(0.5)
+    assert not reloader.reload_async(0.5)
+    assert reloader.state["status"] == "loading"
+    release.set()
+    reloader._thread.join(5)
+    assert svc.scoring is new
+    assert reloader.reload_async(0.5)
+    reloader._thread.join(5)
+
+
+def test_watcher_waits_for_partial_write_then_retries_busy_reload(tmp_path):
+    ae_path, stats_path = str(tmp_path / "autoencoder.h5"), str(tmp_path / "ae_norm_stats.npz")
+    with open(ae_path, "wb") as f:
+        f.write(b"old")
+    reloader = ModelReloader(_Service(_bundle("old")), ae_path, stats_path)
+    sizes, busy = [], [True]
+
+    def reload_async(threshold=None):
+        sizes.append(os.path.getsize(ae_path))
+        if busy[0]:                 # first attempt: a reload is already running
+            busy[0] = False
+            return False
+        return True
+
+    reloader.reload_async = reload_async
+    reloader.start_watching(interval_s=0.05)
+    try:
+        time.sleep(0.1)
+        with open(ae_path, "wb") as f:      # a copy in progress: grows for ~0.3 s
+            for _ in range(10):
+                f.write(b"x" * 100)
+                f.flush()
+                os.utime(ae_path)
+                time.sleep(0.03)
+        deadline = time.time() + 2
+        while len(sizes) < 2 and time.time() < deadline:
+            time.sleep(0.02)
+        time.sleep(0.3)
+    finally:
+        reloader.stop()
+    assert sizes == [1000, 1000]    # never mid-copy; retried once after the busy refusal
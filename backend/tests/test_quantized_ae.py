@@ -0,0 +1,64 @@
+# backend/tests/test_quantized_ae.py
+import numpy as np
+import pytest
+
+from app.services.quantized_ae import PRECISIONS, QuantizedAutoencoder, quantize_layers, quantized_path
+
+DIM = 40
+
+
+def _layers(seed=0):
+    rng = np.random.default_rng(seed)
+    sizes = [DIM, 24, 8, 24, DIM]
+    acts = ["relu", "relu", "sigmoid", "linear"]
+    return [
+        (rng.normal(0, 0.3, (a, b)).astype(np.float32), rng.normal(0, 0.1, b).astype(np.float32), act)
+        for a, b, act in zip(sizes[:-1], sizes[1:], acts)
+    ]
+
+
+def _float32(layers):
+    return QuantizedAutoencoder([w for w, _, _ in layers], [b for _, b, _ in layers],
+                                [a for _, _, a in layers], "float32", 0)
+
+
+@pytest.mark.parametrize("precision", PRECISIONS)
+def test_quantized_model_tracks_float32(tmp_path, precision):
+    layers = _layers()
+    path = tmp_path / f"ae_{precision}.npz"
+    np.savez(path, **quantize_layers(layers, precision))
+    q = QuantizedAutoencoder.load(str(path))
+
+    x = np.random.default_rng(1).normal(size=(256, DIM)).astype(np.float32)
+    ref = _float32(layers).predict(x)
+    out = q.predict(x)
+    assert out.dtype == np.float32 and out.shape == ref.shape
+    err_ref = np.mean((ref - x) ** 2, axis=1)
+    err_q = np.mean((out - x) ** 2, axis=1)
+    assert np.max(np.abs(err_q - err_ref) / err_ref) < (1e-3 if precision == "float16" else 2e-2)
+    assert q.input_shape == q.output_shape == (None, DIM)
+
+
+@pytest.mark.parametrize("precision, dtype", [("float16", np.float16), ("int8", np.int8)])
+def test_weights_stay_resident_at_reduced_precision(precision, dtype):
+    layers = _layers()
+    q = QuantizedAutoencoder.from_arrays(quantize_layers(layers, precision))
+    assert all(w.dtype == dtype for w in q.weights)
+    assert q.resident_bytes < _float32(layers).resident_bytes
+
+
+def test_int8_weights_use_full_range_per_unit():
+    data = quantize_layers(_layers(), "int8")
+    assert np.all(np.abs(data["w0"]).max(axis=0) == 127)
+
+
+def test_unsupported_inputs_are_rejected():
+    with pytest.raises(ValueError):
+        quantize_layers(_layers(), "int4")
+    w, b, _ = _layers()[0]
+    with pytest.raises(ValueError):
+        quantize_layers([(w, b, "softmax")], "int8")
+
+
+def test_quantized_path():
+    assert quantized_path("models/autoencoder.h5", "int8") == "models/autoencoder_int8.npz"
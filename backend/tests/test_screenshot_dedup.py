@@ -0,0 +1,56 @@
+# backend/tests/test_screenshot_dedup.py
+import cv2
+import numpy as np
+
+from app.services.screenshot_dedup import ScreenshotDeduper, _hamming, dedup_directory, dhash
+
+
+def _scene(seed, h=360, w=640):
+    rng = np.random.default_rng(seed)
+    small = rng.integers(0, 256, (9, 16, 3), dtype=np.uint8)
+    return cv2.resize(small, (w, h), interpolation=cv2.INTER_CUBIC)
+
+
+def _distance(a, b):
+    return int(_hamming(np.array([dhash(a)], dtype=np.uint64), dhash(b))[0])
+
+
+def test_dhash_is_stable_under_noise_and_rescale():
+    img = _scene(0)
+    noisy = np.clip(img.astype(np.int16) + np.random.default_rng(1).integers(-4, 5, img.shape),
+                    0, 255).astype(np.uint8)
+    assert _distance(img, img) == 0
+    assert _distance(img, noisy) <= 6
+    assert _distance(img, cv2.resize(img, (320, 180))) <= 6
+
+
+def test_dhash_separates_different_scenes():
+    assert _distance(_scene(0), _scene(2)) > 6
+
+
+def test_deduper_suppresses_within_distance_per_camera():
+    d = ScreenshotDeduper(max_distance=6, window=4)
+    img = _scene(0)
+    assert d.check("cam0", img)
+    assert not d.check("cam0", img)
+    assert d.check("cam1", img)             # other cameras have their own window
+    assert d.check("cam0", _scene(2))
+    assert d.stats() == {"cam0": {"saved": 2, "suppressed": 1},
+                         "cam1": {"saved": 1, "suppressed": 0}}
+
+
+def test_deduper_window_forgets_old_hashes():
+    d = ScreenshotDeduper(max_distance=0, window=2)
+    assert d.check("c", h=0b0001)
+    assert d.check("c", h=0b0110)
+    assert d.check("c", h=0b1000)           # evicts 0b0001
+    assert d.check("c", h=0b0001)
+
+
+def test_dedup_directory_moves_duplicates(tmp_path):
+    for i, seed in enumerate([0, 0, 2, 0]):
+        cv2.imwrite(str(tmp_path / f"2026010{i}_anom.jpg"), _scene(seed))
+    out = dedup_directory(str(tmp_path), ScreenshotDeduper(), action="move")
+    assert out["kept"] == ["20260100_anom.jpg", "20260102_anom.jpg"]
+    assert sorted(out["duplicates"]) == ["20260101_anom.jpg", "20260103_anom.jpg"]
+    assert sorted(p.name for p in (tmp_path / "duplicates").iterdir()) == out["duplicates"]
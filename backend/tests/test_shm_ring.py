@@ -0,0 +1,75 @@
+# backend/tests/test_shm_ring.py
+import os
+import struct
+
+import numpy as np
+import pytest
+
+from app.services.shm_ring import FrameRing, RingFrameSource, _HDR_SIZE
+
+
+@pytest.fixture
+def ring_name(request):
+    return f"srai_test_{os.getpid()}_{request.node.name[:20]}"
+
+
+@pytest.fixture
+def ring(ring_name):
+    r = FrameRing.create(ring_name, n_slots=4, slot_size=4096)
+    yield r
+    r.close()
+
+
+def test_publish_read_roundtrip(ring):
+    feats = np.arange(5, dtype=np.float32)
+    seq = ring.publish(b"jpeg", {"k": 1}, feats)
+    assert seq == ring.latest_seq() == 1
+    rec = ring.read(seq)
+    assert rec.blob == b"jpeg"
+    assert rec.meta == {"k": 1}
+    np.testing.assert_array_equal(rec.features, feats)
+
+
+def test_never_written_and_lapped_slots_read_as_none(ring):
+    assert ring.read(0) is None
+    assert ring.read(1) is None
+    for i in range(6):
+        ring.publish(bytes([i]))
+    assert ring.read(2) is None             # overwritten by seq 6
+    assert ring.read(6).blob == bytes([5])
+    assert ring.read(3).blob == bytes([2])
+
+
+def test_slot_being_written_reads_as_none(ring):
+    seq = ring.publish(b"x")
+    off = _HDR_SIZE + (seq % ring.n_slots) * ring.slot_size
+    struct.pack_into("<Q", ring.buf, off, 0)    # what publish() does while filling
+    assert ring.read(seq) is None
+
+
+def test_zero_copy_read_detects_overwrite(ring):
+    seq = ring.publish(b"first")
+    rec = ring.read(seq, copy=False)
+    assert bytes(rec.blob) == b"first"
+    for _ in range(ring.n_slots):
+        ring.publish(b"later")
+    assert not ring.still_valid(seq)
+    del rec
+
+
+def test_oversized_record_is_rejected(ring):
+    with pytest.raises(ValueError):
+        ring.publish(b"x" * ring.slot_size)
+
+
+def test_viewer_stream_ends_when_ring_goes_stale(ring_name):
+    frames = FrameRing.create(ring_name, n_slots=4, slot_size=4096)
+    logs = FrameRing.create(f"{ring_name}_log", n_slots=4, slot_size=4096)
+    try:
+        frames.publish(b"a")
+        src = RingFrameSource(ring_name, stale_s=0.2)
+        assert list(src.iter_frames()) == [b"a"]
+        src.release()
+    finally:
+        frames.close()
+        logs.close()
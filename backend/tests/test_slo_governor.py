@@ -0,0 +1,75 @@
+# backend/tests/test_slo_governor.py
+from app.services.slo_governor import QualityLevel, SloGovernor
+
+LEVELS = [
+    QualityLevel("full"),
+    QualityLevel("stride2", frame_stride=2),
+    QualityLevel("small", frame_stride=2, yolo_imgsz=320),
+]
+
+
+def _governor(**kw):
+    kw.setdefault("cooldown_s", 0.0)
+    kw.setdefault("alpha", 1.0)     # no smoothing: ewma == last frame
+    return SloGovernor(target_fps=10.0, levels=LEVELS, **kw)
+
+
+def test_degrades_after_consecutive_slow_frames():
+    g = _governor(down_after=3)
+    for _ in range(2):
+        g.record(150.0)
+    assert g.level.name == "full"
+    g.record(150.0)
+    assert g.level.name == "stride2"
+
+
+def test_recovers_after_consecutive_fast_frames():
+    g = _governor(down_after=1, up_after=4)
+    g.record(150.0)
+    assert g.level_idx == 1
+    for _ in range(3):
+        g.record(10.0)
+    assert g.level_idx == 1
+    g.record(10.0)
+    assert g.level_idx == 0
+
+
+def test_hysteresis_band_holds_level():
+    g = _governor(down_after=1, up_after=1)
+    g.record(150.0)
+    for _ in range(20):
+        g.record(80.0)      # between low (60 ms) and high (100 ms) water
+    assert g.level_idx == 1
+
+
+def test_stride_does_not_make_slow_frames_compliant():
+    g = _governor(down_after=1)
+    g.record(150.0)
+    assert g.level.frame_stride == 2
+    status = g.status()
+    assert status["meets_slo"] is False
+    assert status["processed_fps"] < 10.0
+    g.record(150.0)
+    assert g.level.name == "small"
+
+
+def test_cooldown_limits_level_changes():
+    g = _governor(down_after=1, cooldown_s=3600.0)
+    g._last_change = -1e9
+    g.record(150.0)
+    g.record(150.0)
+    assert g.level_idx == 1
+
+
+def test_waiting_for_camera_frames_is_not_counted(make_service):
+    from conftest import FrameSource
+
+    # a 30 fps camera: every grab/read blocks ~33 ms, so stride 2 waits
+    # ~66 ms per processed frame – above low water (60 ms at 10 fps)
+    svc = make_service(cap=FrameSource(delay_s=0.033))
+    svc.governor = SloGovernor(target_fps=10.0, levels=LEVELS, up_after=3, cooldown_s=0.0, alpha=1.0)
+    svc.governor.level_idx = 1
+    for _ in range(3):
+        svc.process_frame()
+    assert svc.governor.level.name == "full"
+    assert svc.governor.ewma_ms < 33.0
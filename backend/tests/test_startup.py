@@ -0,0 +1,43 @@
+# backend/tests/test_startup.py
+"""
+Cold-start guard for the ring-mode API front-end: `import app.main` must
+stay within the time budget and must not pull in any model/DB framework
+(those are deferred to the inference worker or the first request).
+"""
+import importlib.util
+import json
+import os
+import subprocess
+import sys
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
+BUDGET_S = float(os.getenv("STARTUP_BUDGET_S", "2.0"))
+HEAVY = ("tensorflow", "keras", "ultralytics", "mediapipe", "torch", "sqlalchemy", "pymongo")
+
+
+def _ring_env():
+    return dict(os.environ, PYTHONPATH=BACKEND_DIR, INFERENCE_RING="saferoom_test")
+
+
+def _load_profiler():
+    spec = importlib.util.spec_from_file_location(
+        "profile_startup", os.path.join(BACKEND_DIR, "scripts", "profile_startup.py")
+    )
+    mod = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(mod)
+    return mod
+
+
+def test_app_main_import_within_budget():
+    prof = _load_profiler().profile("app.main", _ring_env())
+    assert prof["error"] is None, prof["error"]
+    assert prof["total_s"] <= BUDGET_S, f"import app.main took {prof['total_s']:.2f}s > {BUDGET_S}s"
+
+
+def test_app_main_does_not_import_heavy_frameworks():
+    code = "import sys, json, app.main; print(json.dumps(sorted({m.split('.')[0] for m in sys.modules})))"
+    proc = subprocess.run([sys.executable, "-c", code], cwd=BACKEND_DIR, env=_ring_env(),
+                          capture_output=True, text=True)
+    assert proc.returncode == 0, proc.stderr[-2000:]
+    loaded = set(json.loads(proc.stdout.strip().splitlines()[-1]))
+    assert not loaded.intersection(HEAVY), f"heavy imports: {sorted(loaded.intersection(HEAVY))}"
@@ -0,0 +1,102 @@
+# backend/tests/test_sweep_autoencoder.py
+import importlib.util
+import json
+import os
+
+import numpy as np
+import pytest
+
+from conftest import BACKEND_DIR
+from app.services.model_reloader import THRESHOLD_FILE
+from app.services.quantized_ae import QuantizedAutoencoder
+
+
+@pytest.fixture(scope="module")
+def sweep():
+    spec = importlib.util.spec_from_file_location(
+        "sweep_autoencoder", os.path.join(BACKEND_DIR, "scripts", "sweep_autoencoder.py")
+    )
+    mod = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(mod)
+    return mod
+
+
+def _result(name, recall, sep, ms):
+    return {"name": name, "recall_at_p99": recall, "separation": sep, "latency_ms": ms}
+
+
+def test_rank_orders_by_recall_then_separation_then_latency(sweep):
+    results = [
+        _result("slow", 0.9, 3.0, 5.0),
+        _result("fast", 0.9, 3.0, 1.0),
+        _result("sep", 0.9, 4.0, 9.0),
+        _result("recall", 0.95, 1.0, 9.0),
+        _result("weak", 0.5, 9.0, 0.1),
+    ]
+    assert [r["name"] for r in sweep.rank(results)] == ["recall", "sep", "fast", "slow", "weak"]
+
+
+def test_rank_latency_cap_falls_back_to_all(sweep):
+    results = [_result("a", 0.9, 2.0, 5.0), _result("b", 0.8, 2.0, 1.0)]
+    assert [r["name"] for r in sweep.rank(results, max_latency_ms=2.0)] == ["b"]
+    assert [r["name"] for r in sweep.rank(results, max_latency_ms=0.5)] == ["a", "b"]
+
+
+@pytest.fixture
+def dirs(sweep, tmp_path, monkeypatch):
+    model_dir, sweep_dir = tmp_path / "models", tmp_path / "models" / "sweep"
+    sweep_dir.mkdir(parents=True)
+    monkeypatch.setattr(sweep, "MODEL_DIR", str(model_dir))
+    monkeypatch.setattr(sweep, "SWEEP_DIR", str(sweep_dir))
+    (sweep_dir / "best_autoencoder.h5").write_bytes(b"new model")
+    np.savez(sweep_dir / "ae_norm_stats.npz", mean=np.ones(4), std=np.ones(4))
+    for name in ("autoencoder.h5", "ae_norm_stats.npz", "autoencoder_int8.npz", THRESHOLD_FILE):
+        (model_dir / name).write_bytes(b"old")
+    rng = np.random.default_rng(0)
+    layers = [(rng.normal(size=(4, 2)).astype(np.float32), np.zeros(2, np.float32), "relu"),
+              (rng.normal(size=(2, 4)).astype(np.float32), np.zeros(4, np.float32), "linear")]
+    monkeypatch.setattr(sweep, "load_dense_layers", lambda path: layers)
+    return model_dir, sweep_dir
+
+
+def _record_replaces(monkeypatch, model_dir):
+    """Wrap os.replace; snapshot which staged files exist at the first rename."""
+    calls, at_first = [], []
+    real = os.replace
+
+    def replace(src, dst):
+        if not calls:
+            at_first.extend(sorted(p.name for p in model_dir.glob("*.tmp")))
+        calls.append(os.path.basename(dst))
+        real(src, dst)
+
+    monkeypatch.setattr(os, "replace", replace)
+    return calls, at_first
+
+
+BEST = {"name": "ae_64_b8_lr0.001", "val_err_p99": 0.125}
+
+
+def test_promote_stages_everything_before_renaming(sweep, dirs, monkeypatch):
+    model_dir, sweep_dir = dirs
+    calls, at_first = _record_replaces(monkeypatch, model_dir)
+    sweep.promote(BEST, str(sweep_dir / "best_autoencoder.h5"), precision="float32")
+
+    assert at_first == ["ae_norm_stats.npz.tmp", "ae_threshold.json.tmp", "autoencoder.h5.tmp"]
+    assert sorted(calls) == ["ae_norm_stats.npz", "ae_threshold.json", "autoencoder.h5"]
+    assert not list(model_dir.glob("*.tmp"))
+    assert (model_dir / "autoencoder.h5").read_bytes() == b"new model"
+    assert np.load(model_dir / "ae_norm_stats.npz")["mean"].tolist() == [1.0] * 4
+    assert json.loads((model_dir / THRESHOLD_FILE).read_text()) == {
+        "threshold": 0.125, "source": BEST["name"]}
+
+
+def test_promote_requantizes_for_reduced_precision(sweep, dirs, monkeypatch):
+    model_dir, sweep_dir = dirs
+    calls, at_first = _record_replaces(monkeypatch, model_dir)
+    sweep.promote(BEST, str(sweep_dir / "best_autoencoder.h5"), precision="int8")
+
+    assert "autoencoder_int8.npz.tmp" in at_first and len(at_first) == 4
+    assert "autoencoder_int8.npz" in calls and len(calls) == 4
+    q = QuantizedAutoencoder.load(str(model_dir / "autoencoder_int8.npz"))
+    assert q.precision == "int8" and q.input_shape == (None, 4)
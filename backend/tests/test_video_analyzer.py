@@ -0,0 +1,78 @@
+# backend/tests/test_video_analyzer.py
+import os
+
+import numpy as np
+import pytest
+
+from app.services.feature_builder import FeatureBuilder
+from app.services.frame_renderer import FrameRenderer
+from app.services.model_reloader import ScoringBundle
+from app.services.video_analyzer import VideoAnalyzer
+from conftest import FakePose, FakeYolo, ZeroAE, write_video
+
+# quiet scene (pixel 10) with two bursts (pixel 200) 25 frames apart
+VALUES = [200 if 30 <= i < 35 or 60 <= i < 63 else 10 for i in range(100)]
+
+
+def _analyzer(threshold=1000.0):
+    va = VideoAnalyzer.__new__(VideoAnalyzer)
+    va.yolo = FakeYolo(boxes=[[1, 1, 20, 20]], classes=[0])
+    va.num_classes = len(va.yolo.model.names)
+    va.renderer = FrameRenderer(va.yolo.model.names)
+    va.pose_model = FakePose()
+    va.features = FeatureBuilder(va.num_classes)
+    va.pose_dim, va.feature_dim = va.features.pose_dim, va.features.feature_dim
+    va.scoring = ScoringBundle(
+        ae=ZeroAE(), mean=np.zeros(va.feature_dim, np.float32),
+        std=np.ones(va.feature_dim, np.float32), threshold=threshold, version="test",
+    )
+    va.yolo_imgsz = 320
+    return va
+
+
+@pytest.fixture(scope="module")
+def video(tmp_path_factory):
+    return write_video(tmp_path_factory.mktemp("va") / "clip.avi", VALUES)
+
+
+def test_batch_size_does_not_change_scores(video):
+    one = _analyzer().analyze(video, batch_size=1)
+    many = _analyzer().analyze(video, batch_size=7)
+    assert one["frames_scored"] == many["frames_scored"] == len(VALUES)
+    np.testing.assert_array_equal(one["frames"]["recon_error"], many["frames"]["recon_error"])
+    assert one["events"] == many["events"]
+
+
+def test_one_yolo_call_per_batch(video):
+    va = _analyzer()
+    progress = []
+    va.analyze(video, batch_size=32, on_progress=lambda d, t: progress.append(d))
+    assert va.yolo.calls == 4
+    assert progress == [32, 64, 96, 100]
+
+
+def test_events_are_merged_by_gap_and_keep_their_peak(video):
+    res = _analyzer().analyze(video, batch_size=16, event_gap=15)
+    assert [(e["start_frame"], e["end_frame"]) for e in res["events"]] == [(30, 35), (60, 63)]
+    # the jump into the burst scores highest, not the last anomalous frame
+    assert [e["peak_frame"] for e in res["events"]] == [30, 60]
+
+    merged = _analyzer().analyze(video, batch_size=16, event_gap=30)
+    assert [(e["start_frame"], e["end_frame"]) for e in merged["events"]] == [(30, 63)]
+
+
+def test_stride_scores_every_nth_frame(video):
+    res = _analyzer().analyze(video, batch_size=8, stride=2)
+    assert res["frames"]["index"] == list(range(1, 100, 2))
+
+
+def test_screenshot_budget(video, tmp_path):
+    res = _analyzer().analyze(video, batch_size=16, screenshot_dir=str(tmp_path), max_screenshots=1)
+    assert os.listdir(tmp_path) == [res["events"][0]["screenshot"]]
+    assert "screenshot" not in res["events"][1]
+    assert res["events"][1]["peak_frame"] == 60
+
+
+def test_unreadable_video_raises(tmp_path):
+    with pytest.raises(RuntimeError):
+        _analyzer().analyze(str(tmp_path / "missing.mp4"))
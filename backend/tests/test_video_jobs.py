@@ -0,0 +1,115 @@
+# backend/tests/test_video_jobs.py
+import os
+import subprocess
+import sys
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.services.video_jobs import JobManager, JobQueueFull, _read_json, _write_json, run_job
+
+
+@pytest.fixture
+def manager(tmp_path):
+    mgr = JobManager(root=str(tmp_path / "jobs"), max_workers=1, max_pending=1)
+    yield mgr
+    mgr.shutdown()
+
+
+def _dead_pid():
+    proc = subprocess.Popen([sys.executable, "-c", "pass"])
+    proc.wait()
+    return proc.pid
+
+
+def test_queue_full_and_discard_frees_a_slot(manager):
+    a = manager.create("a.mp4", {})
+    manager.create("b.mp4", {})
+    with pytest.raises(JobQueueFull):
+        manager.create("c.mp4", {})
+    manager.discard(a)
+    assert not os.path.exists(os.path.join(manager.root, a))
+    manager.create("c.mp4", {})
+
+
+def test_cancel_writes_flag_for_active_job(manager):
+    job_id = manager.create("a.mp4", {})
+    status = manager.cancel(job_id)
+    assert status["cancel_requested"] is True
+    assert os.path.exists(os.path.join(manager.job_dir(job_id), "cancel"))
+
+
+def test_run_job_honours_cancel_flag(manager):
+    job_id = manager.create("a.mp4", {})
+    job_dir = manager.job_dir(job_id)
+    open(os.path.join(job_dir, "cancel"), "w").close()
+    status = run_job(job_dir, "a.mp4", manager.models, {})
+    assert status["state"] == "cancelled"
+    assert manager.status(job_id)["state"] == "cancelled"
+    assert manager.result(job_id) is None
+
+
+def test_orphaned_jobs_fail_but_live_owners_are_kept(tmp_path):
+    root = tmp_path / "jobs"
+    for job_id, owner in (("orphan", _dead_pid()), ("live", os.getpid())):
+        (root / job_id).mkdir(parents=True)
+        _write_json(str(root / job_id / "status.json"),
+                    {"id": job_id, "state": "running", "owner": owner, "created": job_id})
+    JobManager(root=str(root))
+    orphan = _read_json(str(root / "orphan" / "status.json"))
+    assert orphan["state"] == "failed" and "restart" in orphan["error"]
+    assert _read_json(str(root / "live" / "status.json"))["state"] == "running"
+
+
+def test_job_ids_are_validated(manager):
+    for bad in ("../x", "nope", ""):
+        with pytest.raises(KeyError):
+            manager.job_dir(bad)
+
+
+@pytest.fixture
+def client(manager, monkeypatch):
+    from app.api import jobs as jobs_api
+
+    started = []
+    monkeypatch.setattr(manager, "start", lambda job_id, path: started.append((job_id, path)))
+    monkeypatch.setattr(jobs_api, "jobs", manager)
+    api = FastAPI()
+    api.include_router(jobs_api.router, prefix="/predict")
+    with TestClient(api) as c:
+        c.started = started
+        yield c
+
+
+def test_upload_is_written_and_started(client, manager):
+    body = os.urandom(3 * 1024 * 1024 + 17)     # several upload chunks
+    r = client.post("/predict/jobs", files={"file": ("clip.mp4", body, "video/mp4")},
+                    data={"stride": "2"})
+    assert r.status_code == 202
+    job_id, path = client.started[0]
+    assert r.json()["id"] == job_id and r.json()["params"]["stride"] == 2
+    with open(path, "rb") as f:
+        assert f.read() == body
+
+
+def test_api_rejects_bad_requests_and_full_queue(client):
+    assert client.post("/predict/jobs").status_code == 400
+    bad = client.post("/predict/jobs", files={"file": ("x.txt", b"x", "text/plain")})
+    assert bad.status_code == 400
+    outside = client.post("/predict/jobs", data={"path": "/etc/passwd"})
+    assert outside.status_code == 400
+
+    for _ in range(2):
+        ok = client.post("/predict/jobs", files={"file": ("a.mp4", b"x", "video/mp4")})
+        assert ok.status_code == 202
+    full = client.post("/predict/jobs", files={"file": ("a.mp4", b"x", "video/mp4")})
+    assert full.status_code == 429
+    assert client.get("/predict/jobs/doesnotexist").status_code == 404
+
+
+def test_cancel_endpoint(client, manager):
+    job_id = client.post("/predict/jobs", files={"file": ("a.mp4", b"x", "video/mp4")}).json()["id"]
+    r = client.delete(f"/predict/jobs/{job_id}")
+    assert r.json()["cancel_requested"] is True
+    assert client.get(f"/predict/jobs/{job_id}/result").status_code == 409
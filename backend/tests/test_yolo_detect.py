@@ -0,0 +1,73 @@
+# backend/tests/test_yolo_detect.py
+import collections
+import os
+
+import cv2
+import numpy as np
+import pytest
+
+from conftest import BACKEND_DIR, FakeTensor
+from app.services.yolo_detect import decode_image, detect_frames, draw_detections
+
+NAMES = {0: "person", 1: "chair", 2: "cup"}
+Boxes = collections.namedtuple("Boxes", "xyxy cls conf")
+Result = collections.namedtuple("Result", "boxes")
+
+
+class ContentYolo:
+    """Detections derived from each frame's pixels, so a mixed-up batch shows."""
+
+    def __call__(self, frames, verbose=False):
+        out = []
+        for f in frames:
+            v = float(f.mean())
+            n = int(f[0, 0, 0]) % 3 + 1
+            xyxy = np.array([[i, i, v + i, v / 2 + i] for i in range(n)], np.float32)
+            cls = np.arange(n, dtype=np.float32) % len(NAMES)
+            conf = np.full(n, v / 255.0, np.float32)
+            out.append(Result(Boxes(FakeTensor(xyxy), FakeTensor(cls), FakeTensor(conf))))
+        return out
+
+
+def _images(n=5):
+    rng = np.random.default_rng(0)
+    frames = [rng.integers(0, 256, (48 + 8 * i, 64, 3), dtype=np.uint8) for i in range(n)]
+    return [cv2.imencode(".png", f)[1].tobytes() for f in frames]
+
+
+def test_batched_detect_matches_per_image():
+    frames = [decode_image(b) for b in _images()]
+    model = ContentYolo()
+    batched = detect_frames(model, NAMES, frames)
+    single = [detect_frames(model, NAMES, [f])[0] for f in frames]
+    assert batched == single
+    assert [len(d["classes"]) for d in batched] != [len(batched[0]["classes"])] * len(batched)
+    assert batched[0]["labels"] == [NAMES[c] for c in batched[0]["classes"]]
+
+
+def test_batched_detect_matches_per_image_with_yolo():
+    ultralytics = pytest.importorskip("ultralytics")
+    weights = os.path.join(BACKEND_DIR, "models", "yolov8n.pt")
+    if not os.path.exists(weights):
+        pytest.skip("models/yolov8n.pt not available")
+    model = ultralytics.YOLO(weights)
+    cap = cv2.VideoCapture(os.path.join(BACKEND_DIR, "sample.mp4"))
+    frames = [cap.read()[1] for _ in range(4)]
+    cap.release()
+    batched = detect_frames(model, model.model.names, frames)
+    single = [detect_frames(model, model.model.names, [f])[0] for f in frames]
+    for b, s in zip(batched, single):
+        assert b["classes"] == s["classes"]
+        np.testing.assert_allclose(b["boxes"], s["boxes"], atol=1.0)
+
+
+def test_decode_rejects_garbage():
+    with pytest.raises(ValueError):
+        decode_image(b"not an image")
+
+
+def test_draw_detections_draws_on_the_decoded_frame():
+    frame = np.zeros((60, 80, 3), np.uint8)
+    det = {"boxes": [[10, 20, 50, 55]], "labels": ["person"], "scores": [0.9]}
+    assert draw_detections(frame, det) is frame
+    assert (frame[30, 10] == (0, 255, 0)).all() and not frame[40, 30].any()